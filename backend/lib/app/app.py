@@ -5,6 +5,7 @@ import typing
 
 import lib.app.errors as app_errors
 import lib.app.settings as app_settings
+import lib.task.base as task_base
 import lib.task.jobs as task_jobs
 import lib.task.repositories as task_repositories
 import lib.task.services as task_services
@@ -44,6 +45,22 @@ class Application:
 
         logger.info("Initializing global dependencies")
 
+        # Disposed after the scheduler, as running jobs use shared trigger and action resources
+        trigger_processor_factory = task_base.TriggerProcessorFactory()
+        lifecycle_shutdown_callbacks.append(
+            lifecycle_utils.Callback.from_dispose(
+                name="trigger_processor_factory",
+                awaitable=trigger_processor_factory.dispose(),
+            )
+        )
+        action_processor_pool = task_base.ActionProcessorPool()
+        lifecycle_shutdown_callbacks.append(
+            lifecycle_utils.Callback.from_dispose(
+                name="action_processor_pool",
+                awaitable=action_processor_pool.dispose(),
+            )
+        )
+
         aiojobs_scheduler = aiojobs_utils.Scheduler.from_settings(
             settings=settings.tasks.scheduler.aiojobs_scheduler_settings
         )
@@ -158,6 +175,30 @@ class Application:
             )
         )
 
+        if settings.tasks.webhook_server.enabled:
+            webhook_server = task_services.WebhookServer(
+                config_repository=config_repository,
+                queue_repository=queue_repository,
+                state_repository=state_repository,
+                trigger_processor_factory=trigger_processor_factory,
+                host=settings.tasks.webhook_server.host,
+                port=settings.tasks.webhook_server.port,
+                path_prefix=settings.tasks.webhook_server.path_prefix,
+            )
+            lifecycle_startup_callbacks.append(
+                lifecycle_utils.Callback(
+                    awaitable=webhook_server.start(),
+                    error_message="Failed to start webhook server",
+                    success_message="Webhook server has been started successfully",
+                )
+            )
+            lifecycle_shutdown_callbacks.append(
+                lifecycle_utils.Callback.from_dispose(
+                    name="webhook_server",
+                    awaitable=webhook_server.dispose(),
+                )
+            )
+
         logger.info("Initializing jobs")
 
         aiojobs_scheduler.defer_jobs(
@@ -180,6 +221,7 @@ class Application:
                     max_retries=settings.tasks.trigger_processor.max_retries,
                     queue_repository=queue_repository,
                     state_repository=state_repository,
+                    trigger_processor_factory=trigger_processor_factory,
                 )
                 for job_id in range(settings.tasks.trigger_processor.count)
             ),
@@ -188,6 +230,9 @@ class Application:
                     job_id=job_id,
                     max_retries=settings.tasks.event_processor.max_retries,
                     queue_repository=queue_repository,
+                    action_processor_pool=action_processor_pool,
+                    batch_size=settings.tasks.event_processor.batch_size,
+                    batch_max_wait=settings.tasks.event_processor.batch_max_wait_seconds,
                 )
                 for job_id in range(settings.tasks.event_processor.count)
             ),
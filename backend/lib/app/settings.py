@@ -59,6 +59,18 @@ class JobProcessorSettings(pydantic_utils.BaseSettingsModel):
     )
 
 
+class EventProcessorSettings(JobProcessorSettings):
+    batch_size: int = 10
+    batch_max_wait_seconds: float = 0
+
+
+class WebhookServerSettings(pydantic_utils.BaseSettingsModel):
+    enabled: bool = False
+    host: str = "0.0.0.0"
+    port: int = 8080
+    path_prefix: str = "/webhooks"
+
+
 class TasksSettings(pydantic_utils.BaseSettingsModel):
     config_backend: pydantic_utils.TypedAnnotation[task_repositories.BaseConfigSettings] = NotImplemented
     queue_backend: pydantic_utils.TypedAnnotation[task_repositories.BaseQueueSettings] = NotImplemented
@@ -67,7 +79,8 @@ class TasksSettings(pydantic_utils.BaseSettingsModel):
     scheduler: SchedulerSettings = pydantic.Field(default_factory=SchedulerSettings)
     task_processor: JobProcessorSettings = pydantic.Field(default_factory=JobProcessorSettings)
     trigger_processor: JobProcessorSettings = pydantic.Field(default_factory=JobProcessorSettings)
-    event_processor: JobProcessorSettings = pydantic.Field(default_factory=JobProcessorSettings)
+    event_processor: EventProcessorSettings = pydantic.Field(default_factory=EventProcessorSettings)
+    webhook_server: WebhookServerSettings = pydantic.Field(default_factory=WebhookServerSettings)
 
 
 class Settings(pydantic_utils.BaseSettings):
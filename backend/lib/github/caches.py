@@ -0,0 +1,285 @@
+import asyncio
+import collections
+import dataclasses
+import datetime
+import hashlib
+import logging
+import time
+
+import pydantic
+
+import lib.github.clients as github_clients
+import lib.github.models as github_models
+import lib.task.protocols as task_protocols
+import lib.utils.pydantic as pydantic_utils
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEAM_MEMBERS_TTL = 10 * 60  # 10 minutes
+# Search index is eventually consistent, so incremental refresh re-checks a short window before the last one
+REPOSITORY_INDEX_REFRESH_OVERLAP = datetime.timedelta(minutes=5)
+
+type _TeamKey = tuple[github_models.OwnerName, github_models.TeamSlug]
+
+
+class TeamMembersCache:
+    """
+    Caches organization team members for `ttl` seconds and deduplicates concurrent lookups of the same team.
+    Expired entries are revalidated through the client ETag cache, so unchanged teams do not cost rate limit.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TEAM_MEMBERS_TTL):
+        self._ttl = ttl
+        self._entries: dict[_TeamKey, tuple[float, frozenset[github_models.UserLogin]]] = {}
+        self._in_flight: dict[_TeamKey, asyncio.Task[frozenset[github_models.UserLogin]]] = {}
+
+    async def get(
+        self,
+        client: github_clients.RestGithubClient,
+        owner: github_models.OwnerName,
+        team_slug: github_models.TeamSlug,
+    ) -> frozenset[github_models.UserLogin]:
+        key = (owner, team_slug)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
+        if key not in self._in_flight:
+            task = asyncio.create_task(self._fetch(client, owner=owner, team_slug=team_slug))
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self._in_flight[key] = task
+
+        return await asyncio.shield(self._in_flight[key])
+
+    async def _fetch(
+        self,
+        client: github_clients.RestGithubClient,
+        owner: github_models.OwnerName,
+        team_slug: github_models.TeamSlug,
+    ) -> frozenset[github_models.UserLogin]:
+        logger.debug("Fetching members of Team(%s/%s)", owner, team_slug)
+        members = frozenset(
+            [
+                member
+                async for member in client.get_organization_team_members(
+                    request=github_clients.GetOrganizationTeamMembersRequest(
+                        owner=owner,
+                        team_slug=team_slug,
+                    ),
+                )
+            ]
+        )
+        self._entries[(owner, team_slug)] = (time.monotonic() + self._ttl, members)
+
+        return members
+
+
+class RepositoryIndexState(pydantic_utils.BaseModel):
+    repositories: list[github_models.Repository] = pydantic.Field(default_factory=list[github_models.Repository])
+    refreshed_at: datetime.datetime
+    updated_at: datetime.datetime
+
+
+class RepositoryIndexCache:
+    """
+    Keeps repositories of an owner, persisted in the state backend and shared by triggers with the same token.
+    The index is fully refreshed every `ttl`, in between repositories pushed since the last update are added.
+    Renames and removals are not pushes, so triggers apply the ones found by the activity lookup of node ids.
+    """
+
+    def __init__(self, state_repository: task_protocols.StateRepositoryProtocol, token: str):
+        self._state_repository = state_repository
+        self._token_hash = hashlib.sha256(token.encode()).hexdigest()[:16]
+        self._indexes: dict[github_models.OwnerName, RepositoryIndexState] = {}
+        self._locks: collections.defaultdict[github_models.OwnerName, asyncio.Lock] = collections.defaultdict(
+            asyncio.Lock
+        )
+
+    def _get_state_path(self, owner: github_models.OwnerName) -> str:
+        # Private repositories visible to one token must not leak to triggers using another one
+        return f"github/repository_indexes/{owner}/{self._token_hash}"
+
+    async def get(
+        self,
+        client: github_clients.GqlGithubClient,
+        owner: github_models.OwnerName,
+        ttl: datetime.timedelta,
+        refresh_interval: datetime.timedelta,
+    ) -> list[github_models.Repository]:
+        async with self._locks[owner]:
+            index = await self._load(owner)
+
+            now = datetime.datetime.now(tz=datetime.UTC)
+            if index is None or index.refreshed_at + ttl <= now:
+                index = await self._refresh(client, owner=owner, now=now)
+            elif index.updated_at + refresh_interval <= now:
+                index = await self._update(client, owner=owner, index=index, now=now)
+            else:
+                self._indexes[owner] = index
+                return index.repositories
+
+            await self._save(owner, index=index)
+            return index.repositories
+
+    async def remove(
+        self,
+        owner: github_models.OwnerName,
+        repository_names: set[github_models.RepositoryName],
+    ) -> None:
+        async with self._locks[owner]:
+            index = await self._load(owner)
+            if index is None:
+                return
+
+            repositories = [repository for repository in index.repositories if repository.name not in repository_names]
+            if len(repositories) == len(index.repositories):
+                return
+
+            for repository_name in sorted(repository_names):
+                logger.info("Repository(%s/%s) has been removed from the index", owner, repository_name)
+            await self._save(
+                owner,
+                index=RepositoryIndexState(
+                    repositories=repositories,
+                    refreshed_at=index.refreshed_at,
+                    updated_at=index.updated_at,
+                ),
+            )
+
+    async def rename(
+        self,
+        owner: github_models.OwnerName,
+        repository_names: dict[str, github_models.RepositoryName],
+    ) -> None:
+        """
+        Renames repositories by their node ids.
+        """
+        async with self._locks[owner]:
+            index = await self._load(owner)
+            if index is None:
+                return
+
+            repositories: list[github_models.Repository] = []
+            for repository in index.repositories:
+                name = repository_names.get(repository.id) if repository.id is not None else None
+                if name is not None and name != repository.name:
+                    logger.info("Repository(%s/%s) has been renamed to %s in the index", owner, repository.name, name)
+                    repository = dataclasses.replace(repository, name=name)
+                repositories.append(repository)
+            if repositories == index.repositories:
+                return
+
+            await self._save(
+                owner,
+                index=RepositoryIndexState(
+                    repositories=repositories,
+                    refreshed_at=index.refreshed_at,
+                    updated_at=index.updated_at,
+                ),
+            )
+
+    async def _load(self, owner: github_models.OwnerName) -> RepositoryIndexState | None:
+        if owner in self._indexes:
+            return self._indexes[owner]
+
+        raw_index = await self._state_repository.get(self._get_state_path(owner))
+        if raw_index is None:
+            return None
+
+        return RepositoryIndexState.model_validate(raw_index)
+
+    async def _save(self, owner: github_models.OwnerName, index: RepositoryIndexState) -> None:
+        self._indexes[owner] = index
+        await self._state_repository.set(self._get_state_path(owner), index.model_dump(mode="json"))
+
+    async def _refresh(
+        self,
+        client: github_clients.GqlGithubClient,
+        owner: github_models.OwnerName,
+        now: datetime.datetime,
+    ) -> RepositoryIndexState:
+        logger.info("Refreshing repository index of Owner(%s)", owner)
+        repositories = [
+            repository
+            async for repository in client.get_repositories(github_clients.GetRepositoriesRequest(owner=owner))
+        ]
+
+        return RepositoryIndexState(repositories=repositories, refreshed_at=now, updated_at=now)
+
+    async def _update(
+        self,
+        client: github_clients.GqlGithubClient,
+        owner: github_models.OwnerName,
+        index: RepositoryIndexState,
+        now: datetime.datetime,
+    ) -> RepositoryIndexState:
+        repositories = list(index.repositories)
+        known_repositories = set(repositories)
+        positions = {
+            repository.id: position for position, repository in enumerate(repositories) if repository.id is not None
+        }
+        async for repository in client.get_repositories(
+            github_clients.GetRepositoriesRequest(
+                owner=owner,
+                pushed_after=index.updated_at - REPOSITORY_INDEX_REFRESH_OVERLAP,
+            ),
+        ):
+            position = positions.get(repository.id) if repository.id is not None else None
+            if position is not None:
+                if repositories[position].name != repository.name:
+                    logger.info(
+                        "Repository(%s/%s) has been renamed to %s in the index",
+                        owner,
+                        repositories[position].name,
+                        repository.name,
+                    )
+                repositories[position] = repository
+            elif repository not in known_repositories:
+                logger.info("Repository(%s/%s) has been added to the index", owner, repository.name)
+                repositories.append(repository)
+            known_repositories.add(repository)
+
+        return RepositoryIndexState(repositories=repositories, refreshed_at=index.refreshed_at, updated_at=now)
+
+
+class ETagCacheStore:
+    """
+    Persists the ETag cache of a token once in the state backend, as it is shared by all triggers using the token.
+    """
+
+    def __init__(
+        self,
+        state_repository: task_protocols.StateRepositoryProtocol,
+        token: str,
+        etag_cache: github_clients.ETagCache,
+    ):
+        self._state_repository = state_repository
+        self._token_hash = hashlib.sha256(token.encode()).hexdigest()[:16]
+        self._etag_cache = etag_cache
+        self._is_loaded = False
+        self._lock = asyncio.Lock()
+
+    def _get_state_path(self) -> str:
+        return f"github/etag_caches/{self._token_hash}"
+
+    async def load(self) -> None:
+        async with self._lock:
+            if self._is_loaded:
+                return
+
+            raw_cache = await self._state_repository.get(self._get_state_path())
+            if raw_cache is not None:
+                self._etag_cache.load_raw(raw_cache.get("entries", []))
+            self._is_loaded = True
+
+    async def save(self) -> None:
+        async with self._lock:
+            await self._state_repository.set(self._get_state_path(), {"entries": self._etag_cache.to_raw()})
+
+
+__all__ = [
+    "ETagCacheStore",
+    "RepositoryIndexCache",
+    "TeamMembersCache",
+]
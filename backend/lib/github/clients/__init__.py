@@ -1,2 +1,5 @@
+from .etag_cache import *
 from .gql import *
+from .pool import *
+from .rate_limit import *
 from .rest import *
@@ -0,0 +1,86 @@
+import collections
+import dataclasses
+import json
+import logging
+import typing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024  # 16 MiB
+
+
+@dataclasses.dataclass(frozen=True)
+class ETagCacheEntry:
+    etag: str
+    body: typing.Any
+    size: int
+
+
+class ETagCache:
+    """
+    LRU cache of response bodies by their ETag, used to make conditional requests.
+    Bounded by both the number of entries and the total size of serialized bodies.
+    https://docs.github.com/en/rest/using-the-rest-api/best-practices-for-using-the-rest-api#use-conditional-requests-if-appropriate
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._max_size = max_size
+        self._max_bytes = max_bytes
+        self._entries: collections.OrderedDict[str, ETagCacheEntry] = collections.OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(method: str, url: str, params: typing.Mapping[str, typing.Any]) -> str:
+        return json.dumps([method, url, sorted(params.items())], default=str)
+
+    def get(self, key: str) -> ETagCacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def set(self, key: str, etag: str, body: typing.Any, size: int | None = None) -> None:
+        """
+        `size` is the size of the serialized body, computed when not known.
+        """
+        if size is None:
+            size = len(json.dumps(body))
+
+        self._remove(key)
+        if size > self._max_bytes:
+            logger.debug("Skipping ETag cache entry of size(%s) above the limit", size)
+            return
+
+        self._entries[key] = ETagCacheEntry(etag=etag, body=body, size=size)
+        self._bytes += size
+        while len(self._entries) > self._max_size or self._bytes > self._max_bytes:
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def to_raw(self) -> list[dict[str, typing.Any]]:
+        return [{"key": key, "etag": entry.etag, "body": entry.body} for key, entry in self._entries.items()]
+
+    def load_raw(self, raw: list[dict[str, typing.Any]]) -> None:
+        for item in raw:
+            try:
+                self.set(key=item["key"], etag=item["etag"], body=item["body"])
+            except KeyError:
+                logger.warning("Skipping malformed ETag cache entry")
+
+
+__all__ = [
+    "ETagCache",
+]
@@ -1,21 +1,37 @@
 import abc
-import contextlib
+import asyncio
 import dataclasses
 import datetime
+import functools
 import logging
 import typing
 
+import aiohttp
 import gql
+import gql.client as gql_client_module
 import gql.transport.aiohttp as gql_aiohttp
+import gql.transport.exceptions as gql_exceptions
 import graphql
 import pydantic
 import pydantic.alias_generators as pydantic_alias_generators
 
+import lib.github.clients.rate_limit as rate_limit
 import lib.github.models as github_models
 import lib.utils.pydantic as pydantic_utils
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_KEEPALIVE_TIMEOUT = 60
+DEFAULT_SEARCH_BATCH_SIZE = 1
+DEFAULT_SEARCH_BATCH_DELAY = 0.01
+DEFAULT_MAX_RATE_LIMIT_RETRIES = 3
+
+# https://docs.github.com/en/graphql/reference/queries#search
+SEARCH_RESULTS_LIMIT = 1000
+# https://docs.github.com/en/graphql/reference/queries#nodes
+REPOSITORIES_ACTIVITY_BATCH_SIZE = 100
+
 
 class BaseRequest(abc.ABC):
     @property
@@ -36,39 +52,78 @@ class BaseResponse(BaseModel):
         raise NotImplementedError
 
 
+# Selected by every document, so the rate limit governor is updated from each response
+_RATE_LIMIT_FRAGMENT = """
+fragment rateLimitFields on Query {
+    rateLimit {
+        limit
+        cost
+        remaining
+        resetAt
+    }
+}
+"""
+
+
+class PageInfo(BaseModel):
+    end_cursor: str | None
+    has_next_page: bool
+
+    @property
+    def next_cursor(self) -> str | None:
+        return self.end_cursor if self.has_next_page else None
+
+
+_GET_REPOSITORIES_DOCUMENT = gql.gql(
+    """
+    query myOrgRepos($query: String!, $limit: Int!, $after: String) {
+        search(query: $query, type: REPOSITORY, first: $limit, after: $after) {
+            nodes {
+                ... on Repository {
+                    id
+                    name
+                    isPrivate
+                    owner {
+                        login
+                    }
+                }
+            }
+            pageInfo {
+                endCursor
+                hasNextPage
+            }
+        }
+        ...rateLimitFields
+    }
+    """
+    + _RATE_LIMIT_FRAGMENT
+)
+
+
 @dataclasses.dataclass(frozen=True)
 class GetRepositoriesRequest(BaseRequest):
     owner: github_models.OwnerName
+    pushed_after: datetime.datetime | None = None
     limit: int = 100
     after: str | None = None
 
     @property
     def document(self) -> graphql.DocumentNode:
-        return gql.gql(
-            """
-            query myOrgRepos($query: String!, $limit: Int!, $after: String) {
-                search(query: $query, type: REPOSITORY, first: $limit, after: $after) {
-                    nodes {
-                        ... on Repository {
-                            name
-                            owner {
-                                login
-                            }
-                        }
-                    }
-                    pageInfo {
-                        endCursor
-                        hasNextPage
-                    }
-                }
-            }
-            """
-        )
+        return _GET_REPOSITORIES_DOCUMENT
+
+    @property
+    def query(self) -> str:
+        query = [f"org:{self.owner}"]
+        # Newly created repositories count as pushed at creation
+        if self.pushed_after is not None:
+            query.append(f"pushed:>{self.pushed_after.isoformat()}")
+
+        return " ".join(query)
 
     @property
     def params(self) -> dict[str, typing.Any]:
         return {
-            "query": f"org:{self.owner}",
+            "query": self.query,
             "limit": self.limit,
             "after": self.after,
         }
@@ -80,7 +135,9 @@ class GetRepositoriesResponse(BaseResponse):
             class Owner(BaseModel):
                 login: github_models.OwnerName
 
+            id: str
             name: github_models.RepositoryName
+            is_private: bool
             owner: Owner
 
         class PageInfo(BaseModel):
@@ -97,53 +154,209 @@ class GetRepositoriesResponse(BaseResponse):
             github_models.Repository(
                 name=repository.name,
                 owner=repository.owner.login,
+                id=repository.id,
+                is_private=repository.is_private,
             )
             for repository in self.search.nodes
         ]
 
 
+_GET_REPOSITORIES_ACTIVITY_DOCUMENT = gql.gql(
+    """
+    query getRepositoriesActivity($ids: [ID!]!) {
+        nodes(ids: $ids) {
+            ... on Repository {
+                id
+                name
+                pushedAt
+                updatedAt
+                isArchived
+                issues {
+                    totalCount
+                }
+                pullRequests {
+                    totalCount
+                }
+            }
+        }
+        ...rateLimitFields
+    }
+    """
+    + _RATE_LIMIT_FRAGMENT
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class GetRepositoriesActivityRequest(BaseRequest):
+    ids: tuple[str, ...]
+
+    @property
+    def document(self) -> graphql.DocumentNode:
+        return _GET_REPOSITORIES_ACTIVITY_DOCUMENT
+
+    @property
+    def params(self) -> dict[str, typing.Any]:
+        return {
+            "ids": list(self.ids),
+        }
+
+
+class GetRepositoriesActivityResponse(BaseResponse):
+    class Repository(BaseModel):
+        class Connection(BaseModel):
+            total_count: int
+
+        id: str
+        name: github_models.RepositoryName
+        pushed_at: datetime.datetime | None
+        updated_at: datetime.datetime
+        is_archived: bool
+        issues: Connection
+        pull_requests: Connection
+
+    # Unresolvable ids are returned as nulls along with NOT_FOUND errors
+    nodes: list[Repository | None]
+
+    def to_dataclass(self) -> list[github_models.RepositoryActivity]:
+        return [
+            github_models.RepositoryActivity(
+                id=repository.id,
+                name=repository.name,
+                pushed_at=repository.pushed_at,
+                updated_at=repository.updated_at,
+                is_archived=repository.is_archived,
+                issue_count=repository.issues.total_count,
+                pull_request_count=repository.pull_requests.total_count,
+            )
+            for repository in self.nodes
+            if repository is not None
+        ]
+
+
+_ISSUE_FRAGMENT = """
+fragment issueFields on Issue {
+    id
+    url
+    title
+    body
+    createdAt
+    author {
+        login
+    }
+}
+"""
+
+_GET_REPOSITORY_ISSUES_DOCUMENT = gql.gql(
+    """
+    query getIssues($query: String!, $limit: Int!, $after: String) {
+        search(query: $query, type: ISSUE, first: $limit, after: $after) {
+            issueCount
+            nodes {
+                ...issueFields
+            }
+            pageInfo {
+                endCursor
+                hasNextPage
+            }
+        }
+        ...rateLimitFields
+    }
+    """
+    + _ISSUE_FRAGMENT
+    + _RATE_LIMIT_FRAGMENT
+)
+
+
+@functools.cache
+def _build_batch_search_document(fragment: str, fragment_name: str, size: int) -> graphql.DocumentNode:
+    variables = ", ".join(f"$query{index}: String!, $after{index}: String" for index in range(size))
+    searches = "\n".join(
+        f"search{index}: search(query: $query{index}, type: ISSUE, first: $limit, after: $after{index}) {{"
+        f" issueCount nodes {{ ...{fragment_name} }} pageInfo {{ endCursor hasNextPage }} }}"
+        for index in range(size)
+    )
+    return gql.gql(
+        f"query batchSearch($limit: Int!, {variables}) {{\n{searches}\n...rateLimitFields\n}}\n{fragment}"
+        + _RATE_LIMIT_FRAGMENT,
+    )
+
+
+class CreatedSearchRequest(BaseRequest):
+    """
+    Search request sorted by creation time, restarted from the last seen item when search results limit is reached.
+    Implementations are frozen dataclasses with `created_inclusive: bool = False` field.
+    """
+
+    __dataclass_fields__: typing.ClassVar[dict[str, dataclasses.Field[typing.Any]]]
+
+    created_after: datetime.datetime
+    created_inclusive: bool
+    limit: int
+    after: str | None
+
+    @property
+    @abc.abstractmethod
+    def query(self) -> str: ...
+
+    @property
+    def created_query(self) -> str:
+        operator = ">=" if self.created_inclusive else ">"
+        return f"created:{operator}{self.created_after.isoformat()}"
+
+    @property
+    def params(self) -> dict[str, typing.Any]:
+        return {
+            "query": self.query,
+            "limit": self.limit,
+            "after": self.after,
+        }
+
+    def next_page(self, after: str) -> typing.Self:
+        return dataclasses.replace(self, after=after)
+
+    def restart(self, created_after: datetime.datetime) -> typing.Self:
+        # Items created at the same time as the last seen one may be left on the next page
+        return dataclasses.replace(self, after=None, created_after=created_after, created_inclusive=True)
+
+
+class BaseSearchRequest(CreatedSearchRequest):
+    """
+    Search request that can be aliased together with other requests of the same class into one document.
+    """
+
+    search_fragment: typing.ClassVar[str]
+    search_fragment_name: typing.ClassVar[str]
+
+    @classmethod
+    def batch_document(cls, size: int) -> graphql.DocumentNode:
+        return _build_batch_search_document(cls.search_fragment, cls.search_fragment_name, size)
+
+
 @dataclasses.dataclass(frozen=True)
-class GetRepositoryIssuesRequest(BaseRequest):
+class GetRepositoryIssuesRequest(BaseSearchRequest):
+    search_fragment: typing.ClassVar[str] = _ISSUE_FRAGMENT
+    search_fragment_name: typing.ClassVar[str] = "issueFields"
+
     owner: github_models.OwnerName
     repository: github_models.RepositoryName
     created_after: datetime.datetime
     limit: int = 100
+    after: str | None = None
+    created_inclusive: bool = False
 
     @property
     def document(self) -> graphql.DocumentNode:
-        return gql.gql(
-            """
-            query getIssues($query: String!, $limit: Int!) {
-                search(query: $query, type: ISSUE, first: $limit) {
-                    nodes {
-                        ... on Issue {
-                            id
-                            url
-                            title
-                            body
-                            createdAt
-                            author {
-                                login
-                            }
-                        }
-                    }
-                }
-            }
-            """
-        )
+        return _GET_REPOSITORY_ISSUES_DOCUMENT
 
     @property
-    def params(self) -> dict[str, typing.Any]:
+    def query(self) -> str:
         query = [
             f"repo:{self.owner}/{self.repository}",
             "is:issue",
-            f"created:>{self.created_after.isoformat()}",
+            self.created_query,
             "sort:created-asc",
         ]
-        return {
-            "query": " ".join(query),
-            "limit": self.limit,
-        }
+        return " ".join(query)
 
 
 class GetRepositoryIssuesResponse(BaseResponse):
@@ -159,7 +372,9 @@ class GetRepositoryIssuesResponse(BaseResponse):
             created_at: datetime.datetime
             author: Author | None
 
+        issue_count: int
         nodes: list[Issue]
+        page_info: PageInfo
 
     search: Search
 
@@ -177,48 +392,65 @@ class GetRepositoryIssuesResponse(BaseResponse):
         ]
 
 
+_PR_FRAGMENT = """
+fragment prFields on PullRequest {
+    id
+    url
+    title
+    body
+    createdAt
+    author {
+        login
+    }
+}
+"""
+
+_GET_REPOSITORY_PRS_DOCUMENT = gql.gql(
+    """
+    query getPRs($query: String!, $limit: Int!, $after: String) {
+        search(query: $query, type: ISSUE, first: $limit, after: $after) {
+            issueCount
+            nodes {
+                ...prFields
+            }
+            pageInfo {
+                endCursor
+                hasNextPage
+            }
+        }
+        ...rateLimitFields
+    }
+    """
+    + _PR_FRAGMENT
+    + _RATE_LIMIT_FRAGMENT
+)
+
+
 @dataclasses.dataclass(frozen=True)
-class GetRepositoryPRsRequest(BaseRequest):
+class GetRepositoryPRsRequest(BaseSearchRequest):
+    search_fragment: typing.ClassVar[str] = _PR_FRAGMENT
+    search_fragment_name: typing.ClassVar[str] = "prFields"
+
     owner: github_models.OwnerName
     repository: github_models.RepositoryName
     created_after: datetime.datetime
     limit: int = 100
+    after: str | None = None
+    created_inclusive: bool = False
 
     @property
     def document(self) -> graphql.DocumentNode:
-        return gql.gql(
-            """
-            query getPRs($query: String!, $limit: Int!) {
-                search(query: $query, type: ISSUE, first: $limit) {
-                    nodes {
-                        ... on PullRequest {
-                            id
-                            url
-                            title
-                            body
-                            createdAt
-                            author {
-                                login
-                            }
-                        }
-                    }
-                }
-            }
-            """
-        )
+        return _GET_REPOSITORY_PRS_DOCUMENT
 
     @property
-    def params(self) -> dict[str, typing.Any]:
+    def query(self) -> str:
         query = [
             f"repo:{self.owner}/{self.repository}",
             "is:pr",
-            f"created:>{self.created_after.isoformat()}",
+            self.created_query,
             "sort:created-asc",
         ]
-        return {
-            "query": " ".join(query),
-            "limit": self.limit,
-        }
+        return " ".join(query)
 
 
 class GetRepositoryPRsResponse(BaseResponse):
@@ -234,7 +466,9 @@ class GetRepositoryPRsResponse(BaseResponse):
             created_at: datetime.datetime
             author: Author | None
 
+        issue_count: int
         nodes: list[PR]
+        page_info: PageInfo
 
     search: Search
 
@@ -252,41 +486,467 @@ class GetRepositoryPRsResponse(BaseResponse):
         ]
 
 
+_GET_ORGANIZATION_ISSUES_DOCUMENT = gql.gql(
+    """
+    query getOrganizationIssues($query: String!, $limit: Int!, $after: String) {
+        search(query: $query, type: ISSUE, first: $limit, after: $after) {
+            issueCount
+            nodes {
+                ...issueFields
+                ... on Issue {
+                    repository {
+                        name
+                    }
+                }
+            }
+            pageInfo {
+                endCursor
+                hasNextPage
+            }
+        }
+        ...rateLimitFields
+    }
+    """
+    + _ISSUE_FRAGMENT
+    + _RATE_LIMIT_FRAGMENT
+)
+
+
 @dataclasses.dataclass(frozen=True)
-class GqlGithubClient:
-    token: str
-
-    @contextlib.asynccontextmanager
-    async def _gql_client(self) -> typing.AsyncGenerator[gql.Client, None]:
-        gql_transport = gql_aiohttp.AIOHTTPTransport(
-            url="https://api.github.com/graphql",
-            headers={"Authorization": f"Bearer {self.token}"},
-            ssl=True,
-        )
-        gql_client = gql.Client(
-            transport=gql_transport,
-            fetch_schema_from_transport=False,
-        )
+class GetOrganizationIssuesRequest(CreatedSearchRequest):
+    owner: github_models.OwnerName
+    created_after: datetime.datetime
+    limit: int = 100
+    after: str | None = None
+    created_inclusive: bool = False
+
+    @property
+    def document(self) -> graphql.DocumentNode:
+        return _GET_ORGANIZATION_ISSUES_DOCUMENT
+
+    @property
+    def query(self) -> str:
+        query = [
+            f"org:{self.owner}",
+            "is:issue",
+            self.created_query,
+            "sort:created-asc",
+        ]
+        return " ".join(query)
+
+
+class GetOrganizationIssuesResponse(BaseResponse):
+    class Search(BaseModel):
+        class Issue(GetRepositoryIssuesResponse.Search.Issue):
+            class Repository(BaseModel):
+                name: github_models.RepositoryName
+
+            repository: Repository
+
+        issue_count: int
+        nodes: list[Issue]
+        page_info: PageInfo
+
+    search: Search
+
+    def to_dataclass(self) -> list[github_models.Issue]:
+        return [
+            github_models.Issue(
+                id=issue.id,
+                author=issue.author.login if issue.author else None,
+                url=issue.url,
+                title=issue.title,
+                body=issue.body,
+                created_at=issue.created_at,
+                repository=issue.repository.name,
+            )
+            for issue in self.search.nodes
+        ]
+
+
+_GET_ORGANIZATION_PRS_DOCUMENT = gql.gql(
+    """
+    query getOrganizationPRs($query: String!, $limit: Int!, $after: String) {
+        search(query: $query, type: ISSUE, first: $limit, after: $after) {
+            issueCount
+            nodes {
+                ...prFields
+                ... on PullRequest {
+                    repository {
+                        name
+                    }
+                }
+            }
+            pageInfo {
+                endCursor
+                hasNextPage
+            }
+        }
+        ...rateLimitFields
+    }
+    """
+    + _PR_FRAGMENT
+    + _RATE_LIMIT_FRAGMENT
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class GetOrganizationPRsRequest(CreatedSearchRequest):
+    owner: github_models.OwnerName
+    created_after: datetime.datetime
+    limit: int = 100
+    after: str | None = None
+    created_inclusive: bool = False
+
+    @property
+    def document(self) -> graphql.DocumentNode:
+        return _GET_ORGANIZATION_PRS_DOCUMENT
+
+    @property
+    def query(self) -> str:
+        query = [
+            f"org:{self.owner}",
+            "is:pr",
+            self.created_query,
+            "sort:created-asc",
+        ]
+        return " ".join(query)
+
+
+class GetOrganizationPRsResponse(BaseResponse):
+    class Search(BaseModel):
+        class PR(GetRepositoryPRsResponse.Search.PR):
+            class Repository(BaseModel):
+                name: github_models.RepositoryName
+
+            repository: Repository
+
+        issue_count: int
+        nodes: list[PR]
+        page_info: PageInfo
+
+    search: Search
+
+    def to_dataclass(self) -> list[github_models.PullRequest]:
+        return [
+            github_models.PullRequest(
+                id=pr.id,
+                author=pr.author.login if pr.author else None,
+                url=pr.url,
+                title=pr.title,
+                body=pr.body,
+                created_at=pr.created_at,
+                repository=pr.repository.name,
+            )
+            for pr in self.search.nodes
+        ]
+
+
+def _get_error_alias(error: typing.Any) -> str | None:
+    if not isinstance(error, dict):
+        return None
+
+    path = typing.cast(list[typing.Any], error.get("path") or [None])  # pyright: ignore[reportUnknownMemberType]
+    return path[0] if isinstance(path[0], str) else None
+
+
+@dataclasses.dataclass(frozen=True)
+class _PendingSearch:
+    request: BaseSearchRequest
+    future: asyncio.Future[typing.Any]
+
+
+class _SearchBatcher:
+    """
+    Coalesces concurrently issued search requests into aliased documents of up to max_size searches.
+    """
+
+    def __init__(
+        self,
+        execute: typing.Callable[[graphql.DocumentNode, dict[str, typing.Any]], typing.Awaitable[typing.Any]],
+        max_size: int,
+        delay: float,
+    ):
+        self._execute = execute
+        self._max_size = max_size
+        self._delay = delay
+
+        self._pending: dict[tuple[type[BaseSearchRequest], int], list[_PendingSearch]] = {}
+        self._flush_handles: dict[tuple[type[BaseSearchRequest], int], asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def search(self, request: BaseSearchRequest) -> typing.Any:
+        loop = asyncio.get_running_loop()
+        key = (type(request), request.limit)
+        future: asyncio.Future[typing.Any] = loop.create_future()
+
+        pending = self._pending.setdefault(key, [])
+        pending.append(_PendingSearch(request=request, future=future))
+
+        if len(pending) >= self._max_size:
+            self._flush(key)
+        elif key not in self._flush_handles:
+            self._flush_handles[key] = loop.call_later(self._delay, self._flush, key)
+
+        return await future
+
+    def _flush(self, key: tuple[type[BaseSearchRequest], int]) -> None:
+        handle = self._flush_handles.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+
+        # Searches cancelled by their callers while pending are not sent
+        batch = [item for item in self._pending.pop(key, []) if not item.future.done()]
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._execute_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute_batch(self, batch: list[_PendingSearch]) -> None:
+        request_class = type(batch[0].request)
+        document = request_class.batch_document(len(batch))
+        params: dict[str, typing.Any] = {"limit": batch[0].request.limit}
+        for index, item in enumerate(batch):
+            params[f"query{index}"] = item.request.query
+            params[f"after{index}"] = item.request.after
+
         try:
-            yield gql_client
+            try:
+                response = await self._execute(document, params)
+                errors: list[typing.Any] = []
+            except gql_exceptions.TransportQueryError as exc:
+                # Errors of some searches are returned along with data of the others
+                if not exc.data:
+                    raise
+                response = exc.data
+                errors = exc.errors or []
+        except Exception as exc:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+        else:
+            for index, item in enumerate(batch):
+                if item.future.done():
+                    continue
+
+                alias = f"search{index}"
+                alias_errors = [error for error in errors if _get_error_alias(error) == alias]
+                if alias_errors or response.get(alias) is None:
+                    item.future.set_exception(
+                        gql_exceptions.TransportQueryError(str(alias_errors), errors=alias_errors)
+                    )
+                else:
+                    item.future.set_result({"search": response[alias]})
         finally:
-            await gql_transport.close()
+            for item in batch:
+                if not item.future.done():
+                    item.future.cancel()
+
+    async def dispose(self) -> None:
+        for handle in self._flush_handles.values():
+            handle.cancel()
+        self._flush_handles.clear()
+
+        for batch in self._pending.values():
+            for item in batch:
+                item.future.cancel()
+        self._pending.clear()
+
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+# https://docs.github.com/en/graphql/overview/rate-limits-and-query-limits-for-the-graphql-api#exceeding-the-rate-limit
+def _is_rate_limited_error(error: Exception, response_headers: typing.Mapping[str, str] | None = None) -> bool:
+    if isinstance(error, gql_exceptions.TransportServerError):
+        if error.code == 429:
+            return True
+        if error.code != 403:
+            return False
+
+        # Permission errors are 403 as well, only rate limit ones tell about the limit
+        if response_headers is not None and (
+            "Retry-After" in response_headers or response_headers.get("X-RateLimit-Remaining") == "0"
+        ):
+            return True
+        return "rate limit" in str(error).lower()
+
+    if isinstance(error, gql_exceptions.TransportQueryError):
+        return any(isinstance(item, dict) and item.get("type") == "RATE_LIMITED" for item in error.errors or [])
+
+    return False
+
+
+def _get_retry_after(response_headers: typing.Mapping[str, str] | None) -> float | None:
+    retry_after = response_headers.get("Retry-After") if response_headers is not None else None
+    if retry_after is None:
+        return None
+
+    try:
+        return float(retry_after)
+    except ValueError:
+        return None
+
+
+def _is_not_found_node_error(error: typing.Any) -> bool:
+    return isinstance(error, dict) and error.get("type") == "NOT_FOUND" and _get_error_alias(error) == "nodes"
+
+
+class GqlGithubClient:
+    def __init__(
+        self,
+        token: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        search_batch_size: int = DEFAULT_SEARCH_BATCH_SIZE,
+        search_batch_delay: float = DEFAULT_SEARCH_BATCH_DELAY,
+        rate_limit_governor: rate_limit.RateLimitGovernor | None = None,
+        max_rate_limit_retries: int = DEFAULT_MAX_RATE_LIMIT_RETRIES,
+    ):
+        self._token = token
+        self._pool_size = pool_size
+        self._keepalive_timeout = keepalive_timeout
+        self._rate_limit_governor = rate_limit_governor or rate_limit.RateLimitGovernor()
+        self._max_rate_limit_retries = max_rate_limit_retries
+
+        self._gql_client: gql.Client | None = None
+        self._gql_session: gql_client_module.AsyncClientSession | None = None
+        self._connect_lock = asyncio.Lock()
+
+        self._search_batcher: _SearchBatcher | None = None
+        if search_batch_size > 1:
+            self._search_batcher = _SearchBatcher(
+                execute=self._execute,
+                max_size=search_batch_size,
+                delay=search_batch_delay,
+            )
+
+    @classmethod
+    def from_token(
+        cls,
+        token: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT,
+        search_batch_size: int = DEFAULT_SEARCH_BATCH_SIZE,
+        search_batch_delay: float = DEFAULT_SEARCH_BATCH_DELAY,
+        rate_limit_governor: rate_limit.RateLimitGovernor | None = None,
+    ) -> typing.Self:
+        return cls(
+            token=token,
+            pool_size=pool_size,
+            keepalive_timeout=keepalive_timeout,
+            search_batch_size=search_batch_size,
+            search_batch_delay=search_batch_delay,
+            rate_limit_governor=rate_limit_governor,
+        )
+
+    @property
+    def token(self) -> str:
+        return self._token
+
+    async def dispose(self) -> None:
+        if self._search_batcher is not None:
+            await self._search_batcher.dispose()
+
+        async with self._connect_lock:
+            if self._gql_client is None:
+                return
+
+            await self._gql_client.close_async()
+            self._gql_client = None
+            self._gql_session = None
+
+    async def _get_session(self) -> gql_client_module.AsyncClientSession:
+        if self._gql_session is not None:
+            return self._gql_session
+
+        async with self._connect_lock:
+            if self._gql_session is not None:
+                return self._gql_session
+
+            gql_transport = gql_aiohttp.AIOHTTPTransport(
+                url="https://api.github.com/graphql",
+                headers={"Authorization": f"Bearer {self._token}"},
+                ssl=True,
+                client_session_args={
+                    "connector": aiohttp.TCPConnector(
+                        limit=self._pool_size,
+                        keepalive_timeout=self._keepalive_timeout,
+                    ),
+                },
+            )
+            gql_client = gql.Client(
+                transport=gql_transport,
+                fetch_schema_from_transport=False,
+            )
+            gql_session = await gql_client.connect_async()
+            assert isinstance(gql_session, gql_client_module.AsyncClientSession)
+
+            self._gql_client = gql_client
+            self._gql_session = gql_session
+            logger.debug("GraphQL session has been opened with pool_size(%s)", self._pool_size)
+
+            return gql_session
+
+    @property
+    def rate_limit_governor(self) -> rate_limit.RateLimitGovernor:
+        return self._rate_limit_governor
+
+    def _get_response_headers(self) -> typing.Mapping[str, str] | None:
+        # Transport keeps headers of its latest response, so concurrent requests make them a best effort hint
+        if self._gql_client is None or not isinstance(self._gql_client.transport, gql_aiohttp.AIOHTTPTransport):
+            return None
+        # Attribute is set only once the transport has received a response
+        return getattr(self._gql_client.transport, "response_headers", None)
+
+    async def _execute(self, document: graphql.DocumentNode, params: dict[str, typing.Any]) -> typing.Any:
+        gql_session = await self._get_session()
+
+        attempt = 0
+        while True:
+            logger.debug("Requesting document(%s) params(%s)", document, params)
+            try:
+                async with self._rate_limit_governor.acquire(resource="graphql"):
+                    response = await gql_session.execute(
+                        document=document,
+                        variable_values=params,
+                    )
+            except (gql_exceptions.TransportServerError, gql_exceptions.TransportQueryError) as e:
+                response_headers = self._get_response_headers()
+                if attempt >= self._max_rate_limit_retries or not _is_rate_limited_error(e, response_headers):
+                    raise
+
+                self._rate_limit_governor.block(resource="graphql", retry_after=_get_retry_after(response_headers))
+                attempt += 1
+                continue
+
+            self._rate_limit_governor.update_from_graphql(response.get("rateLimit"))
+            return response
 
     async def _request[ResponseT: BaseResponse](
         self,
         request: BaseRequest,
         response_model: type[ResponseT],
     ) -> ResponseT:
-        logger.debug("Requesting document(%s) params(%s)", request.document, request.params)
-        async with self._gql_client() as gql_client:
-            response = await gql_client.execute_async(
-                document=request.document,
-                variable_values=request.params,
-            )
+        response = await self._execute(request.document, request.params)
         parsed_response = response_model.model_validate(response)
 
         return parsed_response
 
+    async def _search[ResponseT: BaseResponse](
+        self,
+        request: BaseSearchRequest,
+        response_model: type[ResponseT],
+    ) -> ResponseT:
+        if self._search_batcher is None:
+            return await self._request(request, response_model)
+
+        response = await self._search_batcher.search(request)
+        return response_model.model_validate(response)
+
     async def _get_repositories(
         self,
         request: GetRepositoriesRequest,
@@ -299,13 +959,7 @@ class GqlGithubClient:
     ) -> typing.AsyncGenerator[github_models.Repository, None]:
         after = request.after
         while True:
-            response = await self._get_repositories(
-                request=GetRepositoriesRequest(
-                    owner=request.owner,
-                    limit=request.limit,
-                    after=after,
-                ),
-            )
+            response = await self._get_repositories(request=dataclasses.replace(request, after=after))
             for repository in response.to_dataclass():
                 yield repository
             if not response.search.page_info.has_next_page:
@@ -314,22 +968,141 @@ class GqlGithubClient:
             after = response.search.page_info.end_cursor
             assert after is not None
 
+    async def get_repositories_activity(
+        self,
+        request: GetRepositoriesActivityRequest,
+    ) -> list[github_models.RepositoryActivity]:
+        requests = [
+            GetRepositoriesActivityRequest(ids=request.ids[index : index + REPOSITORIES_ACTIVITY_BATCH_SIZE])
+            for index in range(0, len(request.ids), REPOSITORIES_ACTIVITY_BATCH_SIZE)
+        ]
+        responses = await asyncio.gather(
+            *(self._get_repositories_activity(batch_request) for batch_request in requests)
+        )
+
+        return [activity for response in responses for activity in response.to_dataclass()]
+
+    async def _get_repositories_activity(
+        self,
+        request: GetRepositoriesActivityRequest,
+    ) -> GetRepositoriesActivityResponse:
+        try:
+            return await self._request(request, GetRepositoriesActivityResponse)
+        except gql_exceptions.TransportQueryError as exc:
+            # Deleted or no longer visible repositories fail only their own nodes
+            if not exc.data or not exc.errors or not all(_is_not_found_node_error(error) for error in exc.errors):
+                raise
+
+            logger.debug("Skipping %s not found repositories", len(exc.errors))
+            return GetRepositoriesActivityResponse.model_validate(exc.data)
+
+    async def _iterate_created_search[
+        RequestT: CreatedSearchRequest,
+        ItemT: github_models.Issue | github_models.PullRequest,
+    ](
+        self,
+        request: RequestT,
+        # Returns items, next page cursor and total count of matched items
+        search: typing.Callable[[RequestT], typing.Awaitable[tuple[list[ItemT], str | None, int]]],
+    ) -> typing.AsyncGenerator[ItemT, None]:
+        # Ids of yielded items created at last_created, restarted search returns them again
+        last_created: datetime.datetime | None = None
+        last_created_ids: set[str] = set()
+
+        fetched = 0
+        yielded = 0
+        while True:
+            items, next_cursor, total_count = await search(request)
+            for item in items:
+                fetched += 1
+                if item.created_at == last_created and item.id in last_created_ids:
+                    continue
+
+                yielded += 1
+                yield item
+                if item.created_at != last_created:
+                    last_created = item.created_at
+                    last_created_ids = set()
+                last_created_ids.add(item.id)
+
+            if next_cursor is not None:
+                request = request.next_page(after=next_cursor)
+                continue
+
+            # Search stops paginating after SEARCH_RESULTS_LIMIT results, restarting from the last seen item
+            if fetched >= total_count or last_created is None:
+                return
+            # Restarted search has only returned items created at last_created, so it can't move forward
+            if yielded == 0:
+                logger.warning(
+                    "More than %s items created at %s, skipping the rest", SEARCH_RESULTS_LIMIT, last_created
+                )
+                return
+            request = request.restart(created_after=last_created)
+            fetched = 0
+            yielded = 0
+
+    async def _search_repository_issues(
+        self,
+        request: GetRepositoryIssuesRequest,
+    ) -> tuple[list[github_models.Issue], str | None, int]:
+        response = await self._search(request, GetRepositoryIssuesResponse)
+        return response.to_dataclass(), response.search.page_info.next_cursor, response.search.issue_count
+
     async def get_repository_issues(
         self,
         request: GetRepositoryIssuesRequest,
-    ) -> list[github_models.Issue]:
-        response = await self._request(request, GetRepositoryIssuesResponse)
-        return response.to_dataclass()
+    ) -> typing.AsyncGenerator[github_models.Issue, None]:
+        async for issue in self._iterate_created_search(request, self._search_repository_issues):
+            yield issue
+
+    async def _search_repository_pull_requests(
+        self,
+        request: GetRepositoryPRsRequest,
+    ) -> tuple[list[github_models.PullRequest], str | None, int]:
+        response = await self._search(request, GetRepositoryPRsResponse)
+        return response.to_dataclass(), response.search.page_info.next_cursor, response.search.issue_count
 
     async def get_repository_pull_requests(
         self,
         request: GetRepositoryPRsRequest,
-    ) -> list[github_models.PullRequest]:
-        response = await self._request(request, GetRepositoryPRsResponse)
-        return response.to_dataclass()
+    ) -> typing.AsyncGenerator[github_models.PullRequest, None]:
+        async for pr in self._iterate_created_search(request, self._search_repository_pull_requests):
+            yield pr
+
+    async def _search_organization_issues(
+        self,
+        request: GetOrganizationIssuesRequest,
+    ) -> tuple[list[github_models.Issue], str | None, int]:
+        response = await self._request(request, GetOrganizationIssuesResponse)
+        return response.to_dataclass(), response.search.page_info.next_cursor, response.search.issue_count
+
+    async def get_organization_issues(
+        self,
+        request: GetOrganizationIssuesRequest,
+    ) -> typing.AsyncGenerator[github_models.Issue, None]:
+        async for issue in self._iterate_created_search(request, self._search_organization_issues):
+            yield issue
+
+    async def _search_organization_pull_requests(
+        self,
+        request: GetOrganizationPRsRequest,
+    ) -> tuple[list[github_models.PullRequest], str | None, int]:
+        response = await self._request(request, GetOrganizationPRsResponse)
+        return response.to_dataclass(), response.search.page_info.next_cursor, response.search.issue_count
+
+    async def get_organization_pull_requests(
+        self,
+        request: GetOrganizationPRsRequest,
+    ) -> typing.AsyncGenerator[github_models.PullRequest, None]:
+        async for pr in self._iterate_created_search(request, self._search_organization_pull_requests):
+            yield pr
 
 
 __all__ = [
+    "GetOrganizationIssuesRequest",
+    "GetOrganizationPRsRequest",
+    "GetRepositoriesActivityRequest",
     "GetRepositoriesRequest",
     "GetRepositoryIssuesRequest",
     "GetRepositoryPRsRequest",
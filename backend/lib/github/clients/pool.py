@@ -0,0 +1,87 @@
+import logging
+
+import lib.github.clients.etag_cache as etag_cache_module
+import lib.github.clients.gql as gql_clients
+import lib.github.clients.rate_limit as rate_limit
+import lib.github.clients.rest as rest_clients
+
+logger = logging.getLogger(__name__)
+
+
+class GithubClientPool:
+    """
+    Keeps clients per token for the pool lifetime, so connections and caches survive across trigger jobs.
+    Clients of the same token share rate limit governor, as GitHub rate limits are per token.
+    """
+
+    def __init__(self):
+        self._rate_limit_governors: dict[str, rate_limit.RateLimitGovernor] = {}
+        self._etag_caches: dict[str, etag_cache_module.ETagCache] = {}
+        self._rest_clients: dict[str, rest_clients.RestGithubClient] = {}
+        self._gql_clients: dict[tuple[str, int], gql_clients.GqlGithubClient] = {}
+
+    def get_rate_limit_governor(self, token: str) -> rate_limit.RateLimitGovernor:
+        if token not in self._rate_limit_governors:
+            self._rate_limit_governors[token] = rate_limit.RateLimitGovernor()
+        return self._rate_limit_governors[token]
+
+    def get_etag_cache(
+        self,
+        token: str,
+        max_size: int = etag_cache_module.DEFAULT_MAX_SIZE,
+        max_bytes: int = etag_cache_module.DEFAULT_MAX_BYTES,
+    ) -> etag_cache_module.ETagCache:
+        if token not in self._etag_caches:
+            self._etag_caches[token] = etag_cache_module.ETagCache(max_size=max_size, max_bytes=max_bytes)
+        return self._etag_caches[token]
+
+    def get_rest_client(
+        self,
+        token: str,
+        etag_cache_size: int = etag_cache_module.DEFAULT_MAX_SIZE,
+        etag_cache_max_bytes: int = etag_cache_module.DEFAULT_MAX_BYTES,
+    ) -> rest_clients.RestGithubClient:
+        if token not in self._rest_clients:
+            self._rest_clients[token] = rest_clients.RestGithubClient.from_token(
+                token=token,
+                rate_limit_governor=self.get_rate_limit_governor(token),
+                etag_cache=self.get_etag_cache(token, max_size=etag_cache_size, max_bytes=etag_cache_max_bytes),
+            )
+        return self._rest_clients[token]
+
+    def get_gql_client(
+        self,
+        token: str,
+        search_batch_size: int = gql_clients.DEFAULT_SEARCH_BATCH_SIZE,
+    ) -> gql_clients.GqlGithubClient:
+        key = (token, search_batch_size)
+        if key not in self._gql_clients:
+            self._gql_clients[key] = gql_clients.GqlGithubClient.from_token(
+                token=token,
+                search_batch_size=search_batch_size,
+                rate_limit_governor=self.get_rate_limit_governor(token),
+            )
+        return self._gql_clients[key]
+
+    async def dispose(self) -> None:
+        logger.debug(
+            "Disposing %s REST and %s GraphQL github clients",
+            len(self._rest_clients),
+            len(self._gql_clients),
+        )
+        rest_clients_list = list(self._rest_clients.values())
+        gql_clients_list = list(self._gql_clients.values())
+        self._rest_clients.clear()
+        self._gql_clients.clear()
+        self._rate_limit_governors.clear()
+        self._etag_caches.clear()
+
+        for rest_client in rest_clients_list:
+            await rest_client.dispose()
+        for gql_client in gql_clients_list:
+            await gql_client.dispose()
+
+
+__all__ = [
+    "GithubClientPool",
+]
@@ -0,0 +1,176 @@
+import asyncio
+import contextlib
+import dataclasses
+import datetime
+import logging
+import time
+import typing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 20
+DEFAULT_RESERVE = 50
+# https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api#handle-rate-limit-errors-appropriately
+DEFAULT_RETRY_AFTER = 60
+
+
+@dataclasses.dataclass(frozen=True)
+class RateLimitMetrics:
+    resource: str
+    limit: int | None
+    remaining: int | None
+    used: int | None
+    reset_at: datetime.datetime | None
+    in_flight: int
+    blocked_until: datetime.datetime | None
+
+
+@dataclasses.dataclass
+class _ResourceBudget:
+    limit: int | None = None
+    remaining: int | None = None
+    reset_at: float | None = None
+    in_flight: int = 0
+    blocked_until: float = 0
+
+    def to_metrics(self, resource: str) -> RateLimitMetrics:
+        return RateLimitMetrics(
+            resource=resource,
+            limit=self.limit,
+            remaining=self.remaining,
+            used=self.limit - self.remaining if self.limit is not None and self.remaining is not None else None,
+            reset_at=_to_datetime(self.reset_at),
+            in_flight=self.in_flight,
+            blocked_until=_to_datetime(self.blocked_until) if self.blocked_until > time.time() else None,
+        )
+
+
+def _to_datetime(timestamp: float | None) -> datetime.datetime | None:
+    if timestamp is None:
+        return None
+
+    return datetime.datetime.fromtimestamp(timestamp, tz=datetime.UTC)
+
+
+class RateLimitGovernor:
+    """
+    Tracks rate limit budget of a single token per resource (core, graphql, search, ...).
+    Requests are delayed when the budget is about to be exhausted or a retry-after block is active.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        reserve: int = DEFAULT_RESERVE,
+        default_retry_after: float = DEFAULT_RETRY_AFTER,
+    ):
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._reserve = reserve
+        self._default_retry_after = default_retry_after
+
+        self._budgets: dict[str, _ResourceBudget] = {}
+
+    def _get_budget(self, resource: str) -> _ResourceBudget:
+        if resource not in self._budgets:
+            self._budgets[resource] = _ResourceBudget()
+        return self._budgets[resource]
+
+    @property
+    def metrics(self) -> list[RateLimitMetrics]:
+        return [budget.to_metrics(resource) for resource, budget in self._budgets.items()]
+
+    async def _wait(self, resource: str, budget: _ResourceBudget) -> None:
+        while True:
+            now = time.time()
+            if budget.blocked_until > now:
+                delay = budget.blocked_until - now
+                logger.warning("Rate limit of Resource(%s) is blocked, waiting %.1f seconds", resource, delay)
+                await asyncio.sleep(delay)
+                continue
+
+            if (
+                budget.remaining is not None
+                and budget.reset_at is not None
+                and budget.reset_at > now
+                and budget.remaining - budget.in_flight <= self._reserve
+            ):
+                delay = budget.reset_at - now
+                logger.warning(
+                    "Rate limit of Resource(%s) is almost exhausted, remaining(%s), waiting %.1f seconds for reset",
+                    resource,
+                    budget.remaining,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+                budget.remaining = None
+                continue
+
+            return
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, resource: str) -> typing.AsyncIterator[None]:
+        budget = self._get_budget(resource)
+        await self._wait(resource, budget)
+        async with self._semaphore:
+            budget.in_flight += 1
+            try:
+                yield
+            finally:
+                budget.in_flight -= 1
+
+    def update(
+        self,
+        resource: str,
+        limit: int | None,
+        remaining: int | None,
+        reset_at: float | None,
+    ) -> None:
+        budget = self._get_budget(resource)
+        if budget.reset_at is not None and reset_at is not None and reset_at < budget.reset_at:
+            # Response from the previous rate limit window, newer data is already known
+            return
+
+        budget.limit = limit
+        budget.remaining = remaining
+        budget.reset_at = reset_at
+        logger.debug("Rate limit of Resource(%s) has been updated: %s", resource, budget.to_metrics(resource))
+
+    def update_from_headers(self, headers: typing.Mapping[str, str], default_resource: str) -> None:
+        if "X-RateLimit-Remaining" not in headers:
+            return
+
+        self.update(
+            resource=headers.get("X-RateLimit-Resource", default_resource),
+            limit=int(headers["X-RateLimit-Limit"]) if "X-RateLimit-Limit" in headers else None,
+            remaining=int(headers["X-RateLimit-Remaining"]),
+            reset_at=float(headers["X-RateLimit-Reset"]) if "X-RateLimit-Reset" in headers else None,
+        )
+
+    def update_from_graphql(self, rate_limit: typing.Mapping[str, typing.Any] | None) -> None:
+        if rate_limit is None:
+            return
+
+        reset_at = rate_limit.get("resetAt")
+        self.update(
+            resource="graphql",
+            limit=rate_limit.get("limit"),
+            remaining=rate_limit.get("remaining"),
+            reset_at=datetime.datetime.fromisoformat(reset_at).timestamp() if reset_at is not None else None,
+        )
+
+    def block(self, resource: str, retry_after: float | None = None) -> None:
+        budget = self._get_budget(resource)
+        if retry_after is None:
+            if budget.remaining == 0 and budget.reset_at is not None:
+                retry_after = budget.reset_at - time.time()
+            else:
+                retry_after = self._default_retry_after
+
+        logger.warning("Rate limit of Resource(%s) has been hit, blocking for %.1f seconds", resource, retry_after)
+        budget.blocked_until = max(budget.blocked_until, time.time() + retry_after)
+
+
+__all__ = [
+    "RateLimitGovernor",
+    "RateLimitMetrics",
+]
@@ -1,17 +1,29 @@
 import abc
+import asyncio
 import dataclasses
 import datetime
 import logging
+import math
 import typing
 
 import aiohttp
 import pydantic
 
+import lib.github.clients.etag_cache as etag_cache_module
+import lib.github.clients.rate_limit as rate_limit
 import lib.github.models as github_models
 import lib.utils.pydantic as pydantic_utils
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_RATE_LIMIT_RETRIES = 3
+DEFAULT_MAX_CONCURRENT_PAGES = 4
+
+# https://docs.github.com/en/rest/actions/workflow-runs#list-workflow-runs-for-a-repository
+WORKFLOW_RUNS_RESULTS_LIMIT = 1000
+# https://docs.github.com/en/rest/activity/events#list-public-organization-events
+EVENTS_RESULTS_LIMIT = 300
+
 
 class BaseRequest(abc.ABC):
     @property
@@ -26,6 +38,10 @@ class BaseRequest(abc.ABC):
     @abc.abstractmethod
     def params(self) -> dict[str, typing.Any]: ...
 
+    @property
+    def rate_limit_resource(self) -> str:
+        return "core"
+
 
 class BaseResponse(pydantic_utils.BaseModel):
     def to_dataclass(self) -> typing.Any:
@@ -41,6 +57,7 @@ class GetRepositoryWorkflowRunsRequest(BaseRequest):
     per_page: int = 100
     page: int = 1
     exclude_pull_requests: bool = True
+    status: github_models.WorkflowRunStatus | github_models.WorkflowRunConclusion | None = None
 
     @property
     def method(self) -> str:
@@ -52,12 +69,16 @@ class GetRepositoryWorkflowRunsRequest(BaseRequest):
 
     @property
     def params(self) -> dict[str, typing.Any]:
-        return {
+        params: dict[str, typing.Any] = {
             "created": f">={self.created_after.isoformat()}Z",
             "per_page": self.per_page,
             "page": self.page,
             "exclude_pull_requests": "true" if self.exclude_pull_requests else "false",
         }
+        if self.status is not None:
+            params["status"] = self.status
+
+        return params
 
 
 class GetRepositoryWorkflowRunsResponse(BaseResponse):
@@ -124,10 +145,148 @@ class GetOrganizationTeamMembersResponse(BaseResponse, pydantic.RootModel[list[_
         return [member.login for member in self.root]
 
 
+# https://docs.github.com/en/rest/activity/events#list-public-organization-events
+@dataclasses.dataclass(frozen=True)
+class GetOrganizationEventsRequest(BaseRequest):
+    owner: github_models.OrganizationName
+    since_id: str | None = None
+
+    per_page: int = 100
+    page: int = 1
+
+    @property
+    def method(self) -> str:
+        return "GET"
+
+    @property
+    def url(self) -> str:
+        return f"https://api.github.com/orgs/{self.owner}/events"
+
+    @property
+    def params(self) -> dict[str, typing.Any]:
+        return {
+            "per_page": self.per_page,
+            "page": self.page,
+        }
+
+
+class _EventUser(pydantic_utils.BaseModel):
+    login: github_models.UserLogin
+
+
+class _EventIssue(pydantic_utils.BaseModel):
+    node_id: str
+    user: _EventUser | None
+    html_url: str
+    title: str
+    body: str | None
+    created_at: datetime.datetime
+
+
+class _EventPayload(pydantic_utils.BaseModel):
+    action: str | None = None
+    issue: _EventIssue | None = None
+    pull_request: _EventIssue | None = None
+
+
+class _Event(pydantic_utils.BaseModel):
+    class Repo(pydantic_utils.BaseModel):
+        name: str
+
+    id: str
+    type: str | None
+    repo: Repo
+    payload: _EventPayload
+    created_at: datetime.datetime
+
+    @property
+    def repository(self) -> github_models.RepositoryName:
+        return self.repo.name.split("/", 1)[-1]
+
+    def to_dataclass(self) -> github_models.OrganizationEvent:
+        issue = self.payload.issue if self.type == "IssuesEvent" else None
+        pull_request = self.payload.pull_request if self.type == "PullRequestEvent" else None
+
+        return github_models.OrganizationEvent(
+            id=self.id,
+            type=self.type or "",
+            action=self.payload.action,
+            repository=self.repository,
+            created_at=self.created_at,
+            issue=(
+                github_models.Issue(
+                    id=issue.node_id,
+                    author=issue.user.login if issue.user is not None else None,
+                    url=issue.html_url,
+                    title=issue.title,
+                    body=issue.body or "",
+                    created_at=issue.created_at,
+                    repository=self.repository,
+                )
+                if issue is not None
+                else None
+            ),
+            pull_request=(
+                github_models.PullRequest(
+                    id=pull_request.node_id,
+                    author=pull_request.user.login if pull_request.user is not None else None,
+                    url=pull_request.html_url,
+                    title=pull_request.title,
+                    body=pull_request.body or "",
+                    created_at=pull_request.created_at,
+                    repository=self.repository,
+                )
+                if pull_request is not None
+                else None
+            ),
+        )
+
+
+class GetOrganizationEventsResponse(BaseResponse, pydantic.RootModel[list[_Event]]):
+    root: list[_Event]
+
+    def to_dataclass(self) -> list[github_models.OrganizationEvent]:
+        return [event.to_dataclass() for event in self.root]
+
+
+@dataclasses.dataclass(frozen=True)
+class OrganizationEventsPage:
+    # Newest first, only events after `since_id` of the request
+    events: list[github_models.OrganizationEvent]
+    # False when `since_id` is not reached within the events window, so some events may be missed
+    is_complete: bool
+    poll_interval: int | None
+
+
+# https://docs.github.com/en/rest/using-the-rest-api/rate-limits-for-the-rest-api#exceeding-the-rate-limit
+def _is_rate_limited(response: aiohttp.ClientResponse) -> bool:
+    if response.status not in (403, 429):
+        return False
+
+    return "Retry-After" in response.headers or response.headers.get("X-RateLimit-Remaining") == "0"
+
+
+def _get_retry_after(response: aiohttp.ClientResponse) -> float | None:
+    retry_after = response.headers.get("Retry-After")
+    if retry_after is None:
+        return None
+
+    try:
+        return float(retry_after)
+    except ValueError:
+        return None
+
+
 @dataclasses.dataclass(frozen=True)
 class RestGithubClient:
     aiohttp_client: aiohttp.ClientSession
     token: str
+    rate_limit_governor: rate_limit.RateLimitGovernor = dataclasses.field(
+        default_factory=rate_limit.RateLimitGovernor,
+    )
+    max_rate_limit_retries: int = DEFAULT_MAX_RATE_LIMIT_RETRIES
+    max_concurrent_pages: int = DEFAULT_MAX_CONCURRENT_PAGES
+    etag_cache: etag_cache_module.ETagCache = dataclasses.field(default_factory=etag_cache_module.ETagCache)
 
     class BaseError(Exception): ...
 
@@ -136,9 +295,21 @@ class RestGithubClient:
     class UnknownResponseError(BaseError): ...
 
     @classmethod
-    def from_token(cls, token: str) -> typing.Self:
+    def from_token(
+        cls,
+        token: str,
+        rate_limit_governor: rate_limit.RateLimitGovernor | None = None,
+        etag_cache: etag_cache_module.ETagCache | None = None,
+    ) -> typing.Self:
         aiohttp_client = aiohttp.ClientSession()
-        return cls(aiohttp_client=aiohttp_client, token=token)
+        return cls(
+            aiohttp_client=aiohttp_client,
+            token=token,
+            rate_limit_governor=(
+                rate_limit_governor if rate_limit_governor is not None else rate_limit.RateLimitGovernor()
+            ),
+            etag_cache=etag_cache if etag_cache is not None else etag_cache_module.ETagCache(),
+        )
 
     async def dispose(self) -> None:
         await self.aiohttp_client.close()
@@ -147,19 +318,59 @@ class RestGithubClient:
         self,
         request: BaseRequest,
     ) -> typing.Any:
+        body, _ = await self._request_with_headers(request)
+        return body
+
+    async def _request_with_headers(
+        self,
+        request: BaseRequest,
+    ) -> tuple[typing.Any, typing.Mapping[str, str]]:
         headers = {
             "Authorization": f"Bearer {self.token}",
             "Accept": "application/vnd.github.v3+json",
         }
-        logger.debug("Requesting method(%s) url(%s) params(%s)", request.method, request.url, request.params)
-        async with self.aiohttp_client.request(
-            method=request.method,
-            url=request.url,
-            params=request.params,
-            headers=headers,
-        ) as response:
-            response.raise_for_status()
-            return await response.json()
+
+        cache_key = self.etag_cache.make_key(request.method, request.url, request.params)
+        cache_entry = self.etag_cache.get(cache_key) if request.method == "GET" else None
+        if cache_entry is not None:
+            headers["If-None-Match"] = cache_entry.etag
+
+        attempt = 0
+        while True:
+            logger.debug("Requesting method(%s) url(%s) params(%s)", request.method, request.url, request.params)
+            async with (
+                self.rate_limit_governor.acquire(resource=request.rate_limit_resource),
+                self.aiohttp_client.request(
+                    method=request.method,
+                    url=request.url,
+                    params=request.params,
+                    headers=headers,
+                ) as response,
+            ):
+                self.rate_limit_governor.update_from_headers(
+                    response.headers,
+                    default_resource=request.rate_limit_resource,
+                )
+                if attempt < self.max_rate_limit_retries and _is_rate_limited(response):
+                    self.rate_limit_governor.block(
+                        resource=response.headers.get("X-RateLimit-Resource", request.rate_limit_resource),
+                        retry_after=_get_retry_after(response),
+                    )
+                    attempt += 1
+                    continue
+
+                if response.status == 304 and cache_entry is not None:
+                    logger.debug("Response for url(%s) params(%s) is not modified", request.url, request.params)
+                    return cache_entry.body, response.headers
+
+                response.raise_for_status()
+                body = await response.json()
+
+                etag = response.headers.get("ETag")
+                if request.method == "GET" and etag is not None:
+                    self.etag_cache.set(cache_key, etag=etag, body=body, size=len(await response.read()))
+
+                return body, response.headers
 
     async def _get_repository_workflow_runs(
         self,
@@ -167,9 +378,13 @@ class RestGithubClient:
     ) -> GetRepositoryWorkflowRunsResponse:
         try:
             raw_data = await self._request(request)
-        except aiohttp.ClientResponseError as e:  # pragma: no cover
-            logger.exception("Unknown response error")
-            raise self.UnknownResponseError from e
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404:
+                logger.info(e.message)
+                raise self.NotFoundError from e
+
+            logger.exception("Unknown response error")  # pragma: no cover
+            raise self.UnknownResponseError from e  # pragma: no cover
 
         return GetRepositoryWorkflowRunsResponse.model_validate(raw_data)
 
@@ -177,23 +392,93 @@ class RestGithubClient:
         self,
         request: GetRepositoryWorkflowRunsRequest,
     ) -> typing.AsyncGenerator[github_models.WorkflowRun, None]:
-        page = request.page
+        response = await self._get_repository_workflow_runs(request=request)
+        for workflow_run in response.to_dataclass():
+            yield workflow_run
 
-        while True:
+        if len(response.workflow_runs) < request.per_page:
+            return
+
+        total_count = min(response.total_count, WORKFLOW_RUNS_RESULTS_LIMIT)
+        last_page = math.ceil(total_count / request.per_page)
+        semaphore = asyncio.Semaphore(self.max_concurrent_pages)
+
+        async def get_page(page: int) -> GetRepositoryWorkflowRunsResponse:
+            async with semaphore:
+                return await self._get_repository_workflow_runs(request=dataclasses.replace(request, page=page))
+
+        tasks = [asyncio.create_task(get_page(page)) for page in range(request.page + 1, last_page + 1)]
+        try:
+            for task in tasks:
+                response = await task
+                for workflow_run in response.to_dataclass():
+                    yield workflow_run
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def get_latest_repository_workflow_run(
+        self,
+        request: GetRepositoryWorkflowRunsRequest,
+    ) -> github_models.WorkflowRun | None:
+        response = await self._get_repository_workflow_runs(
+            request=dataclasses.replace(request, per_page=1, page=1),
+        )
+        workflow_runs = response.to_dataclass()
+
+        return workflow_runs[0] if workflow_runs else None
+
+    async def get_oldest_repository_workflow_run(
+        self,
+        request: GetRepositoryWorkflowRunsRequest,
+    ) -> github_models.WorkflowRun | None:
+        # Runs are listed newest first, so the oldest one is on the last single item page
+        response = await self._get_repository_workflow_runs(
+            request=dataclasses.replace(request, per_page=1, page=1),
+        )
+        last_page = min(response.total_count, WORKFLOW_RUNS_RESULTS_LIMIT)
+        if last_page > 1:
             response = await self._get_repository_workflow_runs(
-                request=GetRepositoryWorkflowRunsRequest(
-                    owner=request.owner,
-                    repository=request.repository,
-                    created_after=request.created_after,
-                    page=page,
-                    per_page=request.per_page,
-                ),
+                request=dataclasses.replace(request, per_page=1, page=last_page),
             )
-            if not response.workflow_runs:
-                return
+        workflow_runs = response.to_dataclass()
 
-            for workflow_run in response.to_dataclass():
-                yield workflow_run
+        return workflow_runs[0] if workflow_runs else None
+
+    async def get_organization_events(
+        self,
+        request: GetOrganizationEventsRequest,
+    ) -> OrganizationEventsPage:
+        events: list[github_models.OrganizationEvent] = []
+        poll_interval: int | None = None
+        page = request.page
+
+        while True:
+            try:
+                raw_data, headers = await self._request_with_headers(dataclasses.replace(request, page=page))
+            except aiohttp.ClientResponseError as e:
+                # Pages beyond the events window are answered with 422
+                if e.status == 422:
+                    return OrganizationEventsPage(events=events, is_complete=False, poll_interval=poll_interval)
+                logger.exception("Unknown response error")  # pragma: no cover
+                raise self.UnknownResponseError from e  # pragma: no cover
+
+            if poll_interval is None and "X-Poll-Interval" in headers:
+                poll_interval = int(headers["X-Poll-Interval"])
+
+            response = GetOrganizationEventsResponse.model_validate(raw_data)
+            for event in response.to_dataclass():
+                if event.id == request.since_id:
+                    return OrganizationEventsPage(events=events, is_complete=True, poll_interval=poll_interval)
+                events.append(event)
+
+            if len(response.root) < request.per_page or page * request.per_page >= EVENTS_RESULTS_LIMIT:
+                return OrganizationEventsPage(
+                    events=events,
+                    is_complete=request.since_id is None,
+                    poll_interval=poll_interval,
+                )
 
             page += 1
 
@@ -236,7 +521,9 @@ class RestGithubClient:
 
 
 __all__ = [
+    "GetOrganizationEventsRequest",
     "GetOrganizationTeamMembersRequest",
     "GetRepositoryWorkflowRunsRequest",
+    "OrganizationEventsPage",
     "RestGithubClient",
 ]
@@ -15,6 +15,24 @@ type WorkflowRunConclusion = str
 class Repository:
     owner: OwnerName
     name: RepositoryName
+    id: str | None = dataclasses.field(default=None, compare=False)
+    is_private: bool | None = dataclasses.field(default=None, compare=False)
+
+
+@dataclasses.dataclass(frozen=True)
+class RepositoryActivity:
+    id: str
+    name: RepositoryName
+    pushed_at: datetime.datetime | None
+    updated_at: datetime.datetime
+    is_archived: bool
+    issue_count: int
+    pull_request_count: int
+
+    @property
+    def fingerprint(self) -> str:
+        pushed_at = self.pushed_at.isoformat() if self.pushed_at is not None else ""
+        return f"{pushed_at}|{self.updated_at.isoformat()}|{self.issue_count}|{self.pull_request_count}"
 
 
 @dataclasses.dataclass(frozen=True)
@@ -25,6 +43,7 @@ class Issue:
     title: str
     body: str
     created_at: datetime.datetime
+    repository: RepositoryName | None = None
 
 
 @dataclasses.dataclass(frozen=True)
@@ -35,6 +54,7 @@ class PullRequest:
     title: str
     body: str
     created_at: datetime.datetime
+    repository: RepositoryName | None = None
 
 
 @dataclasses.dataclass(frozen=True)
@@ -47,12 +67,25 @@ class WorkflowRun:
     created_at: datetime.datetime
 
 
+@dataclasses.dataclass(frozen=True)
+class OrganizationEvent:
+    id: str
+    type: str
+    action: str | None
+    repository: RepositoryName
+    created_at: datetime.datetime
+    issue: Issue | None = None
+    pull_request: PullRequest | None = None
+
+
 __all__ = [
     "Issue",
+    "OrganizationEvent",
     "OrganizationName",
     "OwnerName",
     "PullRequest",
     "Repository",
+    "RepositoryActivity",
     "RepositoryName",
     "TeamSlug",
     "UserLogin",
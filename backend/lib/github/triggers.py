@@ -1,22 +1,31 @@
+import asyncio
 import contextlib
 import dataclasses
 import datetime
+import functools
 import logging
 import re
+import time
 import typing
 import warnings
 
 import aiostream.stream as aiostream_stream
 import pydantic
 
+import lib.github.caches as github_caches
 import lib.github.clients as github_clients
 import lib.github.models as github_models
+import lib.github.webhooks as github_webhooks
 import lib.task.base as task_base
 import lib.task.protocols
+import lib.utils.asyncio as asyncio_utils
 import lib.utils.pydantic as pydantic_utils
 
 logger = logging.getLogger(__name__)
 
+# https://docs.github.com/en/rest/actions/workflow-runs#list-workflow-runs-for-a-repository
+INCOMPLETE_WORKFLOW_RUN_STATUSES = ("in_progress", "queued", "requested", "waiting", "pending")
+
 
 class BaseSubtriggerConfig(pydantic_utils.TypedBaseModel, pydantic_utils.IDMixinModel):
     @pydantic.model_validator(mode="before")
@@ -27,44 +36,68 @@ class BaseSubtriggerConfig(pydantic_utils.TypedBaseModel, pydantic_utils.IDMixin
         return data
 
 
-def _check_match(string: str, items: set[str] | None = None) -> bool:
-    return items is not None and len(items) != 0 and string in items
+def _compile_regexes(regexes: set[str]) -> tuple[re.Pattern[str], ...]:
+    """
+    Combines regexes into a single alternation, regexes with groups or global flags are kept separate
+    as they change meaning when combined.
+    """
+    compiled: list[re.Pattern[str]] = []
+    for regex in sorted(regexes):
+        try:
+            compiled.append(re.compile(regex))
+        except re.error as exc:
+            raise ValueError(f"Invalid regex {regex!r}: {exc}") from exc
 
+    default_flags = re.compile("").flags
 
-def _check_regex_match(string: str, regex_items: set[str] | None = None) -> bool:
-    return regex_items is not None and len(regex_items) != 0 and any(re.match(regex, string) for regex in regex_items)
+    combinable = [pattern for pattern in compiled if pattern.groups == 0 and pattern.flags == default_flags]
+    separate = [pattern for pattern in compiled if pattern not in combinable]
+    if len(combinable) > 1:
+        combinable = [re.compile("|".join(f"(?:{pattern.pattern})" for pattern in combinable))]
 
+    return (*combinable, *separate)
 
-def _check_included(
-    string: str,
-    include: set[str] | None = None,
-    include_regex: set[str] | None = None,
-) -> bool:
-    return (
-        (not include and not include_regex)
-        or _check_match(string, include)
-        or _check_regex_match(string, include_regex)
-    )
 
+@dataclasses.dataclass(frozen=True)
+class _Matcher:
+    include: frozenset[str] = frozenset()
+    exclude: frozenset[str] = frozenset()
+    include_regex: tuple[re.Pattern[str], ...] = ()
+    exclude_regex: tuple[re.Pattern[str], ...] = ()
 
-def _check_excluded(
-    string: str,
-    exclude: set[str] | None = None,
-    exclude_regex: set[str] | None = None,
-) -> bool:
-    return _check_match(string, exclude) or _check_regex_match(string, exclude_regex)
+    @classmethod
+    def compile(
+        cls,
+        include: set[str] | None = None,
+        exclude: set[str] | None = None,
+        include_regex: set[str] | None = None,
+        exclude_regex: set[str] | None = None,
+    ) -> typing.Self:
+        return cls(
+            include=frozenset(include or ()),
+            exclude=frozenset(exclude or ()),
+            include_regex=_compile_regexes(include_regex or set()),
+            exclude_regex=_compile_regexes(exclude_regex or set()),
+        )
 
+    def is_applicable(self, string: str) -> bool:
+        if (
+            (self.include or self.include_regex)
+            and string not in self.include
+            and not any(pattern.match(string) for pattern in self.include_regex)
+        ):
+            return False
+        if string in self.exclude or any(pattern.match(string) for pattern in self.exclude_regex):
+            return False
 
-def _check_applicable(
-    string: str,
-    include: set[str] | None = None,
-    exclude: set[str] | None = None,
-    include_regex: set[str] | None = None,
-    exclude_regex: set[str] | None = None,
-) -> bool:
-    return _check_included(string, include=include, include_regex=include_regex) and not _check_excluded(
-        string, exclude=exclude, exclude_regex=exclude_regex
-    )
+        return True
+
+
+def _compile_matchers(config: BaseSubtriggerConfig, *names: str) -> None:
+    # Matchers are cached properties, so they are dropped and eagerly rebuilt to validate regexes
+    for name in names:
+        config.__dict__.pop(name, None)
+        getattr(config, name)
 
 
 class RepositoryIssueCreatedSubtriggerConfig(BaseSubtriggerConfig):
@@ -80,25 +113,36 @@ class RepositoryIssueCreatedSubtriggerConfig(BaseSubtriggerConfig):
     include_title_regex: set[str] = pydantic.Field(default_factory=set)
     exclude_title_regex: set[str] = pydantic.Field(default_factory=set)
 
+    @functools.cached_property
+    def author_matcher(self) -> _Matcher:
+        return _Matcher.compile(include=self.include_author, exclude=self.exclude_author)
+
+    @functools.cached_property
+    def title_matcher(self) -> _Matcher:
+        return _Matcher.compile(
+            include=self.include_title,
+            exclude=self.exclude_title,
+            include_regex=self.include_title_regex,
+            exclude_regex=self.exclude_title_regex,
+        )
+
+    @pydantic.model_validator(mode="after")
+    def compile_matchers(self) -> typing.Self:
+        """
+        Must be called again after include/exclude fields are changed.
+        """
+        _compile_matchers(self, "author_matcher", "title_matcher")
+        return self
+
     def is_applicable(self, issue: github_models.Issue) -> bool:
         if self.include_author_group:
             raise NotImplementedError("include_author_group must be resolved before is_applicable")
         if self.exclude_author_group:
             raise NotImplementedError("exclude_author_group must be resolved before is_applicable")
 
-        if issue.author is not None and not _check_applicable(
-            issue.author,
-            include=self.include_author,
-            exclude=self.exclude_author,
-        ):
+        if issue.author is not None and not self.author_matcher.is_applicable(issue.author):
             return False
-        if not _check_applicable(
-            issue.title,
-            include=self.include_title,
-            exclude=self.exclude_title,
-            include_regex=self.include_title_regex,
-            exclude_regex=self.exclude_title_regex,
-        ):
+        if not self.title_matcher.is_applicable(issue.title):
             return False
 
         return True
@@ -112,6 +156,18 @@ class RepositoryPRCreatedSubtriggerConfig(BaseSubtriggerConfig):
     include_author_group: set[github_models.TeamSlug] = pydantic.Field(default_factory=set)
     exclude_author_group: set[github_models.TeamSlug] = pydantic.Field(default_factory=set)
 
+    @functools.cached_property
+    def author_matcher(self) -> _Matcher:
+        return _Matcher.compile(include=self.include_author, exclude=self.exclude_author)
+
+    @pydantic.model_validator(mode="after")
+    def compile_matchers(self) -> typing.Self:
+        """
+        Must be called again after include/exclude fields are changed.
+        """
+        _compile_matchers(self, "author_matcher")
+        return self
+
     def is_applicable(
         self,
         pr: github_models.PullRequest,
@@ -121,11 +177,7 @@ class RepositoryPRCreatedSubtriggerConfig(BaseSubtriggerConfig):
         if self.exclude_author_group:
             raise NotImplementedError("exclude_author_group must be resolved before is_applicable")
 
-        if pr.author is not None and not _check_applicable(
-            pr.author,
-            include=self.include_author,
-            exclude=self.exclude_author,
-        ):
+        if pr.author is not None and not self.author_matcher.is_applicable(pr.author):
             return False
 
         return True
@@ -137,16 +189,24 @@ class RepositoryFailedWorkflowRunSubtriggerConfig(BaseSubtriggerConfig):
     include: set[str] = pydantic.Field(default_factory=set)
     exclude: set[str] = pydantic.Field(default_factory=set)
 
+    @functools.cached_property
+    def name_matcher(self) -> _Matcher:
+        return _Matcher.compile(include=self.include, exclude=self.exclude)
+
+    @pydantic.model_validator(mode="after")
+    def compile_matchers(self) -> typing.Self:
+        """
+        Must be called again after include/exclude fields are changed.
+        """
+        _compile_matchers(self, "name_matcher")
+        return self
+
     def is_applicable(self, workflow_run: github_models.WorkflowRun) -> bool:
         if workflow_run.status != "completed":
             return False
         if workflow_run.conclusion != "failure":
             return False
-        if not _check_applicable(
-            workflow_run.name,
-            include=self.include,
-            exclude=self.exclude,
-        ):
+        if not self.name_matcher.is_applicable(workflow_run.name):
             return False
 
         return True
@@ -159,6 +219,23 @@ class GithubTriggerConfig(task_base.BaseTriggerConfig):
     include_repos: list[github_models.RepositoryName] = pydantic.Field(default_factory=list)
     exclude_repos: list[github_models.RepositoryName] = pydantic.Field(default_factory=list)
     default_timedelta_seconds: int = 60 * 60 * 24  # 1 day
+    search_batch_size: int = 20
+    search_strategy: typing.Literal["auto", "repository", "organization"] = "auto"
+    organization_search_min_repositories: int = 50
+    ingest_mode: typing.Literal["search", "events"] = "search"
+    webhook_secret: pydantic_utils.TypedAnnotation[task_base.BaseSecretConfig] | None = None
+    webhook_reconciliation_interval_seconds: int = 60 * 60  # 1 hour
+    etag_cache_size: int = 1024
+    etag_cache_max_bytes: int = 16 * 1024 * 1024
+    persist_etag_cache: bool = False
+    # Twice search_batch_size, so issue and PR subtriggers sharing the limit can each fill a search batch
+    max_concurrent_repositories: int = 40
+    max_concurrent_repositories_per_token: int = 50
+    repository_index_ttl_seconds: int = 60 * 60 * 6  # 6 hours
+    repository_index_refresh_interval_seconds: int = 0
+    inactive_repository_max_skip_seconds: int = 60 * 60  # 1 hour, 0 disables skipping
+    checkpoint_events: int = 100
+    checkpoint_interval_seconds: float = 30
     subtriggers: typing.Annotated[
         list[pydantic.SerializeAsAny[BaseSubtriggerConfig]],
         pydantic.BeforeValidator(BaseSubtriggerConfig.list_factory),
@@ -169,6 +246,22 @@ class GithubTriggerConfig(task_base.BaseTriggerConfig):
     def default_timedelta(self) -> datetime.timedelta:
         return datetime.timedelta(seconds=self.default_timedelta_seconds)
 
+    @property
+    def webhook_reconciliation_interval(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=self.webhook_reconciliation_interval_seconds)
+
+    @property
+    def inactive_repository_max_skip(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=self.inactive_repository_max_skip_seconds)
+
+    @property
+    def repository_index_ttl(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=self.repository_index_ttl_seconds)
+
+    @property
+    def repository_index_refresh_interval(self) -> datetime.timedelta:
+        return datetime.timedelta(seconds=self.repository_index_refresh_interval_seconds)
+
     @pydantic.field_validator("repos", mode="after")
     @classmethod
     def check_repos(cls, v: list[str]) -> list[str]:
@@ -184,6 +277,12 @@ class GithubTriggerConfig(task_base.BaseTriggerConfig):
     def _include_repos(self) -> list[str]:
         return list(set(self.repos) | set(self.include_repos))
 
+    def is_organization_search(self, repositories_count: int) -> bool:
+        if self.search_strategy == "auto":
+            return repositories_count >= self.organization_search_min_repositories
+
+        return self.search_strategy == "organization"
+
     def is_repository_applicable(self, repository: github_models.Repository) -> bool:
         if self._include_repos and repository.name not in self._include_repos:
             return False
@@ -215,10 +314,19 @@ class RepositoryPRCreatedState(pydantic_utils.BaseModel):
 
 class RepositoryFailedWorkflowRunState(pydantic_utils.BaseModel):
     oldest_incomplete_created: datetime.datetime
-    already_reported_failed_runs: set[github_models.WorkflowRun] = pydantic.Field(
-        default_factory=set[github_models.WorkflowRun]
+    last_run_id: int | None = None
+    already_reported_failed_runs: dict[int, datetime.datetime] = pydantic.Field(
+        default_factory=dict[int, datetime.datetime]
     )
 
+    @pydantic.field_validator("already_reported_failed_runs", mode="before")
+    @classmethod
+    def migrate_already_reported_failed_runs(cls, v: typing.Any) -> typing.Any:
+        # Runs used to be stored as a list of full WorkflowRun objects, only id and created_at are needed
+        if isinstance(v, list):
+            return {run["id"]: run["created_at"] for run in v}  # pyright: ignore[reportUnknownVariableType]
+        return v
+
     @classmethod
     def default_factory(cls, timedelta: datetime.timedelta) -> typing.Self:
         return cls(
@@ -226,44 +334,222 @@ class RepositoryFailedWorkflowRunState(pydantic_utils.BaseModel):
         )
 
 
+class RepositoryActivityState(pydantic_utils.BaseModel):
+    fingerprint: str
+    checked_at: datetime.datetime
+
+
 class GithubTriggerState(pydantic_utils.BaseModel):
+    """
+    Workflow run entries keep reported runs, so they are validated only when accessed,
+    small per-repository entries read by every run are always parsed.
+    """
+
+    organization_issue_created: datetime.datetime | None = None
+    organization_pr_created: datetime.datetime | None = None
     repository_issue_created: dict[str, RepositoryIssueCreatedState] = pydantic.Field(
         default_factory=dict[str, RepositoryIssueCreatedState]
     )
     repository_pr_created: dict[str, RepositoryPRCreatedState] = pydantic.Field(
         default_factory=dict[str, RepositoryPRCreatedState]
     )
-    repository_failed_workflow_run: dict[str, RepositoryFailedWorkflowRunState] = pydantic.Field(
-        default_factory=dict[str, RepositoryFailedWorkflowRunState]
+    repository_failed_workflow_run: pydantic_utils.LazyModelDict[RepositoryFailedWorkflowRunState] = pydantic.Field(
+        default_factory=functools.partial(pydantic_utils.LazyModelDict, RepositoryFailedWorkflowRunState)
     )
+    # Repositories to check for failed workflow runs even without activity
+    repositories_with_incomplete_runs: set[str] = pydantic.Field(default_factory=set[str])
+    repository_activity: dict[str, RepositoryActivityState] = pydantic.Field(
+        default_factory=dict[str, RepositoryActivityState]
+    )
+    organization_events_last_id: str | None = None
+    organization_events_poll_after: datetime.datetime | None = None
+    webhook_reconciled_at: datetime.datetime | None = None
+    # Event id to delivery time of events already sent from webhook deliveries, skipped by reconciliation polls
+    webhook_event_ids: dict[str, datetime.datetime] = pydantic.Field(default_factory=dict[str, datetime.datetime])
+
+    @pydantic.model_validator(mode="before")
+    @classmethod
+    def migrate_has_incomplete_runs(cls, data: typing.Any) -> typing.Any:
+        # Incomplete runs used to be flagged in workflow run entries, raw entries are read to keep them lazy
+        if not isinstance(data, dict) or "repositories_with_incomplete_runs" in data:
+            return data
+
+        data = typing.cast(dict[str, typing.Any], data)
+        raw_entries = data.get("repository_failed_workflow_run")
+        if not isinstance(raw_entries, dict):
+            return data
+
+        return {
+            **data,
+            "repositories_with_incomplete_runs": [
+                repository
+                for repository, entry in typing.cast(dict[str, typing.Any], raw_entries).items()
+                if isinstance(entry, dict) and typing.cast(dict[str, typing.Any], entry).get("has_incomplete_runs")
+            ],
+        }
+
+
+class _StateCheckpointer:
+    """
+    Saves state after every `events` events or `interval` seconds, whichever comes first, 0 disables the condition.
+    Interval checkpoints are taken by a background task, so progress of runs without events is saved as well.
+    Event iterators update state only after their events are consumed, so a checkpoint never skips unsent events.
+    """
+
+    def __init__(self, save: typing.Callable[[], typing.Awaitable[None]], events: int, interval: float):
+        self._save = save
+        self._events = events
+        self._interval = interval
+
+        self._pending_events = 0
+        self._saved_at = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._interval_task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> typing.Self:
+        if self._interval:
+            self._interval_task = asyncio.create_task(self._run_interval())
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        if self._interval_task is None:
+            return
+
+        # Cancelled under the lock, so a checkpoint is never interrupted halfway through saving
+        async with self._lock:
+            self._interval_task.cancel()
+        await asyncio.gather(self._interval_task, return_exceptions=True)
+        self._interval_task = None
+
+    async def on_event(self) -> None:
+        self._pending_events += 1
+        if self._events and self._pending_events >= self._events:
+            await self._checkpoint()
+
+    async def _run_interval(self) -> None:
+        while True:
+            await asyncio.sleep(max(0.0, self._saved_at + self._interval - time.monotonic()))
+            if time.monotonic() - self._saved_at >= self._interval:
+                await self._checkpoint()
+
+    async def _checkpoint(self) -> None:
+        async with self._lock:
+            logger.debug("Saving state checkpoint after %s events", self._pending_events)
+            await self._save()
+            self._pending_events = 0
+            self._saved_at = time.monotonic()
+
+
+class GithubTriggerResources(task_base.SharedResources):
+    """
+    Clients and caches shared by all github triggers, keyed by token as rate limits and visibility depend on it.
+    """
+
+    def __init__(self, state_repository: lib.task.protocols.StateRepositoryProtocol):
+        self._state_repository = state_repository
+        self.client_pool = github_clients.GithubClientPool()
+        self._team_members_caches: dict[str, github_caches.TeamMembersCache] = {}
+        self._repository_index_caches: dict[str, github_caches.RepositoryIndexCache] = {}
+        self._etag_cache_stores: dict[str, github_caches.ETagCacheStore] = {}
+        self._repository_semaphores: dict[str, tuple[int, asyncio.Semaphore]] = {}
+
+    def get_team_members_cache(self, token: str) -> github_caches.TeamMembersCache:
+        if token not in self._team_members_caches:
+            self._team_members_caches[token] = github_caches.TeamMembersCache()
+        return self._team_members_caches[token]
+
+    def get_repository_index_cache(self, token: str) -> github_caches.RepositoryIndexCache:
+        if token not in self._repository_index_caches:
+            self._repository_index_caches[token] = github_caches.RepositoryIndexCache(
+                state_repository=self._state_repository,
+                token=token,
+            )
+        return self._repository_index_caches[token]
+
+    def get_etag_cache_store(self, token: str, etag_cache: github_clients.ETagCache) -> github_caches.ETagCacheStore:
+        if token not in self._etag_cache_stores:
+            self._etag_cache_stores[token] = github_caches.ETagCacheStore(
+                state_repository=self._state_repository,
+                token=token,
+                etag_cache=etag_cache,
+            )
+        return self._etag_cache_stores[token]
+
+    def get_repository_semaphore(self, token: str, limit: int) -> asyncio.Semaphore:
+        """
+        Returns semaphore shared by all triggers using the same token, so they have to use the same limit.
+        """
+        if token not in self._repository_semaphores:
+            self._repository_semaphores[token] = (limit, asyncio.Semaphore(limit))
+
+        token_limit, semaphore = self._repository_semaphores[token]
+        if limit != token_limit:
+            raise ValueError(
+                f"Triggers using the same token have different max_concurrent_repositories_per_token, "
+                f"{limit} and {token_limit}"
+            )
+        return semaphore
+
+    async def dispose(self) -> None:
+        self._team_members_caches.clear()
+        self._repository_index_caches.clear()
+        self._etag_cache_stores.clear()
+        self._repository_semaphores.clear()
+        await self.client_pool.dispose()
 
 
 @dataclasses.dataclass(frozen=True)
-class GithubTriggerProcessor(task_base.BaseTriggerProcessor[GithubTriggerConfig]):
+class GithubTriggerProcessor(task_base.BaseTriggerProcessor[GithubTriggerConfig, GithubTriggerResources]):
     config: GithubTriggerConfig
     raw_state: lib.task.protocols.StateProtocol
     gql_github_client: github_clients.GqlGithubClient
     rest_github_client: github_clients.RestGithubClient
+    team_members_cache: github_caches.TeamMembersCache
+    repository_index_cache: github_caches.RepositoryIndexCache
+    etag_cache_store: github_caches.ETagCacheStore
+    repository_semaphore: asyncio.Semaphore
+    token_repository_semaphore: asyncio.Semaphore
+
+    @classmethod
+    def create_shared(cls, state_repository: lib.task.protocols.StateRepositoryProtocol) -> GithubTriggerResources:
+        return GithubTriggerResources(state_repository=state_repository)
 
+    # Clients are shared through the resources, so they are disposed with them instead of per processor
     @classmethod
     def from_config(
         cls,
         config: GithubTriggerConfig,
         state: lib.task.protocols.StateProtocol,
+        shared: GithubTriggerResources,
     ) -> typing.Self:
-        gql_github_client = github_clients.GqlGithubClient(token=config.token_secret.value)
-        rest_github_client = github_clients.RestGithubClient.from_token(token=config.token_secret.value)
+        gql_github_client = shared.client_pool.get_gql_client(
+            token=config.token_secret.value,
+            search_batch_size=config.search_batch_size,
+        )
+        rest_github_client = shared.client_pool.get_rest_client(
+            token=config.token_secret.value,
+            etag_cache_size=config.etag_cache_size,
+            etag_cache_max_bytes=config.etag_cache_max_bytes,
+        )
 
         return cls(
             raw_state=state,
             gql_github_client=gql_github_client,
             rest_github_client=rest_github_client,
+            team_members_cache=shared.get_team_members_cache(token=config.token_secret.value),
+            repository_index_cache=shared.get_repository_index_cache(token=config.token_secret.value),
+            etag_cache_store=shared.get_etag_cache_store(
+                token=config.token_secret.value,
+                etag_cache=rest_github_client.etag_cache,
+            ),
+            repository_semaphore=asyncio.Semaphore(config.max_concurrent_repositories),
+            token_repository_semaphore=shared.get_repository_semaphore(
+                token=config.token_secret.value,
+                limit=config.max_concurrent_repositories_per_token,
+            ),
             config=config,
         )
 
-    async def dispose(self) -> None:
-        await self.rest_github_client.dispose()
-
     @contextlib.asynccontextmanager
     async def _acquire_state(self) -> typing.AsyncIterator[GithubTriggerState]:
         async with self.raw_state.acquire() as raw_state:
@@ -274,74 +560,327 @@ class GithubTriggerProcessor(task_base.BaseTriggerProcessor[GithubTriggerConfig]
             try:
                 yield state
             finally:
-                raw_state = state.model_dump(mode="json")
-                await self.raw_state.set(raw_state)
+                await self._save_state(state)
+
+    async def _save_state(self, state: GithubTriggerState) -> None:
+        if self.config.webhook_secret is not None:
+            await self._merge_webhook_event_ids(state)
+        raw_state = state.model_dump(mode="json")
+        await self.raw_state.set(raw_state)
+
+    async def _merge_webhook_event_ids(self, state: GithubTriggerState) -> None:
+        """
+        Keeps ids recorded by webhook deliveries since the state was loaded, as polling runs save their own copy.
+        """
+        stored_state = GithubTriggerState.model_validate(await self.raw_state.get() or {})
+        pruned_before = (
+            state.webhook_reconciled_at - self.config.default_timedelta
+            if state.webhook_reconciled_at is not None
+            else None
+        )
+        for event_id, delivered_at in stored_state.webhook_event_ids.items():
+            if pruned_before is not None and delivered_at < pruned_before:
+                continue
+            if event_id not in state.webhook_event_ids or state.webhook_event_ids[event_id] < delivered_at:
+                state.webhook_event_ids[event_id] = delivered_at
 
     async def _get_repositories(self) -> list[github_models.Repository]:
-        request = github_clients.GetRepositoriesRequest(
+        repositories = await self.repository_index_cache.get(
+            client=self.gql_github_client,
             owner=self.config.owner,
+            ttl=self.config.repository_index_ttl,
+            refresh_interval=self.config.repository_index_refresh_interval,
         )
 
-        result: list[github_models.Repository] = []
+        return [repository for repository in repositories if self.config.is_repository_applicable(repository)]
 
-        async for repository in self.gql_github_client.get_repositories(request):
-            if self.config.is_repository_applicable(repository):
-                result.append(repository)
+    def _merge_repository_iterators(
+        self,
+        iterators: typing.Iterable[typing.AsyncIterator[task_base.Event]],
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        return asyncio_utils.bounded_merge(
+            iterators,
+            limit=self.config.max_concurrent_repositories,
+            semaphores=(self.repository_semaphore, self.token_repository_semaphore),
+        )
 
-        return result
+    async def _resolve_author_groups(self) -> None:
+        configs = [
+            config
+            for config in self.config.subtriggers
+            if isinstance(config, RepositoryIssueCreatedSubtriggerConfig | RepositoryPRCreatedSubtriggerConfig)
+        ]
+        groups = sorted(
+            {group for config in configs for group in config.include_author_group | config.exclude_author_group}
+        )
+        if not groups:
+            return
 
-    async def _resolve_author_groups(self, groups: set[github_models.TeamSlug]) -> set[github_models.UserLogin]:
-        result: set[github_models.UserLogin] = set()
-        for group in groups:
-            async for member in self.rest_github_client.get_organization_team_members(
-                request=github_clients.GetOrganizationTeamMembersRequest(
+        members = await asyncio.gather(
+            *(
+                self.team_members_cache.get(
+                    client=self.rest_github_client,
                     owner=self.config.owner,
                     team_slug=group,
-                ),
-            ):
-                result.add(member)
+                )
+                for group in groups
+            )
+        )
+        members_by_group = dict(zip(groups, members, strict=True))
+
+        for config in configs:
+            for group in config.include_author_group:
+                config.include_author |= members_by_group[group]
+            config.include_author_group = set()
+            for group in config.exclude_author_group:
+                config.exclude_author |= members_by_group[group]
+            config.exclude_author_group = set()
+            config.compile_matchers()
+
+    async def _get_repository_activities(
+        self,
+        repositories: list[github_models.Repository],
+    ) -> dict[str, github_models.RepositoryActivity] | None:
+        """
+        Returns activities by repository node id, or None when activities are not requested.
+        """
+        ids = tuple(repository.id for repository in repositories if repository.id is not None)
+        if self.config.inactive_repository_max_skip_seconds == 0 or not ids:
+            return None
+
+        activities = await self.gql_github_client.get_repositories_activity(
+            request=github_clients.GetRepositoriesActivityRequest(ids=ids),
+        )
+
+        return {activity.id: activity for activity in activities}
+
+    async def _remove_missing_repositories(
+        self,
+        repositories: list[github_models.Repository],
+        repository_names: set[github_models.RepositoryName],
+    ) -> list[github_models.Repository]:
+        # Deleted, renamed or no longer visible repositories stay out of the index until a refresh finds them again
+        await self.repository_index_cache.remove(owner=self.config.owner, repository_names=repository_names)
+        return [repository for repository in repositories if repository.name not in repository_names]
 
+    async def _rename_repositories(
+        self,
+        repositories: list[github_models.Repository],
+        activities_by_id: dict[str, github_models.RepositoryActivity],
+    ) -> list[github_models.Repository]:
+        renamed_repository_names: dict[str, github_models.RepositoryName] = {}
+        result: list[github_models.Repository] = []
+        for repository in repositories:
+            activity = activities_by_id.get(repository.id) if repository.id is not None else None
+            if activity is not None and activity.name != repository.name:
+                renamed_repository_names[activity.id] = activity.name
+                repository = dataclasses.replace(repository, name=activity.name)
+                if not self.config.is_repository_applicable(repository):
+                    continue
+            result.append(repository)
+
+        if renamed_repository_names:
+            await self.repository_index_cache.rename(owner=self.config.owner, repository_names=renamed_repository_names)
         return result
 
+    def _is_repository_active(
+        self,
+        state: GithubTriggerState,
+        activity: github_models.RepositoryActivity | None,
+        now: datetime.datetime,
+    ) -> bool:
+        if activity is None:
+            return True
+
+        activity_state = state.repository_activity.get(activity.name)
+        if activity_state is None or activity_state.fingerprint != activity.fingerprint:
+            return True
+
+        return activity_state.checked_at + self.config.inactive_repository_max_skip <= now
+
+    async def _poll_organization_events(
+        self,
+        state: GithubTriggerState,
+        now: datetime.datetime,
+    ) -> github_clients.OrganizationEventsPage | None:
+        if self.config.ingest_mode != "events" or not any(
+            isinstance(config, RepositoryIssueCreatedSubtriggerConfig | RepositoryPRCreatedSubtriggerConfig)
+            for config in self.config.subtriggers
+        ):
+            return None
+
+        if state.organization_events_poll_after is not None and now < state.organization_events_poll_after:
+            logger.debug("Organization events poll interval has not elapsed yet")
+            return github_clients.OrganizationEventsPage(events=[], is_complete=True, poll_interval=None)
+
+        return await self.rest_github_client.get_organization_events(
+            request=github_clients.GetOrganizationEventsRequest(
+                owner=self.config.owner,
+                since_id=state.organization_events_last_id,
+            ),
+        )
+
+    async def _is_reconciliation_due(self) -> bool:
+        raw_state = await self.raw_state.get()
+        state = GithubTriggerState.model_validate(raw_state or {})
+        if state.webhook_reconciled_at is None:
+            return True
+
+        return state.webhook_reconciled_at + self.config.webhook_reconciliation_interval <= datetime.datetime.now(
+            tz=datetime.UTC
+        )
+
     async def produce_events(self) -> typing.AsyncGenerator[task_base.Event, None]:
-        repositories = await self._get_repositories()
+        # Webhook deliveries provide events, polling only reconciles missed deliveries
+        if self.config.webhook_secret is not None and not await self._is_reconciliation_due():
+            logger.debug("Webhook reconciliation is not due yet, skipping polling")
+            return
+
+        if self.config.persist_etag_cache:
+            await self.etag_cache_store.load()
+        repositories, _ = await asyncio.gather(
+            self._get_repositories(),
+            self._resolve_author_groups(),
+        )
+        activities_by_id = await self._get_repository_activities(repositories)
+        activities: dict[github_models.RepositoryName, github_models.RepositoryActivity] = {}
+        if activities_by_id is not None:
+            # Activity lookup returns nothing for repositories that are gone
+            missing_repository_names = {
+                repository.name
+                for repository in repositories
+                if repository.id is not None and repository.id not in activities_by_id
+            }
+            if missing_repository_names:
+                repositories = await self._remove_missing_repositories(repositories, missing_repository_names)
+            repositories = await self._rename_repositories(repositories, activities_by_id)
+            activities = {
+                repository.name: activities_by_id[repository.id]
+                for repository in repositories
+                if repository.id is not None
+            }
+        repositories = [
+            repository
+            for repository in repositories
+            if repository.name not in activities or not activities[repository.name].is_archived
+        ]
 
         async with self._acquire_state() as state:
+            now = datetime.datetime.now(tz=datetime.UTC)
+            active_repositories = [
+                repository
+                for repository in repositories
+                if self._is_repository_active(state=state, activity=activities.get(repository.name), now=now)
+            ]
+            if len(active_repositories) < len(repositories):
+                logger.info(
+                    "Skipping %s inactive repositories of %s",
+                    len(repositories) - len(active_repositories),
+                    len(repositories),
+                )
+
+            events_page = await self._poll_organization_events(state=state, now=now)
+            organization_events: list[github_models.OrganizationEvent] | None = None
+            if events_page is not None:
+                if state.organization_events_last_id is not None and events_page.is_complete:
+                    organization_events = list(reversed(events_page.events))
+                else:
+                    logger.info("Organization events feed does not cover the last run, falling back to search")
+
             event_iterators = (
                 self._process_subtrigger_factory(
                     config=subtrigger_config,
                     state=state,
                     repositories=repositories,
+                    active_repositories=active_repositories,
+                    organization_events=organization_events,
                 )
                 for subtrigger_config in self.config.subtriggers
             )
 
-            async for event in aiostream_stream.merge(*event_iterators):
-                yield event
+            async with _StateCheckpointer(
+                save=functools.partial(self._save_state, state),
+                events=self.config.checkpoint_events,
+                interval=self.config.checkpoint_interval_seconds,
+            ) as checkpointer:
+                async for event in aiostream_stream.merge(*event_iterators):
+                    if event.id in state.webhook_event_ids:
+                        logger.debug("Event(%s) has already been sent from webhook delivery", event.id)
+                        continue
+                    yield event
+                    await checkpointer.on_event()
+
+            for repository in active_repositories:
+                activity = activities.get(repository.name)
+                if activity is not None:
+                    state.repository_activity[repository.name] = RepositoryActivityState(
+                        fingerprint=activity.fingerprint,
+                        checked_at=now,
+                    )
+
+            if self.config.webhook_secret is not None:
+                state.webhook_reconciled_at = now
+                state.webhook_event_ids = {
+                    event_id: delivered_at
+                    for event_id, delivered_at in state.webhook_event_ids.items()
+                    if delivered_at >= now - self.config.default_timedelta
+                }
+
+            # Feed position is advanced only after its events are sent
+            if events_page is not None:
+                if events_page.events:
+                    state.organization_events_last_id = events_page.events[0].id
+                if events_page.poll_interval is not None:
+                    state.organization_events_poll_after = now + datetime.timedelta(seconds=events_page.poll_interval)
+
+        # Cache is shared by triggers of the token, so it is saved once per run instead of with every checkpoint
+        if self.config.persist_etag_cache:
+            await self.etag_cache_store.save()
 
     def _process_subtrigger_factory(
         self,
         config: BaseSubtriggerConfig,
         state: GithubTriggerState,
         repositories: list[github_models.Repository],
+        active_repositories: list[github_models.Repository],
+        organization_events: list[github_models.OrganizationEvent] | None = None,
     ) -> typing.AsyncGenerator[task_base.Event, None]:
         if isinstance(config, RepositoryIssueCreatedSubtriggerConfig):
+            if organization_events is not None:
+                return self._process_organization_issue_events(
+                    state=state,
+                    config=config,
+                    repositories=repositories,
+                    active_repositories=active_repositories,
+                    organization_events=organization_events,
+                )
             return self._process_all_repository_issue_created(
                 state=state,
                 config=config,
                 repositories=repositories,
+                active_repositories=active_repositories,
             )
         if isinstance(config, RepositoryPRCreatedSubtriggerConfig):
+            if organization_events is not None:
+                return self._process_organization_pr_events(
+                    state=state,
+                    config=config,
+                    repositories=repositories,
+                    active_repositories=active_repositories,
+                    organization_events=organization_events,
+                )
             return self._process_all_repository_pr_created(
                 state=state,
                 config=config,
                 repositories=repositories,
+                active_repositories=active_repositories,
             )
         if isinstance(config, RepositoryFailedWorkflowRunSubtriggerConfig):
             return self._process_all_repository_failed_workflow_run(
                 state=state,
                 config=config,
                 repositories=repositories,
+                active_repositories=active_repositories,
             )
 
         raise ValueError(f"Unknown subtrigger: {config}")
@@ -351,24 +890,183 @@ class GithubTriggerProcessor(task_base.BaseTriggerProcessor[GithubTriggerConfig]
         state: GithubTriggerState,
         config: RepositoryIssueCreatedSubtriggerConfig,
         repositories: list[github_models.Repository],
+        active_repositories: list[github_models.Repository],
     ) -> typing.AsyncGenerator[task_base.Event, None]:
-        config.include_author |= await self._resolve_author_groups(config.include_author_group)
-        config.include_author_group = set()
-        config.exclude_author |= await self._resolve_author_groups(config.exclude_author_group)
-        config.exclude_author_group = set()
+        event_iterator: typing.AsyncIterable[task_base.Event]
+        # Organization search costs the same regardless of activity, so it keeps all repositories in sync
+        if self.config.is_organization_search(len(repositories)):
+            event_iterator = self._process_organization_issue_created(
+                state=state,
+                config=config,
+                repositories=repositories,
+            )
+        else:
+            event_iterator = self._merge_repository_iterators(
+                self._process_repository_issue_created(
+                    state=state,
+                    config=config,
+                    repository=repository.name,
+                )
+                for repository in active_repositories
+            )
+
+        async for event in event_iterator:
+            yield event
+
+    async def _process_organization_issue_created(
+        self,
+        state: GithubTriggerState,
+        config: RepositoryIssueCreatedSubtriggerConfig,
+        repositories: list[github_models.Repository],
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        # Per-repository searches start after this moment, so they see everything created before it
+        now = datetime.datetime.now(tz=datetime.UTC)
+        default_created = now - self.config.default_timedelta
+        organization_created = state.organization_issue_created or default_created
+
+        repository_names = {repository.name for repository in repositories}
+        for repository in repository_names:
+            if repository not in state.repository_issue_created:
+                state.repository_issue_created[repository] = RepositoryIssueCreatedState(
+                    last_issue_created=default_created,
+                )
+        catch_up_repositories = {
+            repository
+            for repository in repository_names
+            if state.repository_issue_created[repository].last_issue_created < organization_created
+        }
+
+        if catch_up_repositories:
+            logger.info("Catching up %s repositories with per-repository issue search", len(catch_up_repositories))
 
         event_iterators = (
-            self._process_repository_issue_created(
+            self._process_organization_issue_search(
                 state=state,
                 config=config,
-                repository=repository.name,
-            )
-            for repository in repositories
+                repository_names=repository_names,
+                catch_up_repositories=catch_up_repositories,
+                organization_created=organization_created,
+            ),
+            self._merge_repository_iterators(
+                self._process_repository_issue_created(
+                    state=state,
+                    config=config,
+                    repository=repository,
+                )
+                for repository in catch_up_repositories
+            ),
         )
+        async for event in aiostream_stream.merge(*event_iterators):
+            yield event
+
+        # Caught up repositories join the organization search at its new position,
+        # capped by the moment their own searches started, so a busy organization can't skip their recent items
+        if catch_up_repositories and state.organization_issue_created is not None:
+            caught_up_created = min(state.organization_issue_created, now)
+            for repository in catch_up_repositories:
+                repository_state = state.repository_issue_created[repository]
+                repository_state.last_issue_created = max(repository_state.last_issue_created, caught_up_created)
 
+    async def _process_organization_issue_events(
+        self,
+        state: GithubTriggerState,
+        config: RepositoryIssueCreatedSubtriggerConfig,
+        repositories: list[github_models.Repository],
+        active_repositories: list[github_models.Repository],
+        organization_events: list[github_models.OrganizationEvent],
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        # Feed has only public events, so private repositories and ones of unknown visibility are still searched
+        public_repository_names = {repository.name for repository in repositories if repository.is_private is False}
+        event_iterators = (
+            self._process_organization_issue_feed(
+                state=state,
+                config=config,
+                repository_names=public_repository_names,
+                organization_events=organization_events,
+            ),
+            self._merge_repository_iterators(
+                self._process_repository_issue_created(
+                    state=state,
+                    config=config,
+                    repository=repository.name,
+                )
+                for repository in active_repositories
+                if repository.name not in public_repository_names
+            ),
+        )
         async for event in aiostream_stream.merge(*event_iterators):
             yield event
 
+    async def _process_organization_issue_feed(
+        self,
+        state: GithubTriggerState,
+        config: RepositoryIssueCreatedSubtriggerConfig,
+        repository_names: set[str],
+        organization_events: list[github_models.OrganizationEvent],
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        for event in organization_events:
+            if event.issue is None or event.action != "opened" or event.repository not in repository_names:
+                continue
+            if config.is_applicable(event.issue):
+                yield self._issue_created_event(repository=event.repository, issue=event.issue)
+
+        if not organization_events:
+            return
+
+        # Feed has covered public repositories up to its newest event, so search can resume from there if needed
+        last_issue_created = organization_events[-1].created_at
+        for repository in repository_names:
+            if repository not in state.repository_issue_created:
+                state.repository_issue_created[repository] = RepositoryIssueCreatedState(
+                    last_issue_created=last_issue_created,
+                )
+            repository_state = state.repository_issue_created[repository]
+            repository_state.last_issue_created = max(repository_state.last_issue_created, last_issue_created)
+        state.organization_issue_created = max(
+            state.organization_issue_created or last_issue_created, last_issue_created
+        )
+
+    async def _process_organization_issue_search(
+        self,
+        state: GithubTriggerState,
+        config: RepositoryIssueCreatedSubtriggerConfig,
+        repository_names: set[str],
+        catch_up_repositories: set[str],
+        organization_created: datetime.datetime,
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        last_issue_created = organization_created
+        async for issue in self.gql_github_client.get_organization_issues(
+            github_clients.GetOrganizationIssuesRequest(
+                owner=self.config.owner,
+                created_after=organization_created,
+            )
+        ):
+            last_issue_created = max(last_issue_created, issue.created_at)
+            if issue.repository is None or issue.repository not in repository_names:
+                continue
+            if issue.repository in catch_up_repositories:
+                continue
+
+            repository_state = state.repository_issue_created[issue.repository]
+            if issue.created_at <= repository_state.last_issue_created:
+                continue
+            if config.is_applicable(issue):
+                yield self._issue_created_event(repository=issue.repository, issue=issue)
+            repository_state.last_issue_created = issue.created_at
+
+        for repository in repository_names - catch_up_repositories:
+            repository_state = state.repository_issue_created[repository]
+            repository_state.last_issue_created = max(repository_state.last_issue_created, last_issue_created)
+        state.organization_issue_created = last_issue_created
+
+    def _issue_created_event(self, repository: str, issue: github_models.Issue) -> task_base.Event:
+        return task_base.Event(
+            id=f"issue_created__{issue.id}",
+            title=f"📋New issue in {self.config.owner}/{repository}",
+            body=f"Issue created by {issue.author}: {issue.title}",
+            url=issue.url,
+        )
+
     async def _process_repository_issue_created(
         self,
         state: GithubTriggerState,
@@ -380,53 +1078,198 @@ class GithubTriggerProcessor(task_base.BaseTriggerProcessor[GithubTriggerConfig]
                 self.config.default_timedelta,
             )
         repository_state = state.repository_issue_created[repository]
-        last_issue_created = repository_state.last_issue_created
 
-        while True:
-            issues = await self.gql_github_client.get_repository_issues(
-                github_clients.GetRepositoryIssuesRequest(
-                    owner=self.config.owner,
-                    repository=repository,
-                    created_after=last_issue_created,
-                )
+        async for issue in self.gql_github_client.get_repository_issues(
+            github_clients.GetRepositoryIssuesRequest(
+                owner=self.config.owner,
+                repository=repository,
+                created_after=repository_state.last_issue_created,
             )
-            if not issues:
-                break
-
-            for issue in issues:
-                if config.is_applicable(issue):
-                    yield task_base.Event(
-                        id=f"issue_created__{issue.id}",
-                        title=f"📋New issue in {self.config.owner}/{repository}",
-                        body=f"Issue created by {issue.author}: {issue.title}",
-                        url=issue.url,
-                    )
-                last_issue_created = max(last_issue_created, issue.created_at)
-                repository_state.last_issue_created = last_issue_created
+        ):
+            if config.is_applicable(issue):
+                yield self._issue_created_event(repository=repository, issue=issue)
+            repository_state.last_issue_created = max(repository_state.last_issue_created, issue.created_at)
 
     async def _process_all_repository_pr_created(
         self,
         state: GithubTriggerState,
         config: RepositoryPRCreatedSubtriggerConfig,
         repositories: list[github_models.Repository],
+        active_repositories: list[github_models.Repository],
     ) -> typing.AsyncGenerator[task_base.Event, None]:
-        config.include_author |= await self._resolve_author_groups(config.include_author_group)
-        config.include_author_group = set()
-        config.exclude_author |= await self._resolve_author_groups(config.exclude_author_group)
-        config.exclude_author_group = set()
+        event_iterator: typing.AsyncIterable[task_base.Event]
+        # Organization search costs the same regardless of activity, so it keeps all repositories in sync
+        if self.config.is_organization_search(len(repositories)):
+            event_iterator = self._process_organization_pr_created(
+                state=state,
+                config=config,
+                repositories=repositories,
+            )
+        else:
+            event_iterator = self._merge_repository_iterators(
+                self._process_repository_pr_created(
+                    state=state,
+                    config=config,
+                    repository=repository.name,
+                )
+                for repository in active_repositories
+            )
+
+        async for event in event_iterator:
+            yield event
+
+    async def _process_organization_pr_created(
+        self,
+        state: GithubTriggerState,
+        config: RepositoryPRCreatedSubtriggerConfig,
+        repositories: list[github_models.Repository],
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        # Per-repository searches start after this moment, so they see everything created before it
+        now = datetime.datetime.now(tz=datetime.UTC)
+        default_created = now - self.config.default_timedelta
+        organization_created = state.organization_pr_created or default_created
+
+        repository_names = {repository.name for repository in repositories}
+        for repository in repository_names:
+            if repository not in state.repository_pr_created:
+                state.repository_pr_created[repository] = RepositoryPRCreatedState(
+                    last_pr_created=default_created,
+                )
+        catch_up_repositories = {
+            repository
+            for repository in repository_names
+            if state.repository_pr_created[repository].last_pr_created < organization_created
+        }
+
+        if catch_up_repositories:
+            logger.info("Catching up %s repositories with per-repository PR search", len(catch_up_repositories))
 
         event_iterators = (
-            self._process_repository_pr_created(
+            self._process_organization_pr_search(
                 state=state,
                 config=config,
-                repository=repository.name,
-            )
-            for repository in repositories
+                repository_names=repository_names,
+                catch_up_repositories=catch_up_repositories,
+                organization_created=organization_created,
+            ),
+            self._merge_repository_iterators(
+                self._process_repository_pr_created(
+                    state=state,
+                    config=config,
+                    repository=repository,
+                )
+                for repository in catch_up_repositories
+            ),
         )
+        async for event in aiostream_stream.merge(*event_iterators):
+            yield event
+
+        # Caught up repositories join the organization search at its new position,
+        # capped by the moment their own searches started, so a busy organization can't skip their recent items
+        if catch_up_repositories and state.organization_pr_created is not None:
+            caught_up_created = min(state.organization_pr_created, now)
+            for repository in catch_up_repositories:
+                repository_state = state.repository_pr_created[repository]
+                repository_state.last_pr_created = max(repository_state.last_pr_created, caught_up_created)
 
+    async def _process_organization_pr_events(
+        self,
+        state: GithubTriggerState,
+        config: RepositoryPRCreatedSubtriggerConfig,
+        repositories: list[github_models.Repository],
+        active_repositories: list[github_models.Repository],
+        organization_events: list[github_models.OrganizationEvent],
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        # Feed has only public events, so private repositories and ones of unknown visibility are still searched
+        public_repository_names = {repository.name for repository in repositories if repository.is_private is False}
+        event_iterators = (
+            self._process_organization_pr_feed(
+                state=state,
+                config=config,
+                repository_names=public_repository_names,
+                organization_events=organization_events,
+            ),
+            self._merge_repository_iterators(
+                self._process_repository_pr_created(
+                    state=state,
+                    config=config,
+                    repository=repository.name,
+                )
+                for repository in active_repositories
+                if repository.name not in public_repository_names
+            ),
+        )
         async for event in aiostream_stream.merge(*event_iterators):
             yield event
 
+    async def _process_organization_pr_feed(
+        self,
+        state: GithubTriggerState,
+        config: RepositoryPRCreatedSubtriggerConfig,
+        repository_names: set[str],
+        organization_events: list[github_models.OrganizationEvent],
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        for event in organization_events:
+            if event.pull_request is None or event.action != "opened" or event.repository not in repository_names:
+                continue
+            if config.is_applicable(event.pull_request):
+                yield self._pr_created_event(repository=event.repository, pr=event.pull_request)
+
+        if not organization_events:
+            return
+
+        # Feed has covered public repositories up to its newest event, so search can resume from there if needed
+        last_pr_created = organization_events[-1].created_at
+        for repository in repository_names:
+            if repository not in state.repository_pr_created:
+                state.repository_pr_created[repository] = RepositoryPRCreatedState(
+                    last_pr_created=last_pr_created,
+                )
+            repository_state = state.repository_pr_created[repository]
+            repository_state.last_pr_created = max(repository_state.last_pr_created, last_pr_created)
+        state.organization_pr_created = max(state.organization_pr_created or last_pr_created, last_pr_created)
+
+    async def _process_organization_pr_search(
+        self,
+        state: GithubTriggerState,
+        config: RepositoryPRCreatedSubtriggerConfig,
+        repository_names: set[str],
+        catch_up_repositories: set[str],
+        organization_created: datetime.datetime,
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        last_pr_created = organization_created
+        async for pr in self.gql_github_client.get_organization_pull_requests(
+            github_clients.GetOrganizationPRsRequest(
+                owner=self.config.owner,
+                created_after=organization_created,
+            )
+        ):
+            last_pr_created = max(last_pr_created, pr.created_at)
+            if pr.repository is None or pr.repository not in repository_names:
+                continue
+            if pr.repository in catch_up_repositories:
+                continue
+
+            repository_state = state.repository_pr_created[pr.repository]
+            if pr.created_at <= repository_state.last_pr_created:
+                continue
+            if config.is_applicable(pr):
+                yield self._pr_created_event(repository=pr.repository, pr=pr)
+            repository_state.last_pr_created = pr.created_at
+
+        for repository in repository_names - catch_up_repositories:
+            repository_state = state.repository_pr_created[repository]
+            repository_state.last_pr_created = max(repository_state.last_pr_created, last_pr_created)
+        state.organization_pr_created = last_pr_created
+
+    def _pr_created_event(self, repository: str, pr: github_models.PullRequest) -> task_base.Event:
+        return task_base.Event(
+            id=f"pr_created__{pr.id}",
+            title=f"🛠New PR in {self.config.owner}/{repository}",
+            body=f"PR created by {pr.author}: {pr.title}",
+            url=pr.url,
+        )
+
     async def _process_repository_pr_created(
         self,
         state: GithubTriggerState,
@@ -438,36 +1281,27 @@ class GithubTriggerProcessor(task_base.BaseTriggerProcessor[GithubTriggerConfig]
                 self.config.default_timedelta,
             )
         repository_state = state.repository_pr_created[repository]
-        last_pr_created = repository_state.last_pr_created
 
-        while True:
-            prs = await self.gql_github_client.get_repository_pull_requests(
-                github_clients.GetRepositoryPRsRequest(
-                    owner=self.config.owner,
-                    repository=repository,
-                    created_after=last_pr_created,
-                )
+        async for pr in self.gql_github_client.get_repository_pull_requests(
+            github_clients.GetRepositoryPRsRequest(
+                owner=self.config.owner,
+                repository=repository,
+                created_after=repository_state.last_pr_created,
             )
-            if not prs:
-                break
-
-            for pr in prs:
-                if config.is_applicable(pr):
-                    yield task_base.Event(
-                        id=f"pr_created__{pr.id}",
-                        title=f"🛠New PR in {self.config.owner}/{repository}",
-                        body=f"PR created by {pr.author}: {pr.title}",
-                        url=pr.url,
-                    )
-                last_pr_created = max(last_pr_created, pr.created_at)
-                repository_state.last_pr_created = last_pr_created
+        ):
+            if config.is_applicable(pr):
+                yield self._pr_created_event(repository=repository, pr=pr)
+            repository_state.last_pr_created = max(repository_state.last_pr_created, pr.created_at)
 
     async def _process_all_repository_failed_workflow_run(
         self,
         state: GithubTriggerState,
         config: RepositoryFailedWorkflowRunSubtriggerConfig,
         repositories: list[github_models.Repository],
+        active_repositories: list[github_models.Repository],
     ) -> typing.AsyncGenerator[task_base.Event, None]:
+        # Incomplete runs may fail without any repository activity
+        active_repository_names = {repository.name for repository in active_repositories}
         event_iterators = (
             self._process_repository_failed_workflow_run(
                 state=state,
@@ -475,9 +1309,10 @@ class GithubTriggerProcessor(task_base.BaseTriggerProcessor[GithubTriggerConfig]
                 repository=repository.name,
             )
             for repository in repositories
+            if repository.name in active_repository_names or repository.name in state.repositories_with_incomplete_runs
         )
 
-        async for event in aiostream_stream.merge(*event_iterators):
+        async for event in self._merge_repository_iterators(event_iterators):
             yield event
 
     async def _process_repository_failed_workflow_run(
@@ -492,44 +1327,148 @@ class GithubTriggerProcessor(task_base.BaseTriggerProcessor[GithubTriggerConfig]
             )
         repository_state = state.repository_failed_workflow_run[repository]
 
-        oldest_incomplete_created = None
-        last_created = None
+        request = github_clients.GetRepositoryWorkflowRunsRequest(
+            owner=self.config.owner,
+            repository=repository,
+            created_after=repository_state.oldest_incomplete_created,
+        )
 
-        async for workflow_run in self.rest_github_client.get_repository_workflow_runs(
-            request=github_clients.GetRepositoryWorkflowRunsRequest(
-                owner=self.config.owner,
-                repository=repository,
-                created_after=repository_state.oldest_incomplete_created,
-            ),
-        ):
-            if config.is_applicable(workflow_run) and workflow_run not in repository_state.already_reported_failed_runs:
-                yield task_base.Event(
-                    id=f"failed_workflow_run__{self.config.owner}__{repository}__{workflow_run.id}",
-                    title=f"🔥Failed workflow run in {self.config.owner}/{repository}",
-                    body=f"Workflow run {workflow_run.name} failed",
-                    url=workflow_run.url,
+        try:
+            last_workflow_run = await self.rest_github_client.get_latest_repository_workflow_run(request=request)
+        except github_clients.RestGithubClient.NotFoundError:
+            logger.warning("Repository(%s/%s) is not found, skipping its workflow runs", self.config.owner, repository)
+            await self._remove_missing_repositories([], {repository})
+            return
+
+        last_run_id = last_workflow_run.id if last_workflow_run is not None else None
+        # Runs are only listed when a new one was created or an incomplete one may have finished
+        if last_run_id == repository_state.last_run_id and repository not in state.repositories_with_incomplete_runs:
+            return
+
+        # Incomplete runs are probed before failed ones are listed, so a run finishing in between is still listed
+        oldest_incomplete_runs = await asyncio.gather(
+            *(
+                self.rest_github_client.get_oldest_repository_workflow_run(
+                    request=dataclasses.replace(request, status=status),
                 )
-                repository_state.already_reported_failed_runs.add(workflow_run)
-
-            if last_created is None:
-                last_created = workflow_run.created_at
-            else:
-                last_created = max(last_created, workflow_run.created_at)
-
-            if workflow_run.status != "completed":
-                if oldest_incomplete_created is None:
-                    oldest_incomplete_created = workflow_run.created_at
-                else:
-                    oldest_incomplete_created = min(oldest_incomplete_created, workflow_run.created_at)
+                for status in INCOMPLETE_WORKFLOW_RUN_STATUSES
+            )
+        )
+        oldest_incomplete_created = min(
+            (workflow_run.created_at for workflow_run in oldest_incomplete_runs if workflow_run is not None),
+            default=None,
+        )
 
+        async for workflow_run in self.rest_github_client.get_repository_workflow_runs(
+            request=dataclasses.replace(request, status="failure"),
+        ):
+            if (
+                config.is_applicable(workflow_run)
+                and workflow_run.id not in repository_state.already_reported_failed_runs
+            ):
+                yield self._failed_workflow_run_event(repository=repository, workflow_run=workflow_run)
+                repository_state.already_reported_failed_runs[workflow_run.id] = workflow_run.created_at
+
+        last_created = last_workflow_run.created_at if last_workflow_run is not None else None
+        repository_state.last_run_id = last_run_id
+        if oldest_incomplete_created is not None:
+            state.repositories_with_incomplete_runs.add(repository)
+        else:
+            state.repositories_with_incomplete_runs.discard(repository)
         oldest_incomplete_created = (
             oldest_incomplete_created or last_created or repository_state.oldest_incomplete_created
         )
         repository_state.oldest_incomplete_created = oldest_incomplete_created
         repository_state.already_reported_failed_runs = {
-            run for run in repository_state.already_reported_failed_runs if run.created_at >= oldest_incomplete_created
+            run_id: created_at
+            for run_id, created_at in repository_state.already_reported_failed_runs.items()
+            if created_at >= oldest_incomplete_created
         }
 
+    def _failed_workflow_run_event(
+        self,
+        repository: str,
+        workflow_run: github_models.WorkflowRun,
+    ) -> task_base.Event:
+        return task_base.Event(
+            id=f"failed_workflow_run__{self.config.owner}__{repository}__{workflow_run.id}",
+            title=f"🔥Failed workflow run in {self.config.owner}/{repository}",
+            body=f"Workflow run {workflow_run.name} failed",
+            url=workflow_run.url,
+        )
+
+    @classmethod
+    def verify_webhook(cls, config: GithubTriggerConfig, headers: typing.Mapping[str, str], body: bytes) -> None:
+        if config.webhook_secret is None:
+            raise cls.WebhookNotSupportedError("Trigger has no webhook secret configured")
+        if not github_webhooks.is_signature_valid(
+            secret=config.webhook_secret.value,
+            body=body,
+            signature=headers.get(github_webhooks.SIGNATURE_HEADER),
+        ):
+            raise cls.WebhookSignatureError("Webhook delivery signature is invalid")
+
+    async def process_webhook(self, headers: typing.Mapping[str, str], body: bytes) -> list[task_base.Event]:
+        delivery = github_webhooks.parse_delivery(event_type=headers.get(github_webhooks.EVENT_HEADER, ""), body=body)
+        if delivery is None:
+            return []
+        if delivery.owner.lower() != self.config.owner.lower() or not self.config.is_repository_applicable(
+            github_models.Repository(owner=delivery.owner, name=delivery.repository)
+        ):
+            logger.debug("Skipping webhook delivery of not applicable repository(%s)", delivery.repository)
+            return []
+
+        if delivery.issue is not None or delivery.pull_request is not None:
+            await self._resolve_author_groups()
+
+        events: dict[str, task_base.Event] = {}
+        for config in self.config.subtriggers:
+            event = self._webhook_event(config=config, delivery=delivery)
+            if event is not None:
+                events[event.id] = event
+
+        return list(events.values())
+
+    async def confirm_webhook_events(self, events: list[task_base.Event]) -> None:
+        if not events:
+            return
+
+        async with self._acquire_state() as state:
+            delivered_at = datetime.datetime.now(tz=datetime.UTC)
+            for event in events:
+                state.webhook_event_ids[event.id] = delivered_at
+
+    def _webhook_event(
+        self,
+        config: BaseSubtriggerConfig,
+        delivery: github_webhooks.WebhookDelivery,
+    ) -> task_base.Event | None:
+        if isinstance(config, RepositoryIssueCreatedSubtriggerConfig):
+            if delivery.issue is not None and delivery.action == "opened" and config.is_applicable(delivery.issue):
+                return self._issue_created_event(repository=delivery.repository, issue=delivery.issue)
+            return None
+        if isinstance(config, RepositoryPRCreatedSubtriggerConfig):
+            if (
+                delivery.pull_request is not None
+                and delivery.action == "opened"
+                and config.is_applicable(delivery.pull_request)
+            ):
+                return self._pr_created_event(repository=delivery.repository, pr=delivery.pull_request)
+            return None
+        if isinstance(config, RepositoryFailedWorkflowRunSubtriggerConfig):
+            if (
+                delivery.workflow_run is not None
+                and delivery.action == "completed"
+                and config.is_applicable(delivery.workflow_run)
+            ):
+                return self._failed_workflow_run_event(
+                    repository=delivery.repository,
+                    workflow_run=delivery.workflow_run,
+                )
+            return None
+
+        raise ValueError(f"Unknown subtrigger: {config}")
+
 
 def register_default_plugins() -> None:
     logger.info("Registering default github triggers plugins")
@@ -547,6 +1486,7 @@ def register_default_plugins() -> None:
 __all__ = [
     "GithubTriggerConfig",
     "GithubTriggerProcessor",
+    "GithubTriggerResources",
     "RepositoryIssueCreatedSubtriggerConfig",
     "register_default_plugins",
 ]
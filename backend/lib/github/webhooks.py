@@ -0,0 +1,143 @@
+import dataclasses
+import datetime
+import hashlib
+import hmac
+import logging
+
+import pydantic
+
+import lib.github.models as github_models
+import lib.utils.pydantic as pydantic_utils
+
+logger = logging.getLogger(__name__)
+
+# https://docs.github.com/en/webhooks/webhook-events-and-payloads#delivery-headers
+EVENT_HEADER = "X-GitHub-Event"
+SIGNATURE_HEADER = "X-Hub-Signature-256"
+
+
+# https://docs.github.com/en/webhooks/using-webhooks/validating-webhook-deliveries
+def is_signature_valid(secret: str, body: bytes, signature: str | None) -> bool:
+    if signature is None:
+        return False
+
+    expected = "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+@dataclasses.dataclass(frozen=True)
+class WebhookDelivery:
+    owner: github_models.OwnerName
+    repository: github_models.RepositoryName
+    action: str | None
+    issue: github_models.Issue | None = None
+    pull_request: github_models.PullRequest | None = None
+    workflow_run: github_models.WorkflowRun | None = None
+
+
+class _User(pydantic_utils.BaseModel):
+    login: github_models.UserLogin
+
+
+class _Repository(pydantic_utils.BaseModel):
+    name: github_models.RepositoryName
+    owner: _User
+
+
+class _Issue(pydantic_utils.BaseModel):
+    node_id: str
+    user: _User | None
+    html_url: str
+    title: str
+    body: str | None
+    created_at: datetime.datetime
+
+
+class _WorkflowRun(pydantic_utils.BaseModel):
+    id: int
+    name: str
+    html_url: str
+    status: str
+    conclusion: str | None
+    created_at: datetime.datetime
+
+
+class _Payload(pydantic_utils.BaseModel):
+    action: str | None = None
+    repository: _Repository | None = None
+    issue: _Issue | None = None
+    pull_request: _Issue | None = None
+    workflow_run: _WorkflowRun | None = None
+
+
+# https://docs.github.com/en/webhooks/webhook-events-and-payloads
+def parse_delivery(event_type: str, body: bytes) -> WebhookDelivery | None:
+    if event_type not in ("issues", "pull_request", "workflow_run"):
+        logger.debug("Skipping webhook delivery of unsupported event type(%s)", event_type)
+        return None
+
+    try:
+        payload = _Payload.model_validate_json(body)
+    except pydantic.ValidationError:
+        logger.warning("Failed to parse webhook delivery of event type(%s)", event_type)
+        return None
+
+    if payload.repository is None:
+        return None
+
+    issue = payload.issue if event_type == "issues" else None
+    pull_request = payload.pull_request if event_type == "pull_request" else None
+    workflow_run = payload.workflow_run if event_type == "workflow_run" else None
+
+    return WebhookDelivery(
+        owner=payload.repository.owner.login,
+        repository=payload.repository.name,
+        action=payload.action,
+        issue=(
+            github_models.Issue(
+                id=issue.node_id,
+                author=issue.user.login if issue.user is not None else None,
+                url=issue.html_url,
+                title=issue.title,
+                body=issue.body or "",
+                created_at=issue.created_at,
+                repository=payload.repository.name,
+            )
+            if issue is not None
+            else None
+        ),
+        pull_request=(
+            github_models.PullRequest(
+                id=pull_request.node_id,
+                author=pull_request.user.login if pull_request.user is not None else None,
+                url=pull_request.html_url,
+                title=pull_request.title,
+                body=pull_request.body or "",
+                created_at=pull_request.created_at,
+                repository=payload.repository.name,
+            )
+            if pull_request is not None
+            else None
+        ),
+        workflow_run=(
+            github_models.WorkflowRun(
+                id=workflow_run.id,
+                name=workflow_run.name,
+                url=workflow_run.html_url,
+                status=workflow_run.status,
+                conclusion=workflow_run.conclusion,
+                created_at=workflow_run.created_at,
+            )
+            if workflow_run is not None
+            else None
+        ),
+    )
+
+
+__all__ = [
+    "EVENT_HEADER",
+    "SIGNATURE_HEADER",
+    "WebhookDelivery",
+    "is_signature_valid",
+    "parse_delivery",
+]
@@ -1,9 +1,9 @@
 from .action import (
+    ActionProcessorPool,
     ActionProcessorProtocol,
     BaseActionConfig,
     BaseActionProcessor,
     action_config_factory,
-    action_processor_factory,
     register_action,
 )
 from .event import Event
@@ -13,17 +13,19 @@ from .secret import (
     BaseSecretConfig,
     EnvSecretConfig,
 )
+from .shared import SharedResources
 from .task import BaseTaskConfig, CronTaskConfig, OncePerRunTaskConfig
 from .trigger import (
     BaseTriggerConfig,
     BaseTriggerProcessor,
+    TriggerProcessorFactory,
     TriggerProcessorProtocol,
     register_trigger,
     trigger_config_factory,
-    trigger_processor_factory,
 )
 
 __all__ = [
+    "ActionProcessorPool",
     "ActionProcessorProtocol",
     "BaseActionConfig",
     "BaseActionProcessor",
@@ -36,12 +38,12 @@ __all__ = [
     "Event",
     "OncePerRunTaskConfig",
     "RootConfig",
+    "SharedResources",
+    "TriggerProcessorFactory",
     "TriggerProcessorProtocol",
     "action_config_factory",
-    "action_processor_factory",
     "register_action",
     "register_default_plugins",
     "register_trigger",
     "trigger_config_factory",
-    "trigger_processor_factory",
 ]
@@ -1,16 +1,30 @@
 import abc
+import asyncio
 import dataclasses
+import logging
 import typing
 
 import lib.task.base.event as task_configs_event
+import lib.task.base.shared as task_base_shared
 import lib.utils.pydantic as pydantic_utils
 
+logger = logging.getLogger(__name__)
+
 
 class ActionProcessorProtocol(typing.Protocol):
     async def dispose(self) -> None: ...
 
     async def process(self, event: task_configs_event.Event) -> None: ...
 
+    async def process_batch(
+        self,
+        events: typing.Sequence[task_configs_event.Event],
+    ) -> list[BaseException | None]:
+        """
+        :returns: error of every event, None for processed ones
+        """
+        ...
+
 
 class BaseActionConfig(pydantic_utils.IDMixinModel, pydantic_utils.TypedBaseModel):
     @classmethod
@@ -18,12 +32,17 @@ class BaseActionConfig(pydantic_utils.IDMixinModel, pydantic_utils.TypedBaseMode
         return action_config_factory(data)
 
 
-class BaseActionProcessor[ConfigT: BaseActionConfig](abc.ABC):
+class BaseActionProcessor[ConfigT: BaseActionConfig, SharedT: task_base_shared.SharedResources](abc.ABC):
+    @classmethod
+    @abc.abstractmethod
+    def create_shared(cls) -> SharedT: ...
+
     @classmethod
     @abc.abstractmethod
     def from_config(
         cls,
         config: ConfigT,
+        shared: SharedT,
     ) -> typing.Self: ...
 
     async def dispose(self) -> None: ...
@@ -31,11 +50,18 @@ class BaseActionProcessor[ConfigT: BaseActionConfig](abc.ABC):
     @abc.abstractmethod
     async def process(self, event: task_configs_event.Event) -> None: ...
 
+    async def process_batch(
+        self,
+        events: typing.Sequence[task_configs_event.Event],
+    ) -> list[BaseException | None]:
+        # Processors able to deliver several events at once may override this
+        return await asyncio.gather(*(self.process(event) for event in events), return_exceptions=True)
+
 
 @dataclasses.dataclass(frozen=True)
 class RegistryRecord[ConfigT: BaseActionConfig]:
     config_class: type[ConfigT]
-    processor_class: type[BaseActionProcessor[ConfigT]]
+    processor_class: type[BaseActionProcessor[ConfigT, typing.Any]]
 
 
 _REGISTRY: dict[str, RegistryRecord[typing.Any]] = {}
@@ -44,7 +70,7 @@ _REGISTRY: dict[str, RegistryRecord[typing.Any]] = {}
 def register_action[ConfigT: BaseActionConfig](
     name: str,
     config_class: type[ConfigT],
-    processor_class: type[BaseActionProcessor[ConfigT]],
+    processor_class: type[BaseActionProcessor[ConfigT, typing.Any]],
 ) -> None:
     _REGISTRY[name] = RegistryRecord(config_class=config_class, processor_class=processor_class)
 
@@ -60,18 +86,44 @@ def action_config_factory(data: typing.Any) -> BaseActionConfig:
     return config_class.model_validate(data)
 
 
-def action_processor_factory(
-    config: BaseActionConfig,
-) -> ActionProcessorProtocol:
-    processor_class = _REGISTRY[config.type_name].processor_class
-    return processor_class.from_config(config)
+class ActionProcessorPool:
+    """
+    Keeps action processors for the application lifetime, so connections are reused across events.
+    Processors are keyed by config content, as action ids are only unique within a task.
+    Processors of the same type share resources, disposed after the processors.
+    """
+
+    def __init__(self):
+        self._processors: dict[str, ActionProcessorProtocol] = {}
+        self._shared: dict[str, task_base_shared.SharedResources] = {}
+
+    def get(self, config: BaseActionConfig) -> ActionProcessorProtocol:
+        key = config.model_dump_json()
+        if key not in self._processors:
+            logger.debug("Creating action processor for Action(%s)", config.id)
+            processor_class = _REGISTRY[config.type_name].processor_class
+            if config.type_name not in self._shared:
+                self._shared[config.type_name] = processor_class.create_shared()
+            self._processors[key] = processor_class.from_config(config=config, shared=self._shared[config.type_name])
+        return self._processors[key]
+
+    async def dispose(self) -> None:
+        processors = list(self._processors.values())
+        shared = list(self._shared.values())
+        self._processors.clear()
+        self._shared.clear()
+
+        for processor in processors:
+            await processor.dispose()
+        for resources in shared:
+            await resources.dispose()
 
 
 __all__ = [
+    "ActionProcessorPool",
     "ActionProcessorProtocol",
     "BaseActionConfig",
     "BaseActionProcessor",
     "action_config_factory",
-    "action_processor_factory",
     "register_action",
 ]
@@ -0,0 +1,12 @@
+class SharedResources:
+    """
+    Resources shared by all processors of a plugin, e.g. connections and caches.
+    Created and disposed by the owning factory or pool, so their lifetime is tied to the application.
+    """
+
+    async def dispose(self) -> None: ...
+
+
+__all__ = [
+    "SharedResources",
+]
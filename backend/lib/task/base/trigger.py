@@ -1,15 +1,35 @@
 import abc
 import dataclasses
+import logging
 import typing
 
 import lib.task.base as task_base
+import lib.task.base.shared as task_base_shared
 import lib.task.protocols as task_protocols
 import lib.utils.pydantic as pydantic_utils
 
+logger = logging.getLogger(__name__)
+
 
 class TriggerProcessorProtocol(typing.Protocol):
+    class WebhookNotSupportedError(Exception): ...
+
+    class WebhookSignatureError(Exception): ...
+
     def produce_events(self) -> typing.AsyncGenerator[task_base.Event, None]: ...
 
+    async def process_webhook(self, headers: typing.Mapping[str, str], body: bytes) -> list[task_base.Event]:
+        """
+        Expects delivery already verified by `TriggerProcessorFactory.verify_webhook`.
+        """
+        ...
+
+    async def confirm_webhook_events(self, events: list[task_base.Event]) -> None:
+        """
+        Called once events returned by `process_webhook` are queued, so they are not produced again by polling.
+        """
+        ...
+
     async def dispose(self) -> None: ...
 
 
@@ -19,24 +39,45 @@ class BaseTriggerConfig(pydantic_utils.IDMixinModel, pydantic_utils.TypedBaseMod
         return trigger_config_factory(data)
 
 
-class BaseTriggerProcessor[ConfigT: BaseTriggerConfig](abc.ABC):
+class BaseTriggerProcessor[ConfigT: BaseTriggerConfig, SharedT: task_base_shared.SharedResources](abc.ABC):
+    WebhookNotSupportedError = TriggerProcessorProtocol.WebhookNotSupportedError
+    WebhookSignatureError = TriggerProcessorProtocol.WebhookSignatureError
+
+    @classmethod
+    @abc.abstractmethod
+    def create_shared(cls, state_repository: task_protocols.StateRepositoryProtocol) -> SharedT: ...
+
     @classmethod
     @abc.abstractmethod
     def from_config(
         cls,
         config: ConfigT,
         state: task_protocols.StateProtocol,
+        shared: SharedT,
     ) -> typing.Self: ...
 
+    @classmethod
+    def verify_webhook(cls, config: ConfigT, headers: typing.Mapping[str, str], body: bytes) -> None:
+        """
+        :raises WebhookNotSupportedError: if trigger does not accept webhooks
+        :raises WebhookSignatureError: if delivery signature is invalid
+        """
+        raise cls.WebhookNotSupportedError(f"Trigger({cls.__name__}) does not support webhooks")
+
     def produce_events(self) -> typing.AsyncGenerator[task_base.Event, None]: ...
 
+    async def process_webhook(self, headers: typing.Mapping[str, str], body: bytes) -> list[task_base.Event]:
+        raise self.WebhookNotSupportedError(f"Trigger({self.__class__.__name__}) does not support webhooks")
+
+    async def confirm_webhook_events(self, events: list[task_base.Event]) -> None: ...
+
     async def dispose(self) -> None: ...
 
 
 @dataclasses.dataclass(frozen=True)
 class RegistryRecord[ConfigT: BaseTriggerConfig]:
     config_class: type[ConfigT]
-    processor_class: type[BaseTriggerProcessor[ConfigT]]
+    processor_class: type[BaseTriggerProcessor[ConfigT, typing.Any]]
 
 
 _REGISTRY: dict[str, RegistryRecord[typing.Any]] = {}
@@ -45,7 +86,7 @@ _REGISTRY: dict[str, RegistryRecord[typing.Any]] = {}
 def register_trigger[ConfigT: BaseTriggerConfig](
     name: str,
     config_class: type[ConfigT],
-    processor_class: type[BaseTriggerProcessor[ConfigT]],
+    processor_class: type[BaseTriggerProcessor[ConfigT, typing.Any]],
 ) -> None:
     _REGISTRY[name] = RegistryRecord(config_class=config_class, processor_class=processor_class)
 
@@ -61,19 +102,48 @@ def trigger_config_factory(data: typing.Any) -> BaseTriggerConfig:
     return config_class.model_validate(data)
 
 
-def trigger_processor_factory(
-    config: BaseTriggerConfig,
-    state: task_protocols.StateProtocol,
-) -> TriggerProcessorProtocol:
-    processor_class = _REGISTRY[config.type_name].processor_class
-    return processor_class.from_config(config=config, state=state)
+class TriggerProcessorFactory:
+    """
+    Creates trigger processors, resources shared by processors of the same type live until the factory is disposed.
+    """
+
+    def __init__(self):
+        self._shared: dict[str, task_base_shared.SharedResources] = {}
+
+    def create(
+        self,
+        config: BaseTriggerConfig,
+        state: task_protocols.StateProtocol,
+        state_repository: task_protocols.StateRepositoryProtocol,
+    ) -> TriggerProcessorProtocol:
+        processor_class = _REGISTRY[config.type_name].processor_class
+        if config.type_name not in self._shared:
+            logger.debug("Creating shared resources of Trigger type(%s)", config.type_name)
+            self._shared[config.type_name] = processor_class.create_shared(state_repository=state_repository)
+
+        return processor_class.from_config(config=config, state=state, shared=self._shared[config.type_name])
+
+    def verify_webhook(self, config: BaseTriggerConfig, headers: typing.Mapping[str, str], body: bytes) -> None:
+        """
+        Checks delivery before any trigger state is loaded.
+        :raises TriggerProcessorProtocol.WebhookNotSupportedError: if trigger does not accept webhooks
+        :raises TriggerProcessorProtocol.WebhookSignatureError: if delivery signature is invalid
+        """
+        _REGISTRY[config.type_name].processor_class.verify_webhook(config=config, headers=headers, body=body)
+
+    async def dispose(self) -> None:
+        shared = list(self._shared.values())
+        self._shared.clear()
+
+        for resources in shared:
+            await resources.dispose()
 
 
 __all__ = [
     "BaseTriggerConfig",
     "BaseTriggerProcessor",
+    "TriggerProcessorFactory",
     "TriggerProcessorProtocol",
     "register_trigger",
     "trigger_config_factory",
-    "trigger_processor_factory",
 ]
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import typing
 
 import lib.task.base as task_base
 import lib.task.jobs.models as task_job_models
@@ -9,6 +11,7 @@ logger = logging.getLogger(__name__)
 
 DELAY_TIMEOUT = 0
 RETRY_TIMEOUT = 1
+DEFAULT_BATCH_SIZE = 1
 
 
 class EventProcessorJob(aiojobs_utils.RepeatableJob):
@@ -17,10 +20,16 @@ class EventProcessorJob(aiojobs_utils.RepeatableJob):
         job_id: int,
         max_retries: int,
         queue_repository: task_repositories.QueueRepositoryProtocol,
+        action_processor_pool: task_base.ActionProcessorPool,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        batch_max_wait: float = 0,
     ):
         self._id = job_id
         self._max_retries = max_retries
         self._queue_repository = queue_repository
+        self._action_processor_pool = action_processor_pool
+        self._batch_size = batch_size
+        self._batch_max_wait = batch_max_wait
 
         super().__init__(
             logger=logger,
@@ -34,42 +43,76 @@ class EventProcessorJob(aiojobs_utils.RepeatableJob):
 
     async def _process(self) -> None:
         try:
-            async with self._queue_repository.acquire(topic=task_repositories.JobTopic.EVENT) as event_job:
-                assert isinstance(event_job, task_job_models.EventJob)
-                logger.debug("Processing EventJob(%s)", event_job.id)
-                try:
-                    await self._process_event(event_job=event_job)
-                except Exception:
-                    logger.error("EventJob(%s) has failed", event_job.id)
-                    if event_job.retry_count + 1 < self._max_retries:
-                        await self._queue_repository.push(
-                            topic=task_repositories.JobTopic.EVENT,
-                            item=event_job.copy_retry(),
-                            validate_not_closed=False,
-                        )
-                    else:
-                        logger.error("EventJob(%s) has reached max retries", event_job.id)
-                        await self._queue_repository.push(
-                            topic=task_repositories.JobTopic.FAILED_EVENT,
-                            item=event_job,
-                        )
-                    await self._queue_repository.consume(topic=task_repositories.JobTopic.EVENT, item=event_job)
-                    raise
-                else:
-                    await self._queue_repository.consume(topic=task_repositories.JobTopic.EVENT, item=event_job)
-                    logger.info("EventJob(%s) has been processed", event_job.id)
+            async with self._queue_repository.acquire_batch(
+                topic=task_repositories.JobTopic.EVENT,
+                max_items=self._batch_size,
+                max_wait=self._batch_max_wait,
+            ) as event_jobs:
+                assert all(isinstance(event_job, task_job_models.EventJob) for event_job in event_jobs)
+                event_jobs = typing.cast(list[task_job_models.EventJob], event_jobs)
+                logger.debug("Processing %s EventJobs", len(event_jobs))
+                errors = await self._process_events(event_jobs=event_jobs)
+
+                failed_event_jobs: list[task_job_models.EventJob] = []
+                for event_job, error in zip(event_jobs, errors, strict=True):
+                    if error is None:
+                        logger.info("EventJob(%s) has been processed", event_job.id)
+                        continue
+
+                    logger.error("EventJob(%s) has failed", event_job.id, exc_info=error)
+                    failed_event_jobs.append(event_job)
+
+                await self._queue_repository.push_many(
+                    topic=task_repositories.JobTopic.EVENT,
+                    items=[
+                        event_job.copy_retry()
+                        for event_job in failed_event_jobs
+                        if event_job.retry_count + 1 < self._max_retries
+                    ],
+                    validate_not_closed=False,
+                    wait_for_capacity=False,
+                )
+                exhausted_event_jobs = [
+                    event_job for event_job in failed_event_jobs if event_job.retry_count + 1 >= self._max_retries
+                ]
+                for event_job in exhausted_event_jobs:
+                    logger.error("EventJob(%s) has reached max retries", event_job.id)
+                await self._queue_repository.push_many(
+                    topic=task_repositories.JobTopic.FAILED_EVENT,
+                    items=exhausted_event_jobs,
+                )
+                await self._queue_repository.consume_many(topic=task_repositories.JobTopic.EVENT, items=event_jobs)
+
+                if failed_event_jobs:
+                    raise RuntimeError(f"{len(failed_event_jobs)} of {len(event_jobs)} EventJobs have failed")
         except task_repositories.QueueRepositoryProtocol.TopicFinished:
             logger.debug("Event queue is closed, finishing job")
             self.finish()
 
-    async def _process_event(self, event_job: task_job_models.EventJob) -> None:
-        event_processor = task_base.action_processor_factory(
-            config=event_job.action,
-        )
-        try:
-            await event_processor.process(event=event_job.event)
-        finally:
-            await event_processor.dispose()
+    async def _process_events(
+        self,
+        event_jobs: list[task_job_models.EventJob],
+    ) -> list[BaseException | None]:
+        # Jobs of the same action are delivered together, so processors can batch them
+        indexes_by_action: dict[str, list[int]] = {}
+        for index, event_job in enumerate(event_jobs):
+            indexes_by_action.setdefault(event_job.action.model_dump_json(), []).append(index)
+
+        async def process_action(indexes: list[int]) -> list[BaseException | None]:
+            try:
+                event_processor = self._action_processor_pool.get(config=event_jobs[indexes[0]].action)
+                return await event_processor.process_batch(events=[event_jobs[index].event for index in indexes])
+            except Exception as error:
+                return [error] * len(indexes)
+
+        results = await asyncio.gather(*(process_action(indexes) for indexes in indexes_by_action.values()))
+
+        errors: list[BaseException | None] = [None] * len(event_jobs)
+        for indexes, action_errors in zip(indexes_by_action.values(), results, strict=True):
+            for index, error in zip(indexes, action_errors, strict=True):
+                errors[index] = error
+
+        return errors
 
 
 __all__ = [
@@ -45,6 +45,7 @@ class TaskProcessorJob(aiojobs_utils.RepeatableJob):
                             topic=task_repositories.JobTopic.TASK,
                             item=task_job.copy_retry(),
                             validate_not_closed=False,
+                            wait_for_capacity=False,
                         )
                     else:
                         logger.error("TaskJob(%s) has reached max retries", task_job.id)
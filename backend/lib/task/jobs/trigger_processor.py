@@ -19,11 +19,13 @@ class TriggerProcessorJob(aiojobs_utils.RepeatableJob):
         max_retries: int,
         queue_repository: task_repositories.QueueRepositoryProtocol,
         state_repository: task_protocols.StateRepositoryProtocol,
+        trigger_processor_factory: task_base.TriggerProcessorFactory,
     ):
         self._id = job_id
         self._max_retries = max_retries
         self._queue_repository = queue_repository
         self._state_repository = state_repository
+        self._trigger_processor_factory = trigger_processor_factory
 
         super().__init__(
             logger=logger,
@@ -49,6 +51,7 @@ class TriggerProcessorJob(aiojobs_utils.RepeatableJob):
                             topic=task_repositories.JobTopic.TRIGGER,
                             item=trigger_job.copy_retry(),
                             validate_not_closed=False,
+                            wait_for_capacity=False,
                         )
                     else:
                         logger.error("TriggerJob(%s) has reached max retries", trigger_job.id)
@@ -72,22 +75,26 @@ class TriggerProcessorJob(aiojobs_utils.RepeatableJob):
 
         state = await self._state_repository.get_state(path=f"tasks/{task_id}/triggers/{trigger.id}")
 
-        trigger_processor = task_base.trigger_processor_factory(
+        trigger_processor = self._trigger_processor_factory.create(
             config=trigger_job.trigger,
             state=state,
+            state_repository=self._state_repository,
         )
         try:
             async for raw_event in trigger_processor.produce_events():
-                for action in trigger_job.actions:
-                    event_job = task_job_models.EventJob(
+                event_jobs = [
+                    task_job_models.EventJob(
                         id=f"{task_id}/{trigger.id}/{action.id}/{raw_event.id}",
                         event=raw_event,
                         action=action,
                     )
-                    await self._queue_repository.push(
-                        topic=task_repositories.JobTopic.EVENT,
-                        item=event_job,
-                    )
+                    for action in trigger_job.actions
+                ]
+                await self._queue_repository.push_many(
+                    topic=task_repositories.JobTopic.EVENT,
+                    items=event_jobs,
+                )
+                for event_job in event_jobs:
                     logger.info("EventJob(%s) was spawned", event_job.id)
         finally:
             await trigger_processor.dispose()
@@ -9,6 +9,9 @@ from .queue import (
     JOB_TOPICS,
     BaseQueueSettings,
     JobTopic,
+    MemoryQueueRepository,
+    MemoryQueueSettings,
+    MemoryTopicSettings,
     QueueRepositoryProtocol,
     queue_repository_factory,
 )
@@ -29,6 +32,9 @@ __all__ = [
     "JobTopic",
     "LocalDirStateRepository",
     "LocalDirStateSettings",
+    "MemoryQueueRepository",
+    "MemoryQueueSettings",
+    "MemoryTopicSettings",
     "QueueRepositoryProtocol",
     "config_repository_factory",
     "queue_repository_factory",
@@ -1,4 +1,5 @@
 import abc
+import contextlib
 import dataclasses
 import enum
 import typing
@@ -46,7 +47,31 @@ class QueueRepositoryProtocol(typing.Protocol):
 
     def is_topic_empty(self, topic: JobTopic) -> bool: ...
 
-    async def push(self, topic: JobTopic, item: QueueItem, validate_not_closed: bool = True) -> None:
+    def is_topic_paused(self, topic: JobTopic) -> bool:
+        """
+        Whether producers waiting for capacity are paused on full topic.
+        """
+        ...
+
+    async def push(
+        self,
+        topic: JobTopic,
+        item: QueueItem,
+        validate_not_closed: bool = True,
+        wait_for_capacity: bool = True,
+    ) -> None:
+        """
+        Waits while topic is full, unless `wait_for_capacity` is disabled, e.g. for retries pushed by consumers.
+        :raises TopicClosed: if topic is closed
+        """
+
+    async def push_many(
+        self,
+        topic: JobTopic,
+        items: typing.Sequence[QueueItem],
+        validate_not_closed: bool = True,
+        wait_for_capacity: bool = True,
+    ) -> None:
         """
         :raises TopicClosed: if topic is closed
         """
@@ -56,8 +81,22 @@ class QueueRepositoryProtocol(typing.Protocol):
         :raises TopicFinished: if topic is finished
         """
 
+    def acquire_batch(  # pyright: ignore[reportReturnType]
+        self,
+        topic: JobTopic,
+        max_items: int,
+        max_wait: float = 0,
+    ) -> typing.AsyncContextManager[list[QueueItem]]:
+        """
+        Waits for at least one item, then collects up to `max_items` items for at most `max_wait` seconds.
+        Items not consumed on exit are returned to the topic.
+        :raises TopicFinished: if topic is finished
+        """
+
     async def consume(self, topic: JobTopic, item: QueueItem) -> None: ...
 
+    async def consume_many(self, topic: JobTopic, items: typing.Sequence[QueueItem]) -> None: ...
+
     async def close_topic(self, topic: JobTopic) -> None: ...
 
 
@@ -88,14 +127,53 @@ class BaseQueueRepository[SettingsT: BaseQueueSettings](abc.ABC):
     def is_topic_empty(self, topic: JobTopic) -> bool: ...
 
     @abc.abstractmethod
-    async def push(self, topic: JobTopic, item: QueueItem, validate_not_closed: bool = True) -> None: ...
+    def is_topic_paused(self, topic: JobTopic) -> bool: ...
+
+    @abc.abstractmethod
+    async def push(
+        self,
+        topic: JobTopic,
+        item: QueueItem,
+        validate_not_closed: bool = True,
+        wait_for_capacity: bool = True,
+    ) -> None: ...
+
+    async def push_many(
+        self,
+        topic: JobTopic,
+        items: typing.Sequence[QueueItem],
+        validate_not_closed: bool = True,
+        wait_for_capacity: bool = True,
+    ) -> None:
+        for item in items:
+            await self.push(
+                topic=topic,
+                item=item,
+                validate_not_closed=validate_not_closed,
+                wait_for_capacity=wait_for_capacity,
+            )
 
     @abc.abstractmethod
     def acquire(self, topic: JobTopic) -> typing.AsyncContextManager[QueueItem]: ...
 
+    @contextlib.asynccontextmanager
+    async def acquire_batch(
+        self,
+        topic: JobTopic,
+        max_items: int,
+        max_wait: float = 0,
+    ) -> typing.AsyncIterator[list[QueueItem]]:
+        # Backends without native batches deliver one item at a time
+        async with self.acquire(topic) as item:
+            yield [item]
+
     @abc.abstractmethod
     async def consume(self, topic: JobTopic, item: QueueItem) -> None: ...
 
+    async def consume_many(self, topic: JobTopic, items: typing.Sequence[QueueItem]) -> None:
+        for item in items:
+            await self.consume(topic=topic, item=item)
+
     @abc.abstractmethod
     async def close_topic(self, topic: JobTopic) -> None: ...
 
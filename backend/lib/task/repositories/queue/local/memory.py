@@ -1,16 +1,69 @@
 import asyncio
-import collections
 import contextlib
+import dataclasses
 import logging
 import typing
 
+import pydantic
+
 import lib.task.repositories.queue.base as queue_base
+import lib.utils.pydantic as pydantic_utils
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_EVENT_TOPIC_CAPACITY = 1000
+
+
+class MemoryTopicSettings(pydantic_utils.BaseModel):
+    capacity: int = pydantic.Field(default=0, ge=0)
+    low_watermark: int | None = pydantic.Field(default=None, ge=0)
+
+    @property
+    def resolved_low_watermark(self) -> int:
+        if self.low_watermark is not None:
+            return self.low_watermark
+        return self.capacity // 2
+
+    @pydantic.model_validator(mode="after")
+    def check_low_watermark(self) -> typing.Self:
+        if self.capacity > 0 and self.resolved_low_watermark >= self.capacity:
+            raise ValueError("low_watermark must be less than capacity")
+        return self
+
+
+def _default_topics() -> dict[queue_base.JobTopic, MemoryTopicSettings]:
+    return {queue_base.JobTopic.EVENT: MemoryTopicSettings(capacity=DEFAULT_EVENT_TOPIC_CAPACITY)}
+
 
 class MemoryQueueSettings(queue_base.BaseQueueSettings):
     type: typing.Literal["memory"]
+    topics: dict[queue_base.JobTopic, MemoryTopicSettings] = pydantic.Field(default_factory=_default_topics)
+
+    @pydantic.field_validator("topics", mode="after")
+    @classmethod
+    def check_topics(
+        cls,
+        v: dict[queue_base.JobTopic, MemoryTopicSettings],
+    ) -> dict[queue_base.JobTopic, MemoryTopicSettings]:
+        # Failed topics are filled by processors, which must never wait for them
+        bounded_failed_topics = [
+            topic.value for topic, settings in v.items() if topic in queue_base.FAILED_JOB_TOPICS and settings.capacity
+        ]
+        if bounded_failed_topics:
+            raise ValueError(f"Failed topics can't be bounded: {', '.join(bounded_failed_topics)}")
+        return v
+
+
+@dataclasses.dataclass(frozen=True)
+class TopicMetrics:
+    topic: str
+    size: int
+    capacity: int
+    low_watermark: int
+    peak_size: int
+    is_paused: bool
+    high_watermark_hits: int
+    blocked_seconds: float
 
 
 class Topic[QueueItemT: queue_base.QueueItem](asyncio.Queue[QueueItemT]):
@@ -20,17 +73,32 @@ class Topic[QueueItemT: queue_base.QueueItem](asyncio.Queue[QueueItemT]):
     class TopicFinished(Exception):
         pass
 
-    def __init__(self, maxsize: int = 0):
+    def __init__(self, name: str = "", capacity: int = 0, low_watermark: int = 0):
+        """
+        Producers are paused once `capacity` items are queued and resumed when the topic drains to `low_watermark`.
+        Zero capacity means unbounded topic.
+        """
+        self._name = name
         self._closed = asyncio.Event()
 
+        self._capacity = capacity
+        self._low_watermark = low_watermark
+        self._has_capacity = asyncio.Event()
+        self._has_capacity.set()
+        self._peak_size = 0
+        self._high_watermark_hits = 0
+        self._blocked_seconds = 0.0
+
         self._consumed_items: set[typing.Hashable] = set()
-        super().__init__(maxsize=maxsize)
+        super().__init__()
 
     async def close(self) -> None:
         if self.is_closed:
             return
 
         self._closed.set()
+        # Wakes paused producers up, so they fail on closed topic
+        self._has_capacity.set()
         asyncio.create_task(self._clean_up())
 
     async def _clean_up(self) -> None:
@@ -54,6 +122,10 @@ class Topic[QueueItemT: queue_base.QueueItem](asyncio.Queue[QueueItemT]):
     def is_closed(self) -> bool:
         return self._closed.is_set()
 
+    @property
+    def is_paused(self) -> bool:
+        return not self._has_capacity.is_set()
+
     def _validate_not_closed(self) -> None:
         if self.is_closed:
             raise self.TopicClosed()
@@ -71,14 +143,77 @@ class Topic[QueueItemT: queue_base.QueueItem](asyncio.Queue[QueueItemT]):
         self._validate_not_finished()
         return await super().get()
 
-    async def put(self, item: QueueItemT, validate_not_closed: bool = True) -> None:
+    @property
+    def metrics(self) -> TopicMetrics:
+        return TopicMetrics(
+            topic=self._name,
+            size=self.qsize(),
+            capacity=self._capacity,
+            low_watermark=self._low_watermark,
+            peak_size=self._peak_size,
+            is_paused=self.is_paused,
+            high_watermark_hits=self._high_watermark_hits,
+            blocked_seconds=self._blocked_seconds,
+        )
+
+    def _put(self, item: QueueItemT) -> None:
+        super()._put(item)  # pyright: ignore[reportAttributeAccessIssue]
+
+        size = self.qsize()
+        self._peak_size = max(self._peak_size, size)
+        if self._capacity and size >= self._capacity and self._has_capacity.is_set() and not self.is_closed:
+            self._has_capacity.clear()
+            self._high_watermark_hits += 1
+            logger.warning("Topic(%s) has reached high watermark, producers are paused: %s", self._name, self.metrics)
+
+    def _get(self) -> QueueItemT:
+        item = typing.cast(QueueItemT, super()._get())  # pyright: ignore[reportAttributeAccessIssue]
+
+        if not self._has_capacity.is_set() and self.qsize() <= self._low_watermark:
+            self._has_capacity.set()
+            logger.info("Topic(%s) has drained to low watermark, producers are resumed: %s", self._name, self.metrics)
+
+        return item
+
+    async def _wait_for_capacity(self) -> None:
+        if self._has_capacity.is_set():
+            return
+
+        loop = asyncio.get_running_loop()
+        started_at = loop.time()
+        try:
+            await self._has_capacity.wait()
+        finally:
+            self._blocked_seconds += loop.time() - started_at
+
+    async def put(self, item: QueueItemT, validate_not_closed: bool = True, wait_for_capacity: bool = True) -> None:
         if validate_not_closed:
             self._validate_not_closed()
+        if wait_for_capacity:
+            await self._wait_for_capacity()
+            if validate_not_closed:
+                self._validate_not_closed()
         await super().put(item)
 
+    async def put_many(
+        self,
+        items: typing.Sequence[QueueItemT],
+        validate_not_closed: bool = True,
+        wait_for_capacity: bool = True,
+    ) -> None:
+        for item in items:
+            await self.put(item, validate_not_closed=validate_not_closed, wait_for_capacity=wait_for_capacity)
+
     async def consume(self, item: QueueItemT) -> None:
         self._consumed_items.add(item.unique_key)
 
+    async def _release(self, item: QueueItemT) -> None:
+        if item.unique_key in self._consumed_items:
+            self._consumed_items.remove(item.unique_key)
+        else:
+            await self.put(item, validate_not_closed=False, wait_for_capacity=False)
+        self.task_done()
+
     @contextlib.asynccontextmanager
     async def acquire(self) -> typing.AsyncIterator[QueueItemT]:
         item = await self.get()
@@ -86,30 +221,84 @@ class Topic[QueueItemT: queue_base.QueueItem](asyncio.Queue[QueueItemT]):
         try:
             yield item
         finally:
-            if item.unique_key in self._consumed_items:
-                self._consumed_items.remove(item.unique_key)
-            else:
-                await self.put(item, validate_not_closed=False)
-            self.task_done()
+            await self._release(item)
+
+    async def _get_batch(self, max_items: int, max_wait: float) -> list[QueueItemT]:
+        items = [await self.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+
+        try:
+            while len(items) < max_items:
+                if not self.empty():
+                    items.append(self.get_nowait())
+                    continue
+
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self.get(), timeout=timeout))
+                except (TimeoutError, self.TopicFinished):
+                    break
+        except BaseException:
+            # Batch is not handed out on cancellation, so its items are returned to the topic
+            for item in items:
+                await self._release(item)
+            raise
+
+        return items
+
+    @contextlib.asynccontextmanager
+    async def acquire_batch(self, max_items: int, max_wait: float = 0) -> typing.AsyncIterator[list[QueueItemT]]:
+        items = await self._get_batch(max_items=max_items, max_wait=max_wait)
+
+        try:
+            yield items
+        finally:
+            for item in items:
+                await self._release(item)
 
 
 class MemoryQueueRepository(queue_base.BaseQueueRepository[MemoryQueueSettings]):
-    def __init__(self):
-        self._topics: dict[str, Topic[queue_base.QueueItem]] = collections.defaultdict(Topic)
+    def __init__(self, topics: typing.Mapping[queue_base.JobTopic, MemoryTopicSettings] | None = None):
+        self._topic_settings = dict(topics or {})
+        self._topics: dict[queue_base.JobTopic, Topic[queue_base.QueueItem]] = {}
 
     @classmethod
     def from_settings(cls, settings: MemoryQueueSettings) -> typing.Self:
-        return cls()
+        return cls(topics=settings.topics)
+
+    def _get_topic(self, topic: queue_base.JobTopic) -> Topic[queue_base.QueueItem]:
+        if topic not in self._topics:
+            settings = self._topic_settings.get(topic, MemoryTopicSettings())
+            self._topics[topic] = Topic(
+                name=topic.value,
+                capacity=settings.capacity,
+                low_watermark=settings.resolved_low_watermark,
+            )
+        return self._topics[topic]
+
+    @property
+    def metrics(self) -> list[TopicMetrics]:
+        return [topic.metrics for topic in self._topics.values()]
+
+    async def dispose(self) -> None:
+        for metrics in self.metrics:
+            logger.info("Topic(%s) metrics: %s", metrics.topic, metrics)
 
     @property
     def is_finished(self) -> bool:
         return all(topic.is_finished for topic in self._topics.values())
 
     def is_topic_finished(self, topic: queue_base.JobTopic) -> bool:
-        return self._topics[topic].is_finished
+        return self._get_topic(topic).is_finished
 
     def is_topic_empty(self, topic: queue_base.JobTopic) -> bool:
-        return self._topics[topic].empty()
+        return self._get_topic(topic).empty()
+
+    def is_topic_paused(self, topic: queue_base.JobTopic) -> bool:
+        return self._get_topic(topic).is_paused
 
     @contextlib.contextmanager
     def _wrap_queue_errors(self, topic: queue_base.JobTopic) -> typing.Iterator[None]:
@@ -125,26 +314,65 @@ class MemoryQueueRepository(queue_base.BaseQueueRepository[MemoryQueueSettings])
         topic: queue_base.JobTopic,
         item: queue_base.QueueItem,
         validate_not_closed: bool = True,
+        wait_for_capacity: bool = True,
     ) -> None:
         logger.debug("Pushing item to topic %s: %s", topic, item)
         with self._wrap_queue_errors(topic):
-            await self._topics[topic].put(item, validate_not_closed=validate_not_closed)
+            await self._get_topic(topic).put(
+                item,
+                validate_not_closed=validate_not_closed,
+                wait_for_capacity=wait_for_capacity,
+            )
+
+    async def push_many(
+        self,
+        topic: queue_base.JobTopic,
+        items: typing.Sequence[queue_base.QueueItem],
+        validate_not_closed: bool = True,
+        wait_for_capacity: bool = True,
+    ) -> None:
+        logger.debug("Pushing %s items to topic %s", len(items), topic)
+        with self._wrap_queue_errors(topic):
+            await self._get_topic(topic).put_many(
+                items,
+                validate_not_closed=validate_not_closed,
+                wait_for_capacity=wait_for_capacity,
+            )
 
     @contextlib.asynccontextmanager
     async def acquire(self, topic: queue_base.JobTopic) -> typing.AsyncIterator[queue_base.QueueItem]:
         with self._wrap_queue_errors(topic):
-            async with self._topics[topic].acquire() as task:
+            async with self._get_topic(topic).acquire() as task:
                 yield task
 
+    @contextlib.asynccontextmanager
+    async def acquire_batch(
+        self,
+        topic: queue_base.JobTopic,
+        max_items: int,
+        max_wait: float = 0,
+    ) -> typing.AsyncIterator[list[queue_base.QueueItem]]:
+        with self._wrap_queue_errors(topic):
+            async with self._get_topic(topic).acquire_batch(max_items=max_items, max_wait=max_wait) as items:
+                yield items
+
     async def consume(self, topic: queue_base.JobTopic, item: queue_base.QueueItem) -> None:
         logger.debug("Consuming item from topic %s: %s", topic, item)
-        await self._topics[topic].consume(item)
+        await self._get_topic(topic).consume(item)
+
+    async def consume_many(self, topic: queue_base.JobTopic, items: typing.Sequence[queue_base.QueueItem]) -> None:
+        logger.debug("Consuming %s items from topic %s", len(items), topic)
+        queue = self._get_topic(topic)
+        for item in items:
+            await queue.consume(item)
 
     async def close_topic(self, topic: queue_base.JobTopic) -> None:
-        await self._topics[topic].close()
+        await self._get_topic(topic).close()
 
 
 __all__ = [
     "MemoryQueueRepository",
     "MemoryQueueSettings",
+    "MemoryTopicSettings",
+    "TopicMetrics",
 ]
@@ -1 +1,2 @@
 from .queue_state import *
+from .webhook_server import *
@@ -18,6 +18,8 @@ class JobProcessorQueueStateMode(str, enum.Enum):
 
 logger = logging.getLogger(__name__)
 
+DUMP_BATCH_SIZE = 100
+
 
 class TopicState(pydantic_utils.BaseModel):
     jobs: list[task_jobs.BaseJob]
@@ -120,10 +122,10 @@ class QueueStateService:
 
         jobs: list[task_jobs.BaseJob] = []
         while not self._queue_repository.is_topic_finished(topic):
-            async with self._queue_repository.acquire(topic) as job:
-                assert isinstance(job, self._job_model)
-                jobs.append(job)
-                await self._queue_repository.consume(topic, job)
+            async with self._queue_repository.acquire_batch(topic, max_items=DUMP_BATCH_SIZE) as batch:
+                assert all(isinstance(job, self._job_model) for job in batch)
+                jobs.extend(batch)
+                await self._queue_repository.consume_many(topic, batch)
 
         if len(jobs) == 0:
             logger.info("No jobs to dump from Topic(%s)", topic)
@@ -157,8 +159,8 @@ class QueueStateService:
             return
 
         state = TopicState.from_raw(raw=raw_state, job_model=self._job_model, reset_retry_count=reset_retry_count)
-        for job in state.jobs:
-            await self._queue_repository.push(topic, job)
+        # Loaded jobs are pushed before processors start, so they can't wait for topic capacity
+        await self._queue_repository.push_many(topic, state.jobs, wait_for_capacity=False)
 
         logger.info("%s jobs loaded to Topic(%s)", len(state.jobs), topic)
 
@@ -0,0 +1,137 @@
+import logging
+
+import aiohttp.web
+
+import lib.task.base as task_base
+import lib.task.jobs as task_jobs
+import lib.task.protocols as task_protocols
+import lib.task.repositories as task_repositories
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookServer:
+    """
+    Receives webhook deliveries on `POST {path_prefix}/{task_id}/{trigger_id}`
+    and pushes events produced by the trigger to the event topic.
+    """
+
+    def __init__(
+        self,
+        config_repository: task_repositories.ConfigRepositoryProtocol,
+        queue_repository: task_repositories.QueueRepositoryProtocol,
+        state_repository: task_protocols.StateRepositoryProtocol,
+        trigger_processor_factory: task_base.TriggerProcessorFactory,
+        host: str,
+        port: int,
+        path_prefix: str = "/webhooks",
+    ):
+        self._config_repository = config_repository
+        self._queue_repository = queue_repository
+        self._state_repository = state_repository
+        self._trigger_processor_factory = trigger_processor_factory
+        self._host = host
+        self._port = port
+
+        self._app = aiohttp.web.Application()
+        self._app.router.add_post(f"{path_prefix}/{{task_id}}/{{trigger_id}}", self.handle)
+        self._runner: aiohttp.web.AppRunner | None = None
+
+    @property
+    def app(self) -> aiohttp.web.Application:
+        return self._app
+
+    async def start(self) -> None:
+        self._runner = aiohttp.web.AppRunner(self._app)
+        await self._runner.setup()
+        site = aiohttp.web.TCPSite(self._runner, host=self._host, port=self._port)
+        await site.start()
+        logger.info("Webhook server is listening on %s:%s", self._host, self._port)
+
+    async def dispose(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _get_task_trigger(
+        self,
+        task_id: str,
+        trigger_id: str,
+    ) -> tuple[task_base.BaseTaskConfig, task_base.BaseTriggerConfig] | None:
+        config = await self._config_repository.get_config()
+        for task in config.tasks:
+            if task.id != task_id:
+                continue
+            for trigger in task.triggers:
+                if trigger.id == trigger_id:
+                    return task, trigger
+
+        return None
+
+    async def handle(self, request: aiohttp.web.Request) -> aiohttp.web.Response:
+        task_id = request.match_info["task_id"]
+        trigger_id = request.match_info["trigger_id"]
+
+        task_trigger = await self._get_task_trigger(task_id=task_id, trigger_id=trigger_id)
+        if task_trigger is None:
+            logger.warning("Webhook delivery for unknown Trigger(%s/%s)", task_id, trigger_id)
+            return aiohttp.web.json_response({"error": "Unknown trigger"}, status=404)
+        task, trigger = task_trigger
+
+        body = await request.read()
+        try:
+            self._trigger_processor_factory.verify_webhook(config=trigger, headers=request.headers, body=body)
+        except task_base.TriggerProcessorProtocol.WebhookNotSupportedError:
+            logger.warning("Trigger(%s/%s) does not accept webhook deliveries", task_id, trigger_id)
+            return aiohttp.web.json_response({"error": "Webhooks are not supported"}, status=404)
+        except task_base.TriggerProcessorProtocol.WebhookSignatureError:
+            logger.warning("Webhook delivery for Trigger(%s/%s) has invalid signature", task_id, trigger_id)
+            return aiohttp.web.json_response({"error": "Invalid signature"}, status=401)
+
+        # GitHub gives up on deliveries not answered in 10 seconds, so full topic is reported instead of waited for
+        if self._queue_repository.is_topic_paused(topic=task_repositories.JobTopic.EVENT):
+            logger.warning("Event topic is full, webhook delivery for Trigger(%s/%s) is rejected", task_id, trigger_id)
+            return aiohttp.web.json_response({"error": "Event topic is full"}, status=503)
+
+        state = await self._state_repository.get_state(path=f"tasks/{task_id}/triggers/{trigger_id}")
+        trigger_processor = self._trigger_processor_factory.create(
+            config=trigger,
+            state=state,
+            state_repository=self._state_repository,
+        )
+        try:
+            events = await trigger_processor.process_webhook(headers=request.headers, body=body)
+
+            event_jobs = [
+                task_jobs.EventJob(
+                    id=f"{task_id}/{trigger_id}/{action.id}/{event.id}",
+                    event=event,
+                    action=action,
+                )
+                for event in events
+                for action in task.actions
+            ]
+            try:
+                await self._queue_repository.push_many(
+                    topic=task_repositories.JobTopic.EVENT,
+                    items=event_jobs,
+                    wait_for_capacity=False,
+                )
+            except task_repositories.QueueRepositoryProtocol.TopicClosed:
+                logger.warning(
+                    "Event topic is closed, webhook delivery for Trigger(%s/%s) is rejected", task_id, trigger_id
+                )
+                return aiohttp.web.json_response({"error": "Event topic is closed"}, status=503)
+            for event_job in event_jobs:
+                logger.info("EventJob(%s) was spawned from webhook delivery", event_job.id)
+
+            # Recorded only once queued, so rejected deliveries are still picked up by reconciliation polls
+            await trigger_processor.confirm_webhook_events(events)
+        finally:
+            await trigger_processor.dispose()
+
+        return aiohttp.web.json_response({"events": len(events)}, status=202)
+
+
+__all__ = [
+    "WebhookServer",
+]
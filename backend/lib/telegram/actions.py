@@ -1,4 +1,6 @@
+import asyncio
 import dataclasses
+import functools
 import logging
 import typing
 
@@ -15,37 +17,173 @@ def trim_string(s: str, max_length: int) -> str:
     return s[:max_length] + "..." if len(s) > max_length else s
 
 
+class TelegramSharedResources(task_base.SharedResources):
+    """
+    Session and rate limiters shared by all telegram processors, so connections to the Bot API are reused.
+    Rate limiters are kept per bot token, as Telegram limits are per bot.
+    """
+
+    def __init__(self):
+        self._aiohttp_client: aiohttp.ClientSession | None = None
+        self._rate_limiters: dict[str, telegram_clients.TelegramRateLimiter] = {}
+
+    # Session is created lazily, as it has to be bound to the running event loop
+    def get_aiohttp_client(self) -> aiohttp.ClientSession:
+        if self._aiohttp_client is None or self._aiohttp_client.closed:
+            self._aiohttp_client = aiohttp.ClientSession()
+        return self._aiohttp_client
+
+    def get_rate_limiter(self, token: str) -> telegram_clients.TelegramRateLimiter:
+        if token not in self._rate_limiters:
+            self._rate_limiters[token] = telegram_clients.TelegramRateLimiter()
+        return self._rate_limiters[token]
+
+    async def dispose(self) -> None:
+        self._rate_limiters.clear()
+        if self._aiohttp_client is not None:
+            await self._aiohttp_client.close()
+            self._aiohttp_client = None
+
+
 class TelegramWebhookActionConfig(task_base.BaseActionConfig):
     chat_id_secret: pydantic_utils.TypedAnnotation[task_base.BaseSecretConfig]
     token_secret: pydantic_utils.TypedAnnotation[task_base.BaseSecretConfig]
     max_message_title_length: int = 100
     max_message_body_length: int = 500
+    digest_window_seconds: float = 0  # 0 disables digest mode
+    digest_separator: str = "\n\n"
+
+
+# https://core.telegram.org/bots/api#sendmessage
+MAX_MESSAGE_LENGTH = 4096
 
 
 @dataclasses.dataclass(frozen=True)
-class TelegramWebhookProcessor(task_base.BaseActionProcessor[TelegramWebhookActionConfig]):
+class _PendingMessage:
+    text: str
+    future: asyncio.Future[None]
+
+
+class _DigestBatcher:
+    """
+    Coalesces messages issued within `delay` seconds into digests of up to `max_length` characters.
+    Digests are split between messages only, longer message is sent on its own as is.
+    """
+
+    def __init__(
+        self,
+        send: typing.Callable[[str], typing.Awaitable[None]],
+        delay: float,
+        separator: str,
+        max_length: int = MAX_MESSAGE_LENGTH,
+    ):
+        self._send = send
+        self._delay = delay
+        self._separator = separator
+        self._max_length = max_length
+
+        self._pending: list[_PendingMessage] = []
+        self._pending_length = 0
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def send(self, text: str) -> None:
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+
+        if self._pending and self._pending_length + len(self._separator) + len(text) > self._max_length:
+            self._flush()
+
+        self._pending_length += len(text) + (len(self._separator) if self._pending else 0)
+        self._pending.append(_PendingMessage(text=text, future=future))
+
+        if self._pending_length >= self._max_length:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._delay, self._flush)
+
+        await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch = self._pending
+        self._pending = []
+        self._pending_length = 0
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._send_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(self, batch: list[_PendingMessage]) -> None:
+        logger.debug("Sending digest of %s messages", len(batch))
+        try:
+            await self._send(self._separator.join(item.text for item in batch))
+        except Exception as exc:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+        else:
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_result(None)
+        finally:
+            for item in batch:
+                if not item.future.done():
+                    item.future.cancel()
+
+    async def dispose(self) -> None:
+        # Pending messages are sent rather than dropped, their events are already consumed by waiting processors
+        self._flush()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+@dataclasses.dataclass(frozen=True)
+class TelegramWebhookProcessor(task_base.BaseActionProcessor[TelegramWebhookActionConfig, TelegramSharedResources]):
     config: TelegramWebhookActionConfig
     aiohttp_client: aiohttp.ClientSession
     telegram_client: telegram_clients.RestTelegramClient
+    digest_batcher: _DigestBatcher | None = None
 
     async def dispose(self) -> None:
-        await self.aiohttp_client.close()
+        if self.digest_batcher is not None:
+            await self.digest_batcher.dispose()
+
+    @classmethod
+    def create_shared(cls) -> TelegramSharedResources:
+        return TelegramSharedResources()
 
+    # Session is shared by all processors, so it is disposed with the shared resources instead of per processor
     @classmethod
     def from_config(
         cls,
         config: TelegramWebhookActionConfig,
+        shared: TelegramSharedResources,
     ) -> typing.Self:
-        aiohttp_client = aiohttp.ClientSession()
+        aiohttp_client = shared.get_aiohttp_client()
         telegram_client = telegram_clients.RestTelegramClient(
             token=config.token_secret.value,
             aiohttp_client=aiohttp_client,
+            rate_limiter=shared.get_rate_limiter(config.token_secret.value),
         )
 
+        digest_batcher: _DigestBatcher | None = None
+        if config.digest_window_seconds > 0:
+            digest_batcher = _DigestBatcher(
+                send=functools.partial(cls._send_message, telegram_client, config),
+                delay=config.digest_window_seconds,
+                separator=config.digest_separator,
+            )
+
         return cls(
             config=config,
             aiohttp_client=aiohttp_client,
             telegram_client=telegram_client,
+            digest_batcher=digest_batcher,
         )
 
     def _format_message(self, event: task_base.Event) -> str:
@@ -55,15 +193,26 @@ class TelegramWebhookProcessor(task_base.BaseActionProcessor[TelegramWebhookActi
             f"\n{event.url}"
         )
 
-    async def process(self, event: task_base.Event) -> None:
-        text = self._format_message(event)
-        await self.telegram_client.send_message(
+    @staticmethod
+    async def _send_message(
+        telegram_client: telegram_clients.RestTelegramClient,
+        config: TelegramWebhookActionConfig,
+        text: str,
+    ) -> None:
+        await telegram_client.send_message(
             request=telegram_clients.SendMessageRequest(
-                chat_id=self.config.chat_id_secret.value,
+                chat_id=config.chat_id_secret.value,
                 text=text,
             ),
         )
 
+    async def process(self, event: task_base.Event) -> None:
+        text = self._format_message(event)
+        if self.digest_batcher is not None:
+            await self.digest_batcher.send(text)
+        else:
+            await self._send_message(self.telegram_client, self.config, text)
+
 
 def register_default_plugins() -> None:
     logger.info("Registering default telegram actions plugins")
@@ -76,6 +225,7 @@ def register_default_plugins() -> None:
 
 __all__ = [
     "TelegramWebhookActionConfig",
+    "TelegramSharedResources",
     "TelegramWebhookProcessor",
     "register_default_plugins",
 ]
@@ -1,8 +1,21 @@
+import asyncio
 import dataclasses
+import logging
 
 import aiohttp
 import aiohttp.typedefs as aiohttp_typedefs
 
+import lib.utils.asyncio as asyncio_utils
+
+logger = logging.getLogger(__name__)
+
+# https://core.telegram.org/bots/faq#my-bot-is-hitting-limits-how-do-i-avoid-this
+DEFAULT_BOT_RATE = 30  # messages per second
+DEFAULT_CHAT_RATE = 1  # message per second
+DEFAULT_GROUP_RATE = 20 / 60  # 20 messages per minute
+DEFAULT_RETRY_AFTER = 1
+DEFAULT_MAX_RATE_LIMIT_RETRIES = 5
+
 
 @dataclasses.dataclass(frozen=True)
 class SendMessageRequest:
@@ -29,24 +42,90 @@ class SendMessageRequest:
         }
 
 
+def _is_group_chat(chat_id: str) -> bool:
+    # Groups, supergroups and channels have negative ids or are addressed by @username
+    return chat_id.startswith("-") or chat_id.startswith("@")
+
+
+class TelegramRateLimiter:
+    """
+    Limits messages of a single bot token per bot and per chat, so bursts are sent at the maximum allowed rate.
+    """
+
+    def __init__(
+        self,
+        bot_rate: float = DEFAULT_BOT_RATE,
+        chat_rate: float = DEFAULT_CHAT_RATE,
+        group_rate: float = DEFAULT_GROUP_RATE,
+    ):
+        self._bot_bucket = asyncio_utils.TokenBucket(rate=bot_rate, capacity=bot_rate)
+        self._chat_rate = chat_rate
+        self._group_rate = group_rate
+
+        self._chat_buckets: dict[str, list[asyncio_utils.TokenBucket]] = {}
+
+    def _get_chat_buckets(self, chat_id: str) -> list[asyncio_utils.TokenBucket]:
+        if chat_id not in self._chat_buckets:
+            buckets = [asyncio_utils.TokenBucket(rate=self._chat_rate)]
+            if _is_group_chat(chat_id):
+                buckets.append(asyncio_utils.TokenBucket(rate=self._group_rate, capacity=self._group_rate * 60))
+            self._chat_buckets[chat_id] = buckets
+        return self._chat_buckets[chat_id]
+
+    async def acquire(self, chat_id: str) -> None:
+        # Bot token is taken only once the chat allows sending, so slow chats don't hold back other chats
+        delay = max(bucket.reserve() for bucket in self._get_chat_buckets(chat_id))
+        if delay > 0:
+            logger.debug("Delaying message to Chat(%s) for %.1f seconds", chat_id, delay)
+            await asyncio.sleep(delay)
+
+        await self._bot_bucket.acquire()
+
+    def block(self, chat_id: str, retry_after: float) -> None:
+        logger.warning("Telegram rate limit of Chat(%s) has been hit, blocking for %s seconds", chat_id, retry_after)
+        for bucket in self._get_chat_buckets(chat_id):
+            bucket.block(retry_after)
+
+
+# https://core.telegram.org/bots/api#responseparameters
+async def _get_retry_after(response: aiohttp.ClientResponse) -> float:
+    try:
+        body = await response.json(content_type=None)
+        return float(body["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError, aiohttp.ContentTypeError):
+        return float(response.headers.get("Retry-After", DEFAULT_RETRY_AFTER))
+
+
 @dataclasses.dataclass(frozen=True)
 class RestTelegramClient:
     aiohttp_client: aiohttp.ClientSession
     token: str
+    rate_limiter: TelegramRateLimiter = dataclasses.field(default_factory=TelegramRateLimiter)
+    max_rate_limit_retries: int = DEFAULT_MAX_RATE_LIMIT_RETRIES
 
     def _prepare_url(self, path: str) -> str:
         return f"https://api.telegram.org/bot{self.token}{path}"
 
     async def send_message(self, request: SendMessageRequest) -> None:
-        async with self.aiohttp_client.request(
-            method=request.method,
-            url=self._prepare_url(request.path),
-            params=request.params,
-        ) as response:
-            response.raise_for_status()
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire(chat_id=request.chat_id)
+            async with self.aiohttp_client.request(
+                method=request.method,
+                url=self._prepare_url(request.path),
+                params=request.params,
+            ) as response:
+                if response.status == 429 and attempt < self.max_rate_limit_retries:
+                    self.rate_limiter.block(chat_id=request.chat_id, retry_after=await _get_retry_after(response))
+                    attempt += 1
+                    continue
+
+                response.raise_for_status()
+                return
 
 
 __all__ = [
     "RestTelegramClient",
     "SendMessageRequest",
+    "TelegramRateLimiter",
 ]
@@ -3,6 +3,7 @@ import contextlib
 import fcntl
 import os
 import pathlib
+import time
 import typing
 
 
@@ -37,7 +38,97 @@ async def acquire_file_lock(path: str) -> typing.AsyncIterator[None]:
         os.remove(path)
 
 
+async def bounded_merge[T](
+    iterators: typing.Iterable[typing.AsyncIterator[T]],
+    limit: int,
+    semaphores: typing.Sequence[asyncio.Semaphore] = (),
+) -> typing.AsyncGenerator[T, None]:
+    """
+    Merges async iterators, consuming at most `limit` of them at once in the given order.
+    While consumed, an iterator also holds every semaphore from `semaphores`, so limits can be shared between merges.
+    An iterator is resumed only after its previous item has been consumed, so it can safely update state after yield.
+    """
+    source = iter(iterators)
+    queue: asyncio.Queue[tuple[T, asyncio.Future[None]] | Exception | None] = asyncio.Queue()
+
+    async def worker() -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            for iterator in source:
+                async with contextlib.AsyncExitStack() as stack:
+                    for semaphore in semaphores:
+                        await stack.enter_async_context(semaphore)
+                    async for item in iterator:
+                        consumed = loop.create_future()
+                        await queue.put((item, consumed))
+                        await consumed
+        except Exception as exc:
+            await queue.put(exc)
+        else:
+            await queue.put(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(limit)]
+    running = len(workers)
+    try:
+        while running > 0:
+            result = await queue.get()
+            if result is None:
+                running -= 1
+            elif isinstance(result, Exception):
+                raise result
+            else:
+                item, consumed = result
+                yield item
+                consumed.set_result(None)
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+class TokenBucket:
+    """
+    Allows `rate` acquisitions per second on average with bursts of up to `capacity`.
+    Waiting acquisitions reserve tokens in advance, so they are served in order.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self._rate = rate
+        self._capacity = capacity
+
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        """
+        Takes a token and returns delay in seconds until it is available.
+        """
+        self._refill()
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self._rate)
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def block(self, delay: float) -> None:
+        """
+        Makes no tokens available for at least `delay` seconds.
+        """
+        self._refill()
+        # The next reservation takes the last token and waits exactly `delay`
+        self._tokens = min(self._tokens, 1 - delay * self._rate)
+
+
 __all__ = [
     "TimeoutTimer",
+    "TokenBucket",
     "acquire_file_lock",
+    "bounded_merge",
 ]
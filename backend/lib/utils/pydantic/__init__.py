@@ -1,3 +1,4 @@
 from .base import *
 from .ids import *
+from .lazy import *
 from .settings import *
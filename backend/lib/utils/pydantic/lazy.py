@@ -0,0 +1,76 @@
+import collections.abc
+import itertools
+import typing
+
+import pydantic
+import pydantic_core.core_schema as pydantic_core_schema
+
+
+class LazyModelDict[ModelT: pydantic.BaseModel](collections.abc.MutableMapping[str, ModelT]):
+    """
+    Dict of models validated on first access, untouched entries are serialized back as is.
+    Accessed entries are treated as changed, as models are mutable.
+    """
+
+    def __init__(self, model_class: type[ModelT], raw: typing.Mapping[str, typing.Any] | None = None):
+        self._model_class = model_class
+        self._raw: dict[str, typing.Any] = dict(raw or {})
+        self._parsed: dict[str, ModelT] = {}
+
+    def __getitem__(self, key: str) -> ModelT:
+        if key not in self._parsed:
+            # Entry is kept raw until validated, so invalid entries are not dropped on dump
+            self._parsed[key] = self._model_class.model_validate(self._raw[key])
+            del self._raw[key]
+        return self._parsed[key]
+
+    def __setitem__(self, key: str, value: ModelT) -> None:
+        self._raw.pop(key, None)
+        self._parsed[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in self._parsed:
+            del self._parsed[key]
+        else:
+            del self._raw[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._parsed or key in self._raw
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return itertools.chain(list(self._parsed), list(self._raw))
+
+    def __len__(self) -> int:
+        return len(self._parsed) + len(self._raw)
+
+    def to_raw(self) -> dict[str, typing.Any]:
+        return {
+            **self._raw,
+            **{key: value.model_dump(mode="json") for key, value in self._parsed.items()},
+        }
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls,
+        source_type: typing.Any,
+        handler: pydantic.GetCoreSchemaHandler,
+    ) -> pydantic_core_schema.CoreSchema:
+        (model_class,) = typing.get_args(source_type)
+
+        def validate(value: typing.Any) -> LazyModelDict[typing.Any]:
+            if isinstance(value, LazyModelDict):
+                return value  # pyright: ignore[reportUnknownVariableType]
+            if not isinstance(value, collections.abc.Mapping):
+                raise ValueError("Value must be a mapping")
+
+            return cls(model_class, value)  # pyright: ignore[reportUnknownArgumentType]
+
+        return pydantic_core_schema.no_info_plain_validator_function(
+            validate,
+            serialization=pydantic_core_schema.plain_serializer_function_ser_schema(lambda value: value.to_raw()),
+        )
+
+
+__all__ = [
+    "LazyModelDict",
+]
@@ -1,9 +1,17 @@
-import pytest
+import typing
+
+import pytest_asyncio
 
 import lib.github.clients as github_clients
 import tests.settings as test_settings
 
 
-@pytest.fixture(name="github_gql_client")
-def github_gql_client_fixture(settings: test_settings.Settings) -> github_clients.GqlGithubClient:
-    return github_clients.GqlGithubClient(token=settings.github_token)
+@pytest_asyncio.fixture(name="github_gql_client")
+async def github_gql_client_fixture(
+    settings: test_settings.Settings,
+) -> typing.AsyncGenerator[github_clients.GqlGithubClient, None]:
+    client = github_clients.GqlGithubClient.from_token(settings.github_token)
+    try:
+        yield client
+    finally:
+        await client.dispose()
@@ -8,7 +8,7 @@ import lib.github.clients as github_clients
 @pytest.mark.asyncio
 async def test_default(github_gql_client: github_clients.GqlGithubClient):
     """Test getting issues from a repository with default parameters."""
-    issues = await github_gql_client.get_repository_issues(
+    iterator = github_gql_client.get_repository_issues(
         request=github_clients.GetRepositoryIssuesRequest(
             owner="python",
             repository="cpython",
@@ -17,8 +17,7 @@ async def test_default(github_gql_client: github_clients.GqlGithubClient):
         ),
     )
 
-    assert len(issues) == 1
-    issue = issues[0]
+    issue = await anext(iterator)
     assert issue.id == "I_kwDOBN0Z8c6kzGKa"
     assert issue.author == "paulie4"
     assert issue.url == "https://github.com/python/cpython/issues/128388"
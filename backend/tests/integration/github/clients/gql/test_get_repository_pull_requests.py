@@ -7,7 +7,7 @@ import lib.github.clients as github_clients
 
 @pytest.mark.asyncio
 async def test__default(github_gql_client: github_clients.GqlGithubClient):
-    pull_requests = await github_gql_client.get_repository_pull_requests(
+    iterator = github_gql_client.get_repository_pull_requests(
         request=github_clients.GetRepositoryPRsRequest(
             owner="python",
             repository="cpython",
@@ -16,8 +16,7 @@ async def test__default(github_gql_client: github_clients.GqlGithubClient):
         ),
     )
 
-    assert len(pull_requests) == 1
-    pull_request = pull_requests[0]
+    pull_request = await anext(iterator)
     assert pull_request.id == "PR_kwDOBN0Z8c6GhTCQ"
     assert pull_request.author == "paulie4"
     assert pull_request.url == "https://github.com/python/cpython/pull/128389"
@@ -0,0 +1,69 @@
+import lib.github.clients as github_clients
+
+
+def test_make_key_ignores_params_order():
+    assert github_clients.ETagCache.make_key("GET", "url", {"a": 1, "b": 2}) == github_clients.ETagCache.make_key(
+        "GET", "url", {"b": 2, "a": 1}
+    )
+
+
+def test_get_set():
+    cache = github_clients.ETagCache()
+
+    cache.set("key", etag='"etag"', body={"data": 1})
+
+    entry = cache.get("key")
+    assert entry is not None
+    assert entry.etag == '"etag"'
+    assert entry.body == {"data": 1}
+    assert cache.get("other") is None
+
+
+def test_lru_eviction():
+    cache = github_clients.ETagCache(max_size=2)
+
+    cache.set("first", etag="1", body=1)
+    cache.set("second", etag="2", body=2)
+    cache.get("first")
+    cache.set("third", etag="3", body=3)
+
+    assert len(cache) == 2
+    assert cache.get("first") is not None
+    assert cache.get("second") is None
+    assert cache.get("third") is not None
+
+
+def test_raw_round_trip():
+    cache = github_clients.ETagCache()
+    cache.set("key", etag="1", body=[1, 2])
+
+    restored = github_clients.ETagCache()
+    restored.load_raw(cache.to_raw())
+
+    entry = restored.get("key")
+    assert entry is not None
+    assert entry.body == [1, 2]
+
+
+def test_bytes_eviction():
+    cache = github_clients.ETagCache(max_bytes=10)
+
+    cache.set("first", etag="1", body="first", size=4)
+    cache.set("second", etag="2", body="second", size=4)
+    cache.set("first", etag="1", body="first", size=4)
+    cache.set("third", etag="3", body="third", size=4)
+
+    assert cache.bytes == 8
+    assert cache.get("first") is not None
+    assert cache.get("second") is None
+    assert cache.get("third") is not None
+
+
+def test_oversized_entry_is_skipped():
+    cache = github_clients.ETagCache(max_bytes=10)
+    cache.set("key", etag="1", body="small", size=4)
+
+    cache.set("key", etag="2", body=list(range(100)))
+
+    assert len(cache) == 0
+    assert cache.bytes == 0
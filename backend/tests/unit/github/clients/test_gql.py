@@ -0,0 +1,374 @@
+import asyncio
+import dataclasses
+import datetime
+import typing
+
+import gql.transport.exceptions as gql_exceptions
+import graphql
+import pytest
+import pytest_mock
+
+import lib.github.clients.gql as gql_clients
+
+
+def test_get_repositories_activity_response_skips_removed_repositories():
+    response = gql_clients.GetRepositoriesActivityResponse.model_validate(
+        {
+            "nodes": [
+                {
+                    "id": "R_1",
+                    "name": "repository",
+                    "pushedAt": "2024-01-01T00:00:00Z",
+                    "updatedAt": "2024-01-02T00:00:00Z",
+                    "isArchived": False,
+                    "issues": {"totalCount": 3},
+                    "pullRequests": {"totalCount": 5},
+                },
+                None,
+            ],
+        }
+    )
+
+    [activity] = response.to_dataclass()
+    assert activity.id == "R_1"
+    assert activity.name == "repository"
+    assert activity.pushed_at == datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+    assert activity.issue_count == 3
+    assert activity.pull_request_count == 5
+
+
+def _create_activity_node(repository_id: str) -> dict[str, typing.Any]:
+    return {
+        "id": repository_id,
+        "name": repository_id,
+        "pushedAt": None,
+        "updatedAt": "2024-01-01T00:00:00Z",
+        "isArchived": False,
+        "issues": {"totalCount": 0},
+        "pullRequests": {"totalCount": 0},
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error_type, expected_ids",
+    [
+        ("NOT_FOUND", ["R_1"]),
+        ("FORBIDDEN", None),
+    ],
+)
+async def test_get_repositories_activity_skips_not_found_nodes(
+    mocker: pytest_mock.MockerFixture,
+    error_type: str,
+    expected_ids: list[str] | None,
+):
+    errors = [{"type": error_type, "path": ["nodes", 1], "message": "Could not resolve to a node"}]
+    client = gql_clients.GqlGithubClient(token="token")
+    mocker.patch.object(
+        client,
+        "_execute",
+        side_effect=gql_exceptions.TransportQueryError(
+            str(errors),
+            errors=errors,
+            data={"nodes": [_create_activity_node("R_1"), None]},
+        ),
+    )
+    request = gql_clients.GetRepositoriesActivityRequest(ids=("R_1", "R_2"))
+
+    if expected_ids is None:
+        with pytest.raises(gql_exceptions.TransportQueryError):
+            await client.get_repositories_activity(request)
+    else:
+        activities = await client.get_repositories_activity(request)
+        assert [activity.id for activity in activities] == expected_ids
+
+
+def test_get_repositories_request_pushed_after():
+    request = gql_clients.GetRepositoriesRequest(
+        owner="owner",
+        pushed_after=datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+    )
+
+    assert request.params["query"] == "org:owner pushed:>2024-01-01T00:00:00+00:00"
+
+
+def _create_issues_request(repository: str) -> gql_clients.GetRepositoryIssuesRequest:
+    return gql_clients.GetRepositoryIssuesRequest(
+        owner="owner",
+        repository=repository,
+        created_after=datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+    )
+
+
+def _search_result(repository: str) -> dict[str, typing.Any]:
+    return {"nodes": [{"repository": repository}], "pageInfo": {"endCursor": None, "hasNextPage": False}}
+
+
+class _Execute:
+    def __init__(self, errors: list[dict[str, typing.Any]] | None = None):
+        self.calls: list[dict[str, typing.Any]] = []
+        self._errors = errors
+
+    async def __call__(self, document: graphql.DocumentNode, params: dict[str, typing.Any]) -> typing.Any:
+        self.calls.append(params)
+        size = len([key for key in params if key.startswith("query")])
+        data = {f"search{index}": _search_result(params[f"query{index}"]) for index in range(size)}
+        if self._errors is None:
+            return data
+
+        for error in self._errors:
+            data[error["path"][0]] = None
+        raise gql_exceptions.TransportQueryError(str(self._errors), errors=self._errors, data=data)
+
+
+def test_build_batch_search_document():
+    document = gql_clients.GetRepositoryIssuesRequest.batch_document(2)
+    [operation] = [
+        definition for definition in document.definitions if isinstance(definition, graphql.OperationDefinitionNode)
+    ]
+
+    assert [variable.variable.name.value for variable in operation.variable_definitions] == [
+        "limit",
+        "query0",
+        "after0",
+        "query1",
+        "after1",
+    ]
+    assert [
+        selection.alias.value if selection.alias is not None else None
+        for selection in operation.selection_set.selections
+        if isinstance(selection, graphql.FieldNode)
+    ] == ["search0", "search1"]
+    assert {
+        definition.name.value
+        for definition in document.definitions
+        if isinstance(definition, graphql.FragmentDefinitionNode)
+    } == {"issueFields", "rateLimitFields"}
+    assert gql_clients.GetRepositoryIssuesRequest.batch_document(2) is document
+
+
+@pytest.mark.asyncio
+async def test_search_batcher_flushes_full_batch():
+    execute = _Execute()
+    batcher = gql_clients._SearchBatcher(execute=execute, max_size=2, delay=60)  # pyright: ignore[reportPrivateUsage]
+
+    requests = [_create_issues_request("first"), _create_issues_request("second")]
+    async with asyncio.timeout(1):
+        results = await asyncio.gather(*(batcher.search(request) for request in requests))
+
+    assert len(execute.calls) == 1
+    assert [result["search"] for result in results] == [_search_result(request.query) for request in requests]
+    await batcher.dispose()
+
+
+@pytest.mark.asyncio
+async def test_search_batcher_flushes_on_delay():
+    execute = _Execute()
+    batcher = gql_clients._SearchBatcher(
+        execute=execute, max_size=10, delay=0.01
+    )  # pyright: ignore[reportPrivateUsage]
+
+    request = _create_issues_request("first")
+    async with asyncio.timeout(1):
+        result = await batcher.search(request)
+
+    assert execute.calls == [{"limit": request.limit, "query0": request.query, "after0": None}]
+    assert result["search"] == _search_result(request.query)
+    await batcher.dispose()
+
+
+@pytest.mark.asyncio
+async def test_search_batcher_partial_errors():
+    execute = _Execute(errors=[{"message": "Not found", "path": ["search1"]}])
+    batcher = gql_clients._SearchBatcher(execute=execute, max_size=2, delay=60)  # pyright: ignore[reportPrivateUsage]
+
+    requests = [_create_issues_request("first"), _create_issues_request("second")]
+    first, second = await asyncio.gather(*(batcher.search(request) for request in requests), return_exceptions=True)
+
+    assert first == {"search": _search_result(requests[0].query)}
+    assert isinstance(second, gql_exceptions.TransportQueryError)
+    assert second.errors == [{"message": "Not found", "path": ["search1"]}]
+    await batcher.dispose()
+
+
+@pytest.mark.asyncio
+async def test_search_batcher_skips_cancelled_searches():
+    execute = _Execute()
+    batcher = gql_clients._SearchBatcher(
+        execute=execute, max_size=10, delay=0.01
+    )  # pyright: ignore[reportPrivateUsage]
+
+    cancelled = asyncio.create_task(batcher.search(_create_issues_request("cancelled")))
+    request = _create_issues_request("first")
+    search = asyncio.create_task(batcher.search(request))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+
+    async with asyncio.timeout(1):
+        await search
+    assert execute.calls == [{"limit": request.limit, "query0": request.query, "after0": None}]
+    await batcher.dispose()
+
+
+@pytest.mark.asyncio
+async def test_search_batcher_dispose_cancels_pending_searches():
+    execute = _Execute()
+    batcher = gql_clients._SearchBatcher(execute=execute, max_size=10, delay=60)  # pyright: ignore[reportPrivateUsage]
+
+    search = asyncio.create_task(batcher.search(_create_issues_request("first")))
+    await asyncio.sleep(0)
+    await batcher.dispose()
+
+    with pytest.raises(asyncio.CancelledError):
+        await search
+    assert execute.calls == []
+
+
+def _issue(issue_id: str, created_at: datetime.datetime) -> dict[str, typing.Any]:
+    return {
+        "id": issue_id,
+        "url": f"https://github.com/owner/repository/issues/{issue_id}",
+        "title": issue_id,
+        "body": "",
+        "createdAt": created_at.isoformat(),
+        "author": None,
+    }
+
+
+class _SearchServer:
+    """
+    Serves issues sorted by creation time, paginated by cursor and capped at SEARCH_RESULTS_LIMIT like GitHub search.
+    """
+
+    def __init__(self, issues: list[dict[str, typing.Any]]):
+        self.issues = issues
+        self.queries: list[str] = []
+
+    async def __call__(self, document: graphql.DocumentNode, params: dict[str, typing.Any]) -> typing.Any:
+        self.queries.append(params["query"])
+        created_query = next(part for part in params["query"].split() if part.startswith("created:"))
+        if created_query.startswith("created:>="):
+            created_after = datetime.datetime.fromisoformat(created_query.removeprefix("created:>="))
+            matched = [
+                issue for issue in self.issues if datetime.datetime.fromisoformat(issue["createdAt"]) >= created_after
+            ]
+        else:
+            created_after = datetime.datetime.fromisoformat(created_query.removeprefix("created:>"))
+            matched = [
+                issue for issue in self.issues if datetime.datetime.fromisoformat(issue["createdAt"]) > created_after
+            ]
+        issue_count = len(matched)
+        matched = matched[: gql_clients.SEARCH_RESULTS_LIMIT]
+
+        start = int(params["after"] or 0)
+        end = start + params["limit"]
+        return {
+            "search": {
+                "issueCount": issue_count,
+                "nodes": matched[start:end],
+                "pageInfo": {"endCursor": str(end), "hasNextPage": end < len(matched)},
+            },
+        }
+
+
+@pytest.mark.asyncio
+async def test_get_repository_issues_paginates_by_cursor(mocker: pytest_mock.MockerFixture):
+    created_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+    server = _SearchServer(
+        [_issue(f"issue_{index}", created_at + datetime.timedelta(minutes=index + 1)) for index in range(5)]
+    )
+    client = gql_clients.GqlGithubClient(token="token")
+    mocker.patch.object(client, "_execute", server)
+
+    request = dataclasses.replace(_create_issues_request("repository"), limit=2)
+    issues = [issue async for issue in client.get_repository_issues(request)]
+
+    assert [issue.id for issue in issues] == [f"issue_{index}" for index in range(5)]
+    assert len(server.queries) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_repository_issues_restarts_at_results_limit(mocker: pytest_mock.MockerFixture):
+    mocker.patch.object(gql_clients, "SEARCH_RESULTS_LIMIT", 3)
+    created_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+    server = _SearchServer(
+        [
+            _issue("issue_0", created_at + datetime.timedelta(minutes=1)),
+            _issue("issue_1", created_at + datetime.timedelta(minutes=2)),
+            # Issues created at the same time are split by the results limit
+            _issue("issue_2", created_at + datetime.timedelta(minutes=3)),
+            _issue("issue_3", created_at + datetime.timedelta(minutes=3)),
+            _issue("issue_4", created_at + datetime.timedelta(minutes=4)),
+        ]
+    )
+    client = gql_clients.GqlGithubClient(token="token")
+    mocker.patch.object(client, "_execute", server)
+
+    request = dataclasses.replace(_create_issues_request("repository"), limit=2)
+    issues = [issue async for issue in client.get_repository_issues(request)]
+
+    assert [issue.id for issue in issues] == [f"issue_{index}" for index in range(5)]
+    assert any("created:>=2024-01-01T00:03:00+00:00" in query for query in server.queries)
+
+
+@pytest.mark.asyncio
+async def test_get_repository_issues_does_not_restart_at_exact_results_limit(
+    mocker: pytest_mock.MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+):
+    mocker.patch.object(gql_clients, "SEARCH_RESULTS_LIMIT", 3)
+    created_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+    server = _SearchServer([_issue(f"issue_{index}", created_at + datetime.timedelta(minutes=1)) for index in range(3)])
+    client = gql_clients.GqlGithubClient(token="token")
+    mocker.patch.object(client, "_execute", server)
+
+    request = dataclasses.replace(_create_issues_request("repository"), limit=2)
+    issues = [issue async for issue in client.get_repository_issues(request)]
+
+    assert [issue.id for issue in issues] == [f"issue_{index}" for index in range(3)]
+    assert len(server.queries) == 2
+    assert "skipping the rest" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_get_repository_issues_warns_when_restart_overflows_at_single_timestamp(
+    mocker: pytest_mock.MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+):
+    mocker.patch.object(gql_clients, "SEARCH_RESULTS_LIMIT", 3)
+    created_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+    server = _SearchServer([_issue(f"issue_{index}", created_at + datetime.timedelta(minutes=1)) for index in range(4)])
+    client = gql_clients.GqlGithubClient(token="token")
+    mocker.patch.object(client, "_execute", server)
+
+    request = dataclasses.replace(_create_issues_request("repository"), limit=2)
+    issues = [issue async for issue in client.get_repository_issues(request)]
+
+    assert [issue.id for issue in issues] == [f"issue_{index}" for index in range(3)]
+    assert "More than 3 items created at" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "error, response_headers, expected",
+    [
+        (gql_exceptions.TransportServerError("Too Many Requests", 429), None, True),
+        (gql_exceptions.TransportServerError("Forbidden", 403), None, False),
+        (gql_exceptions.TransportServerError("Forbidden", 403), {"X-RateLimit-Remaining": "10"}, False),
+        (gql_exceptions.TransportServerError("Forbidden", 403), {"X-RateLimit-Remaining": "0"}, True),
+        (gql_exceptions.TransportServerError("Forbidden", 403), {"Retry-After": "60"}, True),
+        (gql_exceptions.TransportServerError("403, message='secondary rate limit'", 403), None, True),
+        (gql_exceptions.TransportServerError("Bad Gateway", 502), {"Retry-After": "60"}, False),
+        (gql_exceptions.TransportQueryError("error", errors=[{"type": "RATE_LIMITED"}]), None, True),
+        (gql_exceptions.TransportQueryError("error", errors=[{"type": "FORBIDDEN"}]), None, False),
+    ],
+)
+def test_is_rate_limited_error(
+    error: Exception,
+    response_headers: dict[str, str] | None,
+    expected: bool,
+):
+    is_rate_limited = gql_clients._is_rate_limited_error(  # pyright: ignore[reportPrivateUsage]
+        error,
+        response_headers,
+    )
+    assert is_rate_limited is expected
@@ -0,0 +1,25 @@
+import pytest
+
+import lib.github.clients as github_clients
+
+
+@pytest.mark.asyncio
+async def test_github_client_pool():
+    pool = github_clients.GithubClientPool()
+
+    rest_client = pool.get_rest_client(token="token")
+    gql_client = pool.get_gql_client(token="token")
+
+    assert pool.get_rest_client(token="token") is rest_client
+    assert pool.get_rest_client(token="other_token") is not rest_client
+    assert pool.get_gql_client(token="token") is gql_client
+    assert pool.get_gql_client(token="token", search_batch_size=20) is not gql_client
+    assert rest_client.rate_limit_governor is pool.get_rate_limit_governor(token="token")
+    assert rest_client.etag_cache is pool.get_etag_cache(token="token")
+    assert pool.get_rate_limit_governor(token="token") is not pool.get_rate_limit_governor(token="other_token")
+
+    await pool.dispose()
+
+    assert rest_client.aiohttp_client.closed
+    assert pool.get_rest_client(token="token") is not rest_client
+    await pool.dispose()
@@ -0,0 +1,79 @@
+import time
+
+import pytest
+import pytest_mock
+
+import lib.github.clients as github_clients
+
+
+def test_update_from_headers():
+    governor = github_clients.RateLimitGovernor()
+    reset_at = int(time.time()) + 60
+
+    governor.update_from_headers(
+        {
+            "X-RateLimit-Limit": "5000",
+            "X-RateLimit-Remaining": "4990",
+            "X-RateLimit-Reset": str(reset_at),
+            "X-RateLimit-Resource": "core",
+        },
+        default_resource="core",
+    )
+
+    [metrics] = governor.metrics
+    assert metrics.resource == "core"
+    assert metrics.limit == 5000
+    assert metrics.remaining == 4990
+    assert metrics.used == 10
+    assert metrics.reset_at is not None
+    assert metrics.reset_at.timestamp() == reset_at
+
+
+def test_update_from_graphql():
+    governor = github_clients.RateLimitGovernor()
+
+    governor.update_from_graphql({"limit": 5000, "cost": 1, "remaining": 4000, "resetAt": "2030-01-01T00:00:00Z"})
+
+    [metrics] = governor.metrics
+    assert metrics.resource == "graphql"
+    assert metrics.remaining == 4000
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_reset_when_exhausted(mocker: pytest_mock.MockerFixture):
+    sleep_mock = mocker.patch("asyncio.sleep")
+    governor = github_clients.RateLimitGovernor(reserve=10)
+    governor.update(resource="core", limit=5000, remaining=5, reset_at=time.time() + 30)
+
+    async with governor.acquire(resource="core"):
+        pass
+
+    sleep_mock.assert_called_once()
+    assert 0 < sleep_mock.call_args.args[0] <= 30
+
+
+@pytest.mark.asyncio
+async def test_acquire_does_not_wait_with_budget(mocker: pytest_mock.MockerFixture):
+    sleep_mock = mocker.patch("asyncio.sleep")
+    governor = github_clients.RateLimitGovernor(reserve=10)
+    governor.update(resource="core", limit=5000, remaining=100, reset_at=time.time() + 30)
+
+    async with governor.acquire(resource="core"):
+        pass
+
+    sleep_mock.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_after_block():
+    governor = github_clients.RateLimitGovernor()
+    governor.block(resource="graphql", retry_after=0.05)
+
+    [metrics] = governor.metrics
+    assert metrics.blocked_until is not None
+
+    started_at = time.monotonic()
+    async with governor.acquire(resource="graphql"):
+        pass
+
+    assert time.monotonic() - started_at >= 0.04
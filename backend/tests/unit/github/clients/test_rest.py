@@ -0,0 +1,195 @@
+import datetime
+import typing
+
+import pytest
+import pytest_mock
+
+import lib.github.clients as github_clients
+import lib.github.clients.rest as rest_clients
+
+
+def _create_response(page: int, count: int, total_count: int) -> rest_clients.GetRepositoryWorkflowRunsResponse:
+    return rest_clients.GetRepositoryWorkflowRunsResponse(
+        total_count=total_count,
+        workflow_runs=[
+            rest_clients.GetRepositoryWorkflowRunsResponse.WorkflowRun(
+                id=page * 100 + index,
+                name="test",
+                html_url="https://github.com",
+                status="completed",
+                conclusion="failure",
+                created_at=datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+            )
+            for index in range(count)
+        ],
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "total_count, expected_pages",
+    [
+        (0, [1]),
+        (2, [1]),
+        (3, [1, 2]),
+        (7, [1, 2, 3, 4]),
+    ],
+)
+async def test_get_repository_workflow_runs_pages(
+    mocker: pytest_mock.MockerFixture,
+    total_count: int,
+    expected_pages: list[int],
+):
+    per_page = 2
+    requested_pages: list[int] = []
+
+    async def get_page(request: github_clients.GetRepositoryWorkflowRunsRequest):
+        requested_pages.append(request.page)
+        count = max(0, min(per_page, total_count - (request.page - 1) * per_page))
+        return _create_response(page=request.page, count=count, total_count=total_count)
+
+    client = github_clients.RestGithubClient(aiohttp_client=mocker.Mock(), token="token")
+    mocker.patch.object(github_clients.RestGithubClient, "_get_repository_workflow_runs", side_effect=get_page)
+
+    workflow_runs = [
+        workflow_run
+        async for workflow_run in client.get_repository_workflow_runs(
+            github_clients.GetRepositoryWorkflowRunsRequest(
+                owner="owner",
+                repository="repository",
+                created_after=datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+                per_page=per_page,
+            )
+        )
+    ]
+
+    assert sorted(requested_pages) == expected_pages
+    assert len(workflow_runs) == total_count
+    assert [workflow_run.id for workflow_run in workflow_runs] == sorted(
+        workflow_run.id for workflow_run in workflow_runs
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "total_count, expected_pages, expected_id",
+    [
+        (0, [1], None),
+        (1, [1], 100),
+        (5, [1, 5], 500),
+        (2000, [1, 1000], 100000),
+    ],
+)
+async def test_get_oldest_repository_workflow_run(
+    mocker: pytest_mock.MockerFixture,
+    total_count: int,
+    expected_pages: list[int],
+    expected_id: int | None,
+):
+    requested_pages: list[int] = []
+
+    async def get_page(request: github_clients.GetRepositoryWorkflowRunsRequest):
+        requested_pages.append(request.page)
+        return _create_response(page=request.page, count=min(1, total_count), total_count=total_count)
+
+    client = github_clients.RestGithubClient(aiohttp_client=mocker.Mock(), token="token")
+    mocker.patch.object(github_clients.RestGithubClient, "_get_repository_workflow_runs", side_effect=get_page)
+
+    workflow_run = await client.get_oldest_repository_workflow_run(
+        github_clients.GetRepositoryWorkflowRunsRequest(
+            owner="owner",
+            repository="repository",
+            created_after=datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+            status="in_progress",
+        )
+    )
+
+    assert requested_pages == expected_pages
+    assert (workflow_run.id if workflow_run is not None else None) == expected_id
+
+
+@pytest.mark.parametrize("status", [None, "failure", "in_progress"])
+def test_get_repository_workflow_runs_request_status(status: str | None):
+    request = github_clients.GetRepositoryWorkflowRunsRequest(
+        owner="owner",
+        repository="repository",
+        created_after=datetime.datetime(2024, 1, 1),
+        status=status,
+    )
+
+    assert request.params.get("status") == status
+
+
+def _create_event(event_id: int, event_type: str = "IssuesEvent") -> dict[str, typing.Any]:
+    issue = {
+        "node_id": f"I_{event_id}",
+        "user": {"login": "user"},
+        "html_url": f"https://github.com/owner/repository/issues/{event_id}",
+        "title": "title",
+        "body": None,
+        "created_at": "2024-01-01T00:00:00Z",
+    }
+    return {
+        "id": str(event_id),
+        "type": event_type,
+        "repo": {"name": "owner/repository"},
+        "payload": {"action": "opened", "issue": issue, "pull_request": issue},
+        "created_at": "2024-01-01T00:00:00Z",
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "since_id, expected_ids, expected_pages, expected_is_complete",
+    [
+        (None, ["6", "5", "4", "3", "2", "1"], [1, 2, 3, 4], True),
+        ("4", ["6", "5"], [1, 2], True),
+        ("2", ["6", "5", "4", "3"], [1, 2, 3], True),
+        ("0", ["6", "5", "4", "3", "2", "1"], [1, 2, 3, 4], False),
+    ],
+)
+async def test_get_organization_events(
+    mocker: pytest_mock.MockerFixture,
+    since_id: str | None,
+    expected_ids: list[str],
+    expected_pages: list[int],
+    expected_is_complete: bool,
+):
+    per_page = 2
+    events = [_create_event(event_id) for event_id in range(6, 0, -1)]
+    requested_pages: list[int] = []
+
+    async def get_page(request: github_clients.GetOrganizationEventsRequest):
+        requested_pages.append(request.page)
+        start = (request.page - 1) * per_page
+        return events[start : start + per_page], {"X-Poll-Interval": "60"}
+
+    client = github_clients.RestGithubClient(aiohttp_client=mocker.Mock(), token="token")
+    mocker.patch.object(github_clients.RestGithubClient, "_request_with_headers", side_effect=get_page)
+
+    page = await client.get_organization_events(
+        github_clients.GetOrganizationEventsRequest(owner="owner", since_id=since_id, per_page=per_page),
+    )
+
+    assert [event.id for event in page.events] == expected_ids
+    assert requested_pages == expected_pages
+    assert page.is_complete == expected_is_complete
+    assert page.poll_interval == 60
+
+
+def test_get_organization_events_response():
+    response = rest_clients.GetOrganizationEventsResponse.model_validate(
+        [
+            _create_event(3, "IssuesEvent"),
+            _create_event(2, "PullRequestEvent"),
+            _create_event(1, "WatchEvent"),
+        ]
+    )
+
+    issue_event, pr_event, watch_event = response.to_dataclass()
+    assert issue_event.repository == "repository"
+    assert issue_event.issue is not None and issue_event.issue.body == ""
+    assert issue_event.pull_request is None
+    assert pr_event.issue is None
+    assert pr_event.pull_request is not None and pr_event.pull_request.id == "I_2"
+    assert watch_event.issue is None and watch_event.pull_request is None
@@ -0,0 +1,237 @@
+import asyncio
+import datetime
+import pathlib
+import typing
+
+import pytest
+import pytest_mock
+
+import lib.github.caches as github_caches
+import lib.github.clients as github_clients
+import lib.github.models as github_models
+import lib.task.repositories as task_repositories
+
+
+@pytest.fixture(name="client")
+def client_fixture(mocker: pytest_mock.MockerFixture) -> github_clients.RestGithubClient:
+    return github_clients.RestGithubClient(aiohttp_client=mocker.Mock(), token="token")
+
+
+def _mock_team_members(mocker: pytest_mock.MockerFixture, members: list[str]) -> list[str]:
+    requested_teams: list[str] = []
+
+    async def get_organization_team_members(
+        request: github_clients.GetOrganizationTeamMembersRequest,
+    ) -> typing.AsyncIterator[str]:
+        requested_teams.append(request.team_slug)
+        await asyncio.sleep(0)
+        for member in members:
+            yield member
+
+    mocker.patch.object(
+        github_clients.RestGithubClient,
+        "get_organization_team_members",
+        side_effect=get_organization_team_members,
+    )
+    return requested_teams
+
+
+@pytest.mark.asyncio
+async def test_team_members_cache_deduplicates_lookups(
+    mocker: pytest_mock.MockerFixture,
+    client: github_clients.RestGithubClient,
+):
+    requested_teams = _mock_team_members(mocker, members=["user1", "user2"])
+    cache = github_caches.TeamMembersCache()
+
+    results = await asyncio.gather(*(cache.get(client=client, owner="owner", team_slug="team") for _ in range(5)))
+    results.append(await cache.get(client=client, owner="owner", team_slug="team"))
+
+    assert requested_teams == ["team"]
+    assert all(result == {"user1", "user2"} for result in results)
+
+
+@pytest.mark.asyncio
+async def test_team_members_cache_expires(
+    mocker: pytest_mock.MockerFixture,
+    client: github_clients.RestGithubClient,
+):
+    requested_teams = _mock_team_members(mocker, members=["user1"])
+    cache = github_caches.TeamMembersCache(ttl=0)
+
+    await cache.get(client=client, owner="owner", team_slug="team")
+    await cache.get(client=client, owner="owner", team_slug="team")
+
+    assert requested_teams == ["team", "team"]
+
+
+def _mock_repositories(
+    mocker: pytest_mock.MockerFixture,
+    repositories: list[str],
+    ids: dict[str, str] | None = None,
+) -> tuple[github_clients.GqlGithubClient, list[github_clients.GetRepositoriesRequest]]:
+    requests: list[github_clients.GetRepositoriesRequest] = []
+
+    async def get_repositories(
+        request: github_clients.GetRepositoriesRequest,
+    ) -> typing.AsyncIterator[github_models.Repository]:
+        requests.append(request)
+        for repository in repositories:
+            repository_id = (ids or {}).get(repository, repository)
+            yield github_models.Repository(owner=request.owner, name=repository, id=repository_id)
+
+    client = mocker.Mock(spec=github_clients.GqlGithubClient)
+    client.get_repositories.side_effect = get_repositories
+    return client, requests
+
+
+@pytest.mark.asyncio
+async def test_repository_index_cache_refresh_and_update(mocker: pytest_mock.MockerFixture, tmp_path: pathlib.Path):
+    state_repository = task_repositories.LocalDirStateRepository(root_path=str(tmp_path))
+    client, requests = _mock_repositories(mocker, repositories=["repo1", "repo2"])
+    cache = github_caches.RepositoryIndexCache(state_repository=state_repository, token="token")
+
+    result = await cache.get(
+        client=client,
+        owner="owner",
+        ttl=datetime.timedelta(hours=1),
+        refresh_interval=datetime.timedelta(0),
+    )
+    assert [repository.name for repository in result] == ["repo1", "repo2"]
+    assert requests[-1].pushed_after is None
+
+    client, requests = _mock_repositories(mocker, repositories=["repo3"])
+    restored_cache = github_caches.RepositoryIndexCache(state_repository=state_repository, token="token")
+    result = await restored_cache.get(
+        client=client,
+        owner="owner",
+        ttl=datetime.timedelta(hours=1),
+        refresh_interval=datetime.timedelta(0),
+    )
+    assert [repository.name for repository in result] == ["repo1", "repo2", "repo3"]
+    assert requests[-1].pushed_after is not None
+
+
+@pytest.mark.asyncio
+async def test_repository_index_cache_skips_fresh_index(mocker: pytest_mock.MockerFixture, tmp_path: pathlib.Path):
+    client, requests = _mock_repositories(mocker, repositories=["repo1"])
+    cache = github_caches.RepositoryIndexCache(
+        state_repository=task_repositories.LocalDirStateRepository(root_path=str(tmp_path)),
+        token="token",
+    )
+
+    for _ in range(3):
+        await cache.get(
+            client=client,
+            owner="owner",
+            ttl=datetime.timedelta(hours=1),
+            refresh_interval=datetime.timedelta(hours=1),
+        )
+
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_repository_index_cache_update_renames_repository(
+    mocker: pytest_mock.MockerFixture,
+    tmp_path: pathlib.Path,
+):
+    state_repository = task_repositories.LocalDirStateRepository(root_path=str(tmp_path))
+    client, _ = _mock_repositories(mocker, repositories=["repo1", "repo2"])
+    cache = github_caches.RepositoryIndexCache(state_repository=state_repository, token="token")
+    await cache.get(
+        client=client, owner="owner", ttl=datetime.timedelta(hours=1), refresh_interval=datetime.timedelta(0)
+    )
+
+    client, _ = _mock_repositories(mocker, repositories=["renamed"], ids={"renamed": "repo1"})
+    result = await cache.get(
+        client=client,
+        owner="owner",
+        ttl=datetime.timedelta(hours=1),
+        refresh_interval=datetime.timedelta(0),
+    )
+
+    assert [repository.name for repository in result] == ["renamed", "repo2"]
+
+
+@pytest.mark.asyncio
+async def test_repository_index_cache_rename(mocker: pytest_mock.MockerFixture, tmp_path: pathlib.Path):
+    state_repository = task_repositories.LocalDirStateRepository(root_path=str(tmp_path))
+    client, requests = _mock_repositories(mocker, repositories=["repo1", "repo2"])
+    cache = github_caches.RepositoryIndexCache(state_repository=state_repository, token="token")
+    await cache.get(
+        client=client, owner="owner", ttl=datetime.timedelta(hours=1), refresh_interval=datetime.timedelta(0)
+    )
+
+    await cache.rename(owner="owner", repository_names={"repo1": "renamed"})
+
+    restored_cache = github_caches.RepositoryIndexCache(state_repository=state_repository, token="token")
+    result = await restored_cache.get(
+        client=client,
+        owner="owner",
+        ttl=datetime.timedelta(hours=1),
+        refresh_interval=datetime.timedelta(hours=1),
+    )
+    assert [(repository.id, repository.name) for repository in result] == [("repo1", "renamed"), ("repo2", "repo2")]
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_repository_index_cache_remove(mocker: pytest_mock.MockerFixture, tmp_path: pathlib.Path):
+    state_repository = task_repositories.LocalDirStateRepository(root_path=str(tmp_path))
+    client, requests = _mock_repositories(mocker, repositories=["repo1", "repo2"])
+    cache = github_caches.RepositoryIndexCache(state_repository=state_repository, token="token")
+    await cache.get(
+        client=client, owner="owner", ttl=datetime.timedelta(hours=1), refresh_interval=datetime.timedelta(0)
+    )
+
+    await cache.remove(owner="owner", repository_names={"repo1"})
+
+    restored_cache = github_caches.RepositoryIndexCache(state_repository=state_repository, token="token")
+    result = await restored_cache.get(
+        client=client,
+        owner="owner",
+        ttl=datetime.timedelta(hours=1),
+        refresh_interval=datetime.timedelta(hours=1),
+    )
+    assert [repository.name for repository in result] == ["repo2"]
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_etag_cache_store_round_trip(tmp_path: pathlib.Path):
+    state_repository = task_repositories.LocalDirStateRepository(root_path=str(tmp_path))
+    etag_cache = github_clients.ETagCache()
+    etag_cache.set("key", etag="etag", body={"value": 1})
+    await github_caches.ETagCacheStore(state_repository=state_repository, token="token", etag_cache=etag_cache).save()
+
+    restored_etag_cache = github_clients.ETagCache()
+    store = github_caches.ETagCacheStore(
+        state_repository=state_repository, token="token", etag_cache=restored_etag_cache
+    )
+    await store.load()
+    restored_etag_cache.set("other_key", etag="other_etag", body=None)
+    await store.load()
+
+    assert len(restored_etag_cache) == 2
+    entry = restored_etag_cache.get("key")
+    assert entry is not None
+    assert entry.etag == "etag"
+    assert entry.body == {"value": 1}
+
+
+@pytest.mark.asyncio
+async def test_etag_cache_store_is_separated_by_token(tmp_path: pathlib.Path):
+    state_repository = task_repositories.LocalDirStateRepository(root_path=str(tmp_path))
+    etag_cache = github_clients.ETagCache()
+    etag_cache.set("key", etag="etag", body=None)
+    await github_caches.ETagCacheStore(state_repository=state_repository, token="token", etag_cache=etag_cache).save()
+
+    other_etag_cache = github_clients.ETagCache()
+    await github_caches.ETagCacheStore(
+        state_repository=state_repository,
+        token="other_token",
+        etag_cache=other_etag_cache,
+    ).load()
+
+    assert len(other_etag_cache) == 0
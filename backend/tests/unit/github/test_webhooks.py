@@ -0,0 +1,291 @@
+import datetime
+import hashlib
+import hmac
+import json
+import pathlib
+import typing
+
+import aiohttp.test_utils
+import pytest
+import pytest_asyncio
+import pytest_mock
+
+import lib.github.triggers as github_triggers
+import lib.github.webhooks as github_webhooks
+import lib.task.base as task_base
+import lib.task.repositories as task_repositories
+import lib.task.services as task_services
+
+SECRET = "test_secret"
+
+# Trimmed `issues` delivery as sent by GitHub
+ISSUE_OPENED_PAYLOAD = {
+    "action": "opened",
+    "issue": {
+        "node_id": "I_kwDOtest",
+        "html_url": "https://github.com/test_owner/test_repository/issues/1",
+        "title": "Test issue",
+        "body": None,
+        "user": {"login": "test_user"},
+        "created_at": "2024-01-01T00:00:00Z",
+    },
+    "repository": {
+        "name": "test_repository",
+        "owner": {"login": "test_owner"},
+    },
+}
+
+
+@pytest_asyncio.fixture(name="trigger_processor_factory")
+async def trigger_processor_factory_fixture() -> typing.AsyncGenerator[task_base.TriggerProcessorFactory, None]:
+    trigger_processor_factory = task_base.TriggerProcessorFactory()
+    try:
+        yield trigger_processor_factory
+    finally:
+        await trigger_processor_factory.dispose()
+
+
+def _sign(body: bytes, secret: str = SECRET) -> str:
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _create_trigger_config(**kwargs: typing.Any) -> github_triggers.GithubTriggerConfig:
+    return github_triggers.GithubTriggerConfig.model_validate(
+        {
+            "id": "test_trigger",
+            "type": "github",
+            "token_secret": {"type": "plain", "plain_value": "test_token"},
+            "owner": "test_owner",
+            "webhook_secret": {"type": "plain", "plain_value": SECRET},
+            "subtriggers": [{"type": "repository_issue_created"}],
+            **kwargs,
+        },
+    )
+
+
+def test_is_signature_valid():
+    body = json.dumps(ISSUE_OPENED_PAYLOAD).encode()
+
+    assert github_webhooks.is_signature_valid(secret=SECRET, body=body, signature=_sign(body))
+    assert not github_webhooks.is_signature_valid(secret=SECRET, body=body, signature=_sign(body, "other"))
+    assert not github_webhooks.is_signature_valid(secret=SECRET, body=body, signature=None)
+
+
+def test_parse_delivery():
+    delivery = github_webhooks.parse_delivery(event_type="issues", body=json.dumps(ISSUE_OPENED_PAYLOAD).encode())
+
+    assert delivery is not None
+    assert delivery.owner == "test_owner"
+    assert delivery.repository == "test_repository"
+    assert delivery.action == "opened"
+    assert delivery.issue is not None
+    assert delivery.issue.id == "I_kwDOtest"
+    assert delivery.issue.body == ""
+    assert delivery.pull_request is None
+
+
+def test_parse_delivery_unsupported_event():
+    assert github_webhooks.parse_delivery(event_type="ping", body=b"{}") is None
+
+
+@pytest.mark.asyncio
+async def test_process_webhook(
+    tmp_path: pathlib.Path,
+    trigger_processor_factory: task_base.TriggerProcessorFactory,
+):
+    state_repository = task_repositories.LocalDirStateRepository(root_path=str(tmp_path))
+    state = await state_repository.get_state(path="test")
+    processor = trigger_processor_factory.create(
+        config=_create_trigger_config(),
+        state=state,
+        state_repository=state_repository,
+    )
+    body = json.dumps(ISSUE_OPENED_PAYLOAD).encode()
+
+    try:
+        events = await processor.process_webhook(
+            headers={github_webhooks.EVENT_HEADER: "issues", github_webhooks.SIGNATURE_HEADER: _sign(body)},
+            body=body,
+        )
+        # Events are recorded only once queued
+        assert await state.get() is None
+
+        await processor.confirm_webhook_events(events)
+    finally:
+        await processor.dispose()
+
+    assert [event.id for event in events] == ["issue_created__I_kwDOtest"]
+    raw_state = await state.get()
+    assert raw_state is not None
+    assert list(github_triggers.GithubTriggerState.model_validate(raw_state).webhook_event_ids) == [
+        "issue_created__I_kwDOtest"
+    ]
+
+
+def test_verify_webhook(trigger_processor_factory: task_base.TriggerProcessorFactory):
+    body = json.dumps(ISSUE_OPENED_PAYLOAD).encode()
+
+    trigger_processor_factory.verify_webhook(
+        config=_create_trigger_config(),
+        headers={github_webhooks.SIGNATURE_HEADER: _sign(body)},
+        body=body,
+    )
+    with pytest.raises(task_base.TriggerProcessorProtocol.WebhookSignatureError):
+        trigger_processor_factory.verify_webhook(
+            config=_create_trigger_config(),
+            headers={github_webhooks.SIGNATURE_HEADER: "sha256=bad"},
+            body=body,
+        )
+    with pytest.raises(task_base.TriggerProcessorProtocol.WebhookSignatureError):
+        trigger_processor_factory.verify_webhook(config=_create_trigger_config(), headers={}, body=body)
+    with pytest.raises(task_base.TriggerProcessorProtocol.WebhookNotSupportedError):
+        trigger_processor_factory.verify_webhook(
+            config=_create_trigger_config(webhook_secret=None),
+            headers={github_webhooks.SIGNATURE_HEADER: _sign(body)},
+            body=body,
+        )
+
+
+@pytest.mark.asyncio
+async def test_produce_events_skips_until_reconciliation_is_due(
+    tmp_path: pathlib.Path,
+    trigger_processor_factory: task_base.TriggerProcessorFactory,
+):
+    state_repository = task_repositories.LocalDirStateRepository(root_path=str(tmp_path))
+    state = await state_repository.get_state(path="test")
+    await state.set({"webhook_reconciled_at": datetime.datetime.now(tz=datetime.UTC).isoformat()})
+    processor = trigger_processor_factory.create(
+        config=_create_trigger_config(),
+        state=state,
+        state_repository=state_repository,
+    )
+
+    try:
+        events = [event async for event in processor.produce_events()]
+    finally:
+        await processor.dispose()
+
+    assert events == []
+
+
+@pytest.mark.asyncio
+async def test_save_state_keeps_webhook_event_ids_recorded_meanwhile(
+    tmp_path: pathlib.Path,
+    trigger_processor_factory: task_base.TriggerProcessorFactory,
+):
+    state_repository = task_repositories.LocalDirStateRepository(root_path=str(tmp_path))
+    state = await state_repository.get_state(path="test")
+    now = datetime.datetime.now(tz=datetime.UTC)
+    processor = trigger_processor_factory.create(
+        config=_create_trigger_config(),
+        state=state,
+        state_repository=state_repository,
+    )
+    assert isinstance(processor, github_triggers.GithubTriggerProcessor)
+
+    stale_state = github_triggers.GithubTriggerState(webhook_reconciled_at=now)
+    await state.set(
+        github_triggers.GithubTriggerState(
+            webhook_event_ids={
+                "recorded_meanwhile": now,
+                "expired": now - datetime.timedelta(days=30),
+            },
+        ).model_dump(mode="json")
+    )
+    await processor._save_state(stale_state)  # pyright: ignore[reportPrivateUsage]
+
+    raw_state = await state.get()
+    assert raw_state is not None
+    assert list(github_triggers.GithubTriggerState.model_validate(raw_state).webhook_event_ids) == [
+        "recorded_meanwhile"
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("topic_state", "expected_status", "expected_event_ids"),
+    [
+        ("open", 202, ["issue_created__I_kwDOtest"]),
+        ("closed", 503, []),
+        ("full", 503, []),
+    ],
+)
+async def test_webhook_server(
+    mocker: pytest_mock.MockerFixture,
+    tmp_path: pathlib.Path,
+    trigger_processor_factory: task_base.TriggerProcessorFactory,
+    topic_state: typing.Literal["open", "closed", "full"],
+    expected_status: int,
+    expected_event_ids: list[str],
+):
+    config_repository = mocker.AsyncMock(spec=task_repositories.ConfigRepositoryProtocol)
+    config_repository.get_config.return_value = task_base.RootConfig.model_validate(
+        {
+            "tasks": [
+                {
+                    "id": "test_task",
+                    "type": "cron",
+                    "cron": "*/5 * * * *",
+                    "triggers": [_create_trigger_config()],
+                    "actions": [
+                        {
+                            "id": "test_action",
+                            "type": "telegram_webhook",
+                            "chat_id_secret": {"type": "plain", "plain_value": "1234567890"},
+                            "token_secret": {"type": "plain", "plain_value": "1234567890"},
+                        },
+                    ],
+                },
+            ],
+        },
+    )
+    queue_repository = task_repositories.MemoryQueueRepository(
+        topics={task_repositories.JobTopic.EVENT: task_repositories.MemoryTopicSettings(capacity=1)},
+    )
+    if topic_state == "closed":
+        await queue_repository.close_topic(topic=task_repositories.JobTopic.EVENT)
+    if topic_state == "full":
+        await queue_repository.push(topic=task_repositories.JobTopic.EVENT, item=mocker.Mock())
+    state_repository = task_repositories.LocalDirStateRepository(root_path=str(tmp_path))
+    get_state_spy = mocker.spy(state_repository, "get_state")
+    server = task_services.WebhookServer(
+        config_repository=config_repository,
+        queue_repository=queue_repository,
+        state_repository=state_repository,
+        trigger_processor_factory=trigger_processor_factory,
+        host="localhost",
+        port=0,
+    )
+    body = json.dumps(ISSUE_OPENED_PAYLOAD).encode()
+
+    async with aiohttp.test_utils.TestClient(aiohttp.test_utils.TestServer(server.app)) as client:
+        response = await client.post(
+            "/webhooks/test_task/unknown_trigger",
+            data=body,
+            headers={github_webhooks.EVENT_HEADER: "issues", github_webhooks.SIGNATURE_HEADER: _sign(body)},
+        )
+        assert response.status == 404
+
+        response = await client.post(
+            "/webhooks/test_task/test_trigger",
+            data=body,
+            headers={github_webhooks.EVENT_HEADER: "issues", github_webhooks.SIGNATURE_HEADER: "sha256=bad"},
+        )
+        assert response.status == 401
+        # Signature is checked before trigger state is loaded
+        get_state_spy.assert_not_called()
+
+        response = await client.post(
+            "/webhooks/test_task/test_trigger",
+            data=body,
+            headers={github_webhooks.EVENT_HEADER: "issues", github_webhooks.SIGNATURE_HEADER: _sign(body)},
+        )
+        assert response.status == expected_status
+
+    raw_state = await state_repository.get(path="tasks/test_task/triggers/test_trigger")
+    assert list(github_triggers.GithubTriggerState.model_validate(raw_state or {}).webhook_event_ids) == (
+        expected_event_ids
+    )
+    if topic_state == "open":
+        async with queue_repository.acquire(topic=task_repositories.JobTopic.EVENT) as event_job:
+            assert event_job.unique_key == "test_task/test_trigger/test_action/issue_created__I_kwDOtest__0"
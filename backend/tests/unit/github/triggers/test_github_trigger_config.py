@@ -0,0 +1,34 @@
+import pytest
+
+import lib.github.triggers as github_triggers
+
+
+def _create_config(**kwargs: object) -> github_triggers.GithubTriggerConfig:
+    return github_triggers.GithubTriggerConfig.model_validate(
+        {
+            "id": "test_id",
+            "type": "github",
+            "token_secret": {
+                "type": "plain",
+                "plain_value": "test_token",
+            },
+            "owner": "test_owner",
+            "subtriggers": [],
+            **kwargs,
+        },
+    )
+
+
+@pytest.mark.parametrize(
+    ("search_strategy", "repositories_count", "expected"),
+    [
+        ("auto", 49, False),
+        ("auto", 50, True),
+        ("repository", 1000, False),
+        ("organization", 1, True),
+    ],
+)
+def test_is_organization_search(search_strategy: str, repositories_count: int, expected: bool):
+    config = _create_config(search_strategy=search_strategy)
+
+    assert config.is_organization_search(repositories_count) == expected
@@ -0,0 +1,621 @@
+import asyncio
+import dataclasses
+import datetime
+import pathlib
+import typing
+
+import pytest
+import pytest_asyncio
+import pytest_mock
+
+import lib.github.clients as github_clients
+import lib.github.models as github_models
+import lib.github.triggers as github_triggers
+import lib.task.base as task_base
+import lib.task.protocols as task_protocols
+import lib.task.repositories as task_repositories
+
+
+@pytest.fixture(name="state_repository")
+def state_repository_fixture(tmp_path: pathlib.Path) -> task_protocols.StateRepositoryProtocol:
+    return task_repositories.LocalDirStateRepository(root_path=str(tmp_path))
+
+
+@pytest_asyncio.fixture(name="shared")
+async def shared_fixture(
+    state_repository: task_protocols.StateRepositoryProtocol,
+) -> typing.AsyncGenerator[github_triggers.GithubTriggerResources, None]:
+    shared = github_triggers.GithubTriggerProcessor.create_shared(state_repository=state_repository)
+    try:
+        yield shared
+    finally:
+        await shared.dispose()
+
+
+async def _create_processor(
+    state_repository: task_protocols.StateRepositoryProtocol,
+    shared: github_triggers.GithubTriggerResources,
+    **kwargs: typing.Any,
+) -> github_triggers.GithubTriggerProcessor:
+    config = github_triggers.GithubTriggerConfig.model_validate(
+        {
+            "id": "test_trigger",
+            "type": "github",
+            "token_secret": {"type": "plain", "plain_value": "test_token"},
+            "owner": "test_owner",
+            "subtriggers": [{"type": "repository_issue_created"}],
+            **kwargs,
+        },
+    )
+    return github_triggers.GithubTriggerProcessor.from_config(
+        config=config,
+        state=await state_repository.get_state(path="test"),
+        shared=shared,
+    )
+
+
+@pytest.mark.asyncio
+async def test_from_config_rejects_conflicting_token_repository_limits(
+    state_repository: task_protocols.StateRepositoryProtocol,
+    shared: github_triggers.GithubTriggerResources,
+):
+    processor = await _create_processor(state_repository, shared, max_concurrent_repositories_per_token=10)
+    same_limit_processor = await _create_processor(
+        state_repository,
+        shared,
+        id="same_limit_trigger",
+        max_concurrent_repositories_per_token=10,
+    )
+    assert same_limit_processor.token_repository_semaphore is processor.token_repository_semaphore
+
+    with pytest.raises(ValueError):
+        await _create_processor(state_repository, shared, id="other_trigger")
+
+
+def _mock_repositories(
+    mocker: pytest_mock.MockerFixture,
+    repositories: list[github_models.Repository],
+) -> None:
+    mocker.patch.object(github_triggers.GithubTriggerProcessor, "_get_repositories", return_value=repositories)
+
+
+def _create_event(event_id: str) -> task_base.Event:
+    return task_base.Event(id=event_id, title="test_title", body="test_body", url="test_url")
+
+
+async def _get_state(processor: github_triggers.GithubTriggerProcessor) -> github_triggers.GithubTriggerState | None:
+    raw_state = await processor.raw_state.get()
+    if raw_state is None:
+        return None
+    return github_triggers.GithubTriggerState.model_validate(raw_state)
+
+
+@pytest.mark.asyncio
+async def test_produce_events_saves_interval_checkpoint_without_events(
+    mocker: pytest_mock.MockerFixture,
+    state_repository: task_protocols.StateRepositoryProtocol,
+    shared: github_triggers.GithubTriggerResources,
+):
+    processor = await _create_processor(state_repository, shared, checkpoint_interval_seconds=0.01)
+    _mock_repositories(mocker, repositories=[])
+    save_state = mocker.spy(github_triggers.GithubTriggerProcessor, "_save_state")
+    saved_states: list[str | None] = []
+
+    async def process_subtrigger(
+        state: github_triggers.GithubTriggerState,
+        **kwargs: typing.Any,
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        state.organization_events_last_id = "progress"
+        await asyncio.sleep(0.1)
+        saved_states.extend(call.args[1].organization_events_last_id for call in save_state.await_args_list)
+        return
+        yield
+
+    mocker.patch.object(
+        github_triggers.GithubTriggerProcessor, "_process_subtrigger_factory", side_effect=process_subtrigger
+    )
+
+    assert [event async for event in processor.produce_events()] == []
+
+    # Saved while the subtrigger was still running
+    assert saved_states
+    assert all(saved_state == "progress" for saved_state in saved_states)
+
+
+@pytest.mark.asyncio
+async def test_produce_events_saves_checkpoint_after_events(
+    mocker: pytest_mock.MockerFixture,
+    state_repository: task_protocols.StateRepositoryProtocol,
+    shared: github_triggers.GithubTriggerResources,
+):
+    processor = await _create_processor(
+        state_repository,
+        shared,
+        checkpoint_events=2,
+        checkpoint_interval_seconds=0,
+    )
+    _mock_repositories(mocker, repositories=[])
+
+    async def process_subtrigger(
+        state: github_triggers.GithubTriggerState,
+        **kwargs: typing.Any,
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        for index in range(3):
+            yield _create_event(f"event_{index}")
+            state.organization_events_last_id = f"event_{index}"
+
+    mocker.patch.object(
+        github_triggers.GithubTriggerProcessor, "_process_subtrigger_factory", side_effect=process_subtrigger
+    )
+
+    saved_states: list[github_triggers.GithubTriggerState | None] = []
+    async for _ in processor.produce_events():
+        saved_states.append(await _get_state(processor))
+
+    assert saved_states[0] is None
+    assert saved_states[2] is not None
+    # Checkpoint never includes the event being sent
+    assert saved_states[2].organization_events_last_id in ("event_0", "event_1")
+    final_state = await _get_state(processor)
+    assert final_state is not None
+    assert final_state.organization_events_last_id == "event_2"
+
+
+@pytest.mark.asyncio
+async def test_produce_events_persists_etag_cache_once_per_token(
+    mocker: pytest_mock.MockerFixture,
+    state_repository: task_protocols.StateRepositoryProtocol,
+    shared: github_triggers.GithubTriggerResources,
+):
+    processor = await _create_processor(
+        state_repository,
+        shared,
+        persist_etag_cache=True,
+        checkpoint_events=1,
+        checkpoint_interval_seconds=0,
+    )
+    processor.rest_github_client.etag_cache.set("key", etag="etag", body=None)
+    save = mocker.spy(processor.etag_cache_store, "save")
+    _mock_repositories(mocker, repositories=[])
+
+    async def process_subtrigger(**kwargs: typing.Any) -> typing.AsyncGenerator[task_base.Event, None]:
+        for index in range(3):
+            yield _create_event(f"event_{index}")
+
+    mocker.patch.object(
+        github_triggers.GithubTriggerProcessor, "_process_subtrigger_factory", side_effect=process_subtrigger
+    )
+
+    assert len([event async for event in processor.produce_events()]) == 3
+
+    save.assert_called_once()
+    raw_state = await processor.raw_state.get()
+    assert raw_state is not None
+    assert "rest_etag_cache" not in raw_state
+    other_processor = await _create_processor(state_repository, shared, id="other_trigger", persist_etag_cache=True)
+    assert other_processor.etag_cache_store is processor.etag_cache_store
+
+    restored_shared = github_triggers.GithubTriggerProcessor.create_shared(state_repository=state_repository)
+    try:
+        restored_processor = await _create_processor(state_repository, restored_shared, persist_etag_cache=True)
+        await restored_processor.etag_cache_store.load()
+        assert restored_processor.rest_github_client.etag_cache.get("key") is not None
+    finally:
+        await restored_shared.dispose()
+
+
+def _create_activity(
+    name: str,
+    pushed_at: datetime.datetime,
+    repository_id: str | None = None,
+) -> github_models.RepositoryActivity:
+    return github_models.RepositoryActivity(
+        id=repository_id or f"R_{name}",
+        name=name,
+        pushed_at=pushed_at,
+        updated_at=pushed_at,
+        is_archived=False,
+        issue_count=1,
+        pull_request_count=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_produce_events_skips_repositories_with_unchanged_activity(
+    mocker: pytest_mock.MockerFixture,
+    state_repository: task_protocols.StateRepositoryProtocol,
+    shared: github_triggers.GithubTriggerResources,
+):
+    processor = await _create_processor(state_repository, shared)
+    now = datetime.datetime.now(tz=datetime.UTC)
+    checked_at = now - datetime.timedelta(minutes=1)
+    quiet_activity = _create_activity("quiet", pushed_at=now - datetime.timedelta(days=1))
+    busy_activity = _create_activity("busy", pushed_at=now - datetime.timedelta(minutes=5))
+    await processor.raw_state.set(
+        github_triggers.GithubTriggerState(
+            repository_activity={
+                "quiet": github_triggers.RepositoryActivityState(
+                    fingerprint=quiet_activity.fingerprint,
+                    checked_at=checked_at,
+                ),
+                "busy": github_triggers.RepositoryActivityState(
+                    fingerprint=_create_activity("busy", pushed_at=now - datetime.timedelta(days=1)).fingerprint,
+                    checked_at=checked_at,
+                ),
+            },
+        ).model_dump(mode="json")
+    )
+    _mock_repositories(
+        mocker,
+        repositories=[
+            github_models.Repository(owner="test_owner", name="quiet", id="R_quiet"),
+            github_models.Repository(owner="test_owner", name="busy", id="R_busy"),
+        ],
+    )
+    mocker.patch.object(
+        processor.gql_github_client,
+        "get_repositories_activity",
+        return_value=[quiet_activity, busy_activity],
+    )
+    processed_repositories: list[github_models.Repository] = []
+
+    async def process_subtrigger(
+        active_repositories: list[github_models.Repository],
+        **kwargs: typing.Any,
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        processed_repositories.extend(active_repositories)
+        return
+        yield
+
+    mocker.patch.object(
+        github_triggers.GithubTriggerProcessor, "_process_subtrigger_factory", side_effect=process_subtrigger
+    )
+
+    assert [event async for event in processor.produce_events()] == []
+
+    assert [repository.name for repository in processed_repositories] == ["busy"]
+    state = await _get_state(processor)
+    assert state is not None
+    assert state.repository_activity["busy"].fingerprint == busy_activity.fingerprint
+    assert state.repository_activity["busy"].checked_at > checked_at
+    assert state.repository_activity["quiet"].fingerprint == quiet_activity.fingerprint
+    assert state.repository_activity["quiet"].checked_at == checked_at
+
+
+@pytest.mark.asyncio
+async def test_produce_events_applies_repository_removals_and_renames(
+    mocker: pytest_mock.MockerFixture,
+    state_repository: task_protocols.StateRepositoryProtocol,
+    shared: github_triggers.GithubTriggerResources,
+):
+    processor = await _create_processor(state_repository, shared)
+    now = datetime.datetime.now(tz=datetime.UTC)
+    _mock_repositories(
+        mocker,
+        repositories=[
+            github_models.Repository(owner="test_owner", name="present", id="R_present"),
+            github_models.Repository(owner="test_owner", name="deleted", id="R_deleted"),
+            github_models.Repository(owner="test_owner", name="renamed", id="R_renamed"),
+        ],
+    )
+    mocker.patch.object(
+        processor.gql_github_client,
+        "get_repositories_activity",
+        return_value=[
+            _create_activity("present", pushed_at=now),
+            _create_activity("new_name", pushed_at=now, repository_id="R_renamed"),
+        ],
+    )
+    remove = mocker.patch.object(processor.repository_index_cache, "remove")
+    rename = mocker.patch.object(processor.repository_index_cache, "rename")
+    processed_repositories: list[github_models.Repository] = []
+
+    async def process_subtrigger(
+        repositories: list[github_models.Repository],
+        **kwargs: typing.Any,
+    ) -> typing.AsyncGenerator[task_base.Event, None]:
+        processed_repositories.extend(repositories)
+        return
+        yield
+
+    mocker.patch.object(
+        github_triggers.GithubTriggerProcessor, "_process_subtrigger_factory", side_effect=process_subtrigger
+    )
+
+    assert [event async for event in processor.produce_events()] == []
+
+    assert [repository.name for repository in processed_repositories] == ["present", "new_name"]
+    remove.assert_called_once_with(owner="test_owner", repository_names={"deleted"})
+    rename.assert_called_once_with(owner="test_owner", repository_names={"R_renamed": "new_name"})
+
+
+async def _iterate[T](items: list[T]) -> typing.AsyncGenerator[T, None]:
+    for item in items:
+        yield item
+
+
+def _create_issue(issue_id: str, repository: str, created_at: datetime.datetime) -> github_models.Issue:
+    return github_models.Issue(
+        id=issue_id,
+        author="test_user",
+        url=f"https://github.com/test_owner/{repository}/issues/{issue_id}",
+        title="test_title",
+        body="test_body",
+        created_at=created_at,
+        repository=repository,
+    )
+
+
+@pytest.mark.asyncio
+async def test_produce_events_organization_issue_search(
+    mocker: pytest_mock.MockerFixture,
+    state_repository: task_protocols.StateRepositoryProtocol,
+    shared: github_triggers.GithubTriggerResources,
+):
+    processor = await _create_processor(state_repository, shared, search_strategy="organization")
+    now = datetime.datetime.now(tz=datetime.UTC)
+    organization_created = now - datetime.timedelta(hours=1)
+    await processor.raw_state.set(
+        github_triggers.GithubTriggerState(
+            organization_issue_created=organization_created,
+            repository_issue_created={
+                "synced": github_triggers.RepositoryIssueCreatedState(last_issue_created=organization_created),
+                "lagging": github_triggers.RepositoryIssueCreatedState(
+                    last_issue_created=organization_created - datetime.timedelta(days=1),
+                ),
+                "quiet": github_triggers.RepositoryIssueCreatedState(
+                    last_issue_created=organization_created - datetime.timedelta(days=1),
+                ),
+            },
+        ).model_dump(mode="json")
+    )
+    _mock_repositories(
+        mocker,
+        repositories=[
+            github_models.Repository(owner="test_owner", name=name) for name in ("synced", "lagging", "quiet")
+        ],
+    )
+    synced_issue = _create_issue("synced_issue", "synced", organization_created + datetime.timedelta(minutes=10))
+    lagging_issue = _create_issue("lagging_issue", "lagging", organization_created + datetime.timedelta(minutes=20))
+    lagging_old_issue = _create_issue(
+        "lagging_old_issue", "lagging", organization_created - datetime.timedelta(hours=1)
+    )
+    unknown_issue = _create_issue("unknown_issue", "unknown", organization_created + datetime.timedelta(minutes=30))
+    get_organization_issues = mocker.patch.object(
+        processor.gql_github_client,
+        "get_organization_issues",
+        side_effect=lambda request: _iterate([synced_issue, lagging_issue, unknown_issue]),
+    )
+    get_repository_issues = mocker.patch.object(
+        processor.gql_github_client,
+        "get_repository_issues",
+        side_effect=lambda request: _iterate(
+            [issue for issue in (lagging_old_issue, lagging_issue) if issue.repository == request.repository]
+        ),
+    )
+
+    events = [event async for event in processor.produce_events()]
+
+    # Issues are routed to their repositories, lagging repositories are served only by their own search
+    assert sorted(event.id for event in events) == [
+        "issue_created__lagging_issue",
+        "issue_created__lagging_old_issue",
+        "issue_created__synced_issue",
+    ]
+    assert get_organization_issues.call_args.args[0].created_after == organization_created
+    assert sorted(call.args[0].repository for call in get_repository_issues.call_args_list) == ["lagging", "quiet"]
+
+    state = await _get_state(processor)
+    assert state is not None
+    assert state.organization_issue_created == unknown_issue.created_at
+    # Caught up repositories, including ones without new issues, join the organization search
+    for repository in ("synced", "lagging", "quiet"):
+        assert state.repository_issue_created[repository].last_issue_created == unknown_issue.created_at
+
+
+@pytest.mark.asyncio
+async def test_produce_events_organization_pr_search_catches_up_quiet_repository(
+    mocker: pytest_mock.MockerFixture,
+    state_repository: task_protocols.StateRepositoryProtocol,
+    shared: github_triggers.GithubTriggerResources,
+):
+    processor = await _create_processor(
+        state_repository,
+        shared,
+        search_strategy="organization",
+        subtriggers=[{"type": "repository_pr_created"}],
+    )
+    now = datetime.datetime.now(tz=datetime.UTC)
+    organization_created = now - datetime.timedelta(hours=1)
+    await processor.raw_state.set(
+        github_triggers.GithubTriggerState(
+            organization_pr_created=organization_created,
+            repository_pr_created={
+                "quiet": github_triggers.RepositoryPRCreatedState(
+                    last_pr_created=organization_created - datetime.timedelta(days=1),
+                ),
+            },
+        ).model_dump(mode="json")
+    )
+    _mock_repositories(mocker, repositories=[github_models.Repository(owner="test_owner", name="quiet")])
+    pr = github_models.PullRequest(
+        id="other_pr",
+        author="test_user",
+        url="https://github.com/test_owner/other/pull/1",
+        title="test_title",
+        body="test_body",
+        created_at=organization_created + datetime.timedelta(minutes=10),
+        repository="other",
+    )
+    mocker.patch.object(
+        processor.gql_github_client,
+        "get_organization_pull_requests",
+        side_effect=lambda request: _iterate([pr]),
+    )
+    mocker.patch.object(
+        processor.gql_github_client,
+        "get_repository_pull_requests",
+        side_effect=lambda request: _iterate([]),
+    )
+
+    assert [event async for event in processor.produce_events()] == []
+
+    state = await _get_state(processor)
+    assert state is not None
+    assert state.organization_pr_created == pr.created_at
+    assert state.repository_pr_created["quiet"].last_pr_created == pr.created_at
+
+
+@pytest.mark.asyncio
+async def test_produce_events_organization_events_keep_searching_private_repositories(
+    mocker: pytest_mock.MockerFixture,
+    state_repository: task_protocols.StateRepositoryProtocol,
+    shared: github_triggers.GithubTriggerResources,
+):
+    processor = await _create_processor(state_repository, shared, ingest_mode="events")
+    now = datetime.datetime.now(tz=datetime.UTC)
+    last_created = now - datetime.timedelta(hours=1)
+    await processor.raw_state.set(
+        github_triggers.GithubTriggerState(
+            organization_events_last_id="1",
+            repository_issue_created={
+                name: github_triggers.RepositoryIssueCreatedState(last_issue_created=last_created)
+                for name in ("public", "private")
+            },
+        ).model_dump(mode="json")
+    )
+    _mock_repositories(
+        mocker,
+        repositories=[
+            github_models.Repository(owner="test_owner", name="public", is_private=False),
+            github_models.Repository(owner="test_owner", name="private", is_private=True),
+        ],
+    )
+    public_issue = _create_issue("public_issue", "public", last_created + datetime.timedelta(minutes=10))
+    private_issue = _create_issue("private_issue", "private", last_created + datetime.timedelta(minutes=5))
+    mocker.patch.object(
+        github_clients.RestGithubClient,
+        "get_organization_events",
+        return_value=github_clients.OrganizationEventsPage(
+            events=[
+                github_models.OrganizationEvent(
+                    id="2",
+                    type="IssuesEvent",
+                    action="opened",
+                    repository="public",
+                    created_at=public_issue.created_at,
+                    issue=public_issue,
+                ),
+            ],
+            is_complete=True,
+            poll_interval=None,
+        ),
+    )
+    get_repository_issues = mocker.patch.object(
+        processor.gql_github_client,
+        "get_repository_issues",
+        side_effect=lambda request: _iterate([private_issue]),
+    )
+
+    events = [event async for event in processor.produce_events()]
+
+    assert sorted(event.id for event in events) == ["issue_created__private_issue", "issue_created__public_issue"]
+    assert [call.args[0].repository for call in get_repository_issues.call_args_list] == ["private"]
+    state = await _get_state(processor)
+    assert state is not None
+    assert state.repository_issue_created["public"].last_issue_created == public_issue.created_at
+    # Feed has no private events, so its position does not move private repositories
+    assert state.repository_issue_created["private"].last_issue_created == private_issue.created_at
+
+
+def _create_workflow_run(
+    run_id: int,
+    created_at: datetime.datetime,
+    status: str = "completed",
+    conclusion: str | None = "success",
+) -> github_models.WorkflowRun:
+    return github_models.WorkflowRun(
+        id=run_id,
+        name="test_workflow",
+        url=f"https://github.com/test_owner/test_repository/actions/runs/{run_id}",
+        status=status,
+        conclusion=conclusion,
+        created_at=created_at,
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_repository_failed_workflow_run_lists_runs_only_after_probe_change(
+    mocker: pytest_mock.MockerFixture,
+    state_repository: task_protocols.StateRepositoryProtocol,
+    shared: github_triggers.GithubTriggerResources,
+):
+    processor = await _create_processor(state_repository, shared)
+    config = github_triggers.RepositoryFailedWorkflowRunSubtriggerConfig.model_validate(
+        {"type": "repository_failed_workflow_run"},
+    )
+    state = github_triggers.GithubTriggerState()
+    now = datetime.datetime.now(tz=datetime.UTC)
+    incomplete_run = _create_workflow_run(3, created_at=now, status="in_progress", conclusion=None)
+    failed_run = _create_workflow_run(2, created_at=now - datetime.timedelta(minutes=1), conclusion="failure")
+    runs = [incomplete_run, failed_run, _create_workflow_run(1, created_at=now - datetime.timedelta(minutes=2))]
+    get_latest_run = mocker.patch.object(
+        github_clients.RestGithubClient,
+        "get_latest_repository_workflow_run",
+        side_effect=lambda request: runs[0],
+    )
+
+    def filter_runs(request: github_clients.GetRepositoryWorkflowRunsRequest) -> list[github_models.WorkflowRun]:
+        return [
+            run
+            for run in runs
+            if run.created_at >= request.created_after and request.status in (run.status, run.conclusion)
+        ]
+
+    async def get_repository_workflow_runs(
+        request: github_clients.GetRepositoryWorkflowRunsRequest,
+    ) -> typing.AsyncGenerator[github_models.WorkflowRun, None]:
+        for run in filter_runs(request):
+            yield run
+
+    get_runs = mocker.patch.object(
+        github_clients.RestGithubClient,
+        "get_repository_workflow_runs",
+        side_effect=get_repository_workflow_runs,
+    )
+    get_oldest_run = mocker.patch.object(
+        github_clients.RestGithubClient,
+        "get_oldest_repository_workflow_run",
+        side_effect=lambda request: next(reversed(filter_runs(request)), None),
+    )
+
+    async def process() -> list[task_base.Event]:
+        return [
+            event
+            async for event in processor._process_repository_failed_workflow_run(  # pyright: ignore[reportPrivateUsage]
+                state=state,
+                config=config,
+                repository="test_repository",
+            )
+        ]
+
+    events = await process()
+    assert [event.url for event in events] == [failed_run.url]
+    repository_state = state.repository_failed_workflow_run["test_repository"]
+    assert state.repositories_with_incomplete_runs == {"test_repository"}
+    assert repository_state.oldest_incomplete_created == incomplete_run.created_at
+
+    runs[0] = dataclasses.replace(incomplete_run, status="completed", conclusion="failure")
+    events = await process()
+    assert [event.url for event in events] == [incomplete_run.url]
+    assert state.repositories_with_incomplete_runs == set()
+    assert get_runs.call_count == 2
+
+    events = await process()
+    assert events == []
+    assert get_latest_run.call_count == 3
+    assert get_runs.call_count == 2
+    assert {call.kwargs["request"].status for call in get_runs.call_args_list} == {"failure"}
+    assert {call.kwargs["request"].status for call in get_oldest_run.call_args_list} == set(
+        github_triggers.INCOMPLETE_WORKFLOW_RUN_STATUSES
+    )
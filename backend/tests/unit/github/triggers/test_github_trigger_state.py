@@ -0,0 +1,62 @@
+import datetime
+
+import lib.github.triggers as github_triggers
+
+
+def test_failed_workflow_run_state_migration():
+    state = github_triggers.GithubTriggerState.model_validate(
+        {
+            "repository_failed_workflow_run": {
+                "test_repository": {
+                    "oldest_incomplete_created": "2024-01-01T00:00:00Z",
+                    "already_reported_failed_runs": [
+                        {
+                            "id": 1,
+                            "name": "test_workflow",
+                            "url": "https://github.com",
+                            "status": "completed",
+                            "conclusion": "failure",
+                            "created_at": "2024-01-02T00:00:00Z",
+                        },
+                    ],
+                },
+            },
+        },
+    )
+
+    repository_state = state.repository_failed_workflow_run["test_repository"]
+    assert repository_state.already_reported_failed_runs == {
+        1: datetime.datetime(2024, 1, 2, tzinfo=datetime.UTC),
+    }
+
+
+def test_failed_workflow_run_state_round_trip():
+    state = github_triggers.RepositoryFailedWorkflowRunState(
+        oldest_incomplete_created=datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+        already_reported_failed_runs={1: datetime.datetime(2024, 1, 2, tzinfo=datetime.UTC)},
+    )
+
+    restored = github_triggers.RepositoryFailedWorkflowRunState.model_validate(state.model_dump(mode="json"))
+
+    assert restored == state
+
+
+def test_incomplete_runs_state_migration():
+    state = github_triggers.GithubTriggerState.model_validate(
+        {
+            "repository_failed_workflow_run": {
+                "incomplete_repository": {
+                    "oldest_incomplete_created": "2024-01-01T00:00:00Z",
+                    "has_incomplete_runs": True,
+                },
+                "complete_repository": {
+                    "oldest_incomplete_created": "2024-01-01T00:00:00Z",
+                    "has_incomplete_runs": False,
+                },
+            },
+        },
+    )
+
+    assert state.repositories_with_incomplete_runs == {"incomplete_repository"}
+    restored = github_triggers.GithubTriggerState.model_validate(state.model_dump(mode="json"))
+    assert restored.repositories_with_incomplete_runs == {"incomplete_repository"}
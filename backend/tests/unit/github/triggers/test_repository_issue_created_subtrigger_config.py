@@ -1,5 +1,6 @@
 import datetime
 
+import pydantic
 import pytest
 
 import lib.github.models as github_models
@@ -223,3 +224,55 @@ def test_is_applicable_include_and_include_regex_title(issue: github_models.Issu
     )
     assert isinstance(config, github_triggers.RepositoryIssueCreatedSubtriggerConfig)
     assert config.is_applicable(issue=issue)
+
+
+@pytest.mark.parametrize(
+    "include_title_regex, expected",
+    [
+        (["other_.*", "test_.*"], True),
+        (["(other)_.*", "(test)_\\1"], False),
+        (["(other)_.*", "(test)_t"], True),
+        (["(?i)TEST_.*", "other_.*"], True),
+    ],
+)
+def test_is_applicable_multiple_include_regex_title(
+    issue: github_models.Issue,
+    include_title_regex: list[str],
+    expected: bool,
+):
+    config = github_triggers.BaseSubtriggerConfig.factory(
+        data={
+            "type": "repository_issue_created",
+            "id": "test_id",
+            "include_title_regex": include_title_regex,
+        },
+    )
+    assert isinstance(config, github_triggers.RepositoryIssueCreatedSubtriggerConfig)
+    assert config.is_applicable(issue=issue) == expected
+
+
+def test_invalid_title_regex():
+    with pytest.raises(pydantic.ValidationError):
+        github_triggers.BaseSubtriggerConfig.factory(
+            data={
+                "type": "repository_issue_created",
+                "id": "test_id",
+                "include_title_regex": ["test_("],
+            },
+        )
+
+
+def test_compile_matchers_after_change(issue: github_models.Issue):
+    config = github_triggers.BaseSubtriggerConfig.factory(
+        data={
+            "type": "repository_issue_created",
+            "id": "test_id",
+        },
+    )
+    assert isinstance(config, github_triggers.RepositoryIssueCreatedSubtriggerConfig)
+    assert config.is_applicable(issue=issue)
+
+    config.exclude_author.add("test_author")
+    config.compile_matchers()
+
+    assert not config.is_applicable(issue=issue)
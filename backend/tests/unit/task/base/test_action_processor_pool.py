@@ -0,0 +1,30 @@
+import pytest
+
+import lib.task.base as task_base
+
+
+def _create_config(action_id: str, chat_id: str) -> task_base.BaseActionConfig:
+    return task_base.action_config_factory(
+        data={
+            "id": action_id,
+            "type": "telegram_webhook",
+            "chat_id_secret": {"type": "plain", "plain_value": chat_id},
+            "token_secret": {"type": "plain", "plain_value": "1234567890"},
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_action_processor_pool():
+    pool = task_base.ActionProcessorPool()
+
+    processor = pool.get(config=_create_config("action", "1"))
+
+    assert pool.get(config=_create_config("action", "1")) is processor
+    # Same id in another task may point to another chat
+    assert pool.get(config=_create_config("action", "2")) is not processor
+
+    await pool.dispose()
+
+    assert pool.get(config=_create_config("action", "1")) is not processor
+    await pool.dispose()
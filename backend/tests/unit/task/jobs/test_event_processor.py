@@ -0,0 +1,89 @@
+import pytest
+import pytest_mock
+
+import lib.task.base as task_base
+import lib.task.jobs as task_jobs
+import lib.task.repositories as task_repositories
+
+
+def _create_event_job(event_id: str, chat_id: str, retry_count: int = 0) -> task_jobs.EventJob:
+    return task_jobs.EventJob(
+        id=event_id,
+        retry_count=retry_count,
+        event=task_base.Event(id=event_id, title="title", body="body", url="url"),
+        action=task_base.action_config_factory(
+            data={
+                "id": "test_action",
+                "type": "telegram_webhook",
+                "chat_id_secret": {"type": "plain", "plain_value": chat_id},
+                "token_secret": {"type": "plain", "plain_value": "1234567890"},
+            },
+        ),
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_batch(mocker: pytest_mock.MockerFixture):
+    queue_repository = task_repositories.MemoryQueueRepository()
+    event_jobs = [
+        _create_event_job("event_1", chat_id="1"),
+        _create_event_job("event_2", chat_id="2"),
+        _create_event_job("event_3", chat_id="1"),
+        _create_event_job("event_4", chat_id="1", retry_count=1),
+    ]
+    await queue_repository.push_many(topic=task_repositories.JobTopic.EVENT, items=event_jobs)
+
+    action_processor = mocker.AsyncMock(spec=task_base.ActionProcessorProtocol)
+    error = Exception("test")
+    action_processor.process_batch.side_effect = lambda events: [
+        error if event.id != "event_1" else None for event in events
+    ]
+    action_processor_pool = mocker.Mock(spec=task_base.ActionProcessorPool)
+    action_processor_pool.get.return_value = action_processor
+
+    job = task_jobs.EventProcessorJob(
+        job_id=0,
+        max_retries=2,
+        queue_repository=queue_repository,
+        action_processor_pool=action_processor_pool,
+        batch_size=10,
+    )
+    with pytest.raises(RuntimeError):
+        await job._process()  # pyright: ignore[reportPrivateUsage]
+
+    # Events of the same action are delivered in one batch
+    assert [
+        [event.id for event in call.kwargs["events"]] for call in action_processor.process_batch.call_args_list
+    ] == [["event_1", "event_3", "event_4"], ["event_2"]]
+
+    async with queue_repository.acquire_batch(topic=task_repositories.JobTopic.EVENT, max_items=10) as retried:
+        assert [(event_job.id, event_job.retry_count) for event_job in retried] == [("event_2", 1), ("event_3", 1)]
+    async with queue_repository.acquire_batch(topic=task_repositories.JobTopic.FAILED_EVENT, max_items=10) as failed:
+        assert [event_job.id for event_job in failed] == ["event_4"]
+
+
+@pytest.mark.asyncio
+async def test_process_batch_counts_processor_creation_errors_as_retries(mocker: pytest_mock.MockerFixture):
+    queue_repository = task_repositories.MemoryQueueRepository()
+    await queue_repository.push_many(
+        topic=task_repositories.JobTopic.EVENT,
+        items=[_create_event_job("event_1", chat_id="1"), _create_event_job("event_2", chat_id="1", retry_count=1)],
+    )
+
+    action_processor_pool = mocker.Mock(spec=task_base.ActionProcessorPool)
+    action_processor_pool.get.side_effect = Exception("test")
+
+    job = task_jobs.EventProcessorJob(
+        job_id=0,
+        max_retries=2,
+        queue_repository=queue_repository,
+        action_processor_pool=action_processor_pool,
+        batch_size=10,
+    )
+    with pytest.raises(RuntimeError):
+        await job._process()  # pyright: ignore[reportPrivateUsage]
+
+    async with queue_repository.acquire_batch(topic=task_repositories.JobTopic.EVENT, max_items=10) as retried:
+        assert [(event_job.id, event_job.retry_count) for event_job in retried] == [("event_1", 1)]
+    async with queue_repository.acquire_batch(topic=task_repositories.JobTopic.FAILED_EVENT, max_items=10) as failed:
+        assert [event_job.id for event_job in failed] == ["event_2"]
@@ -0,0 +1,172 @@
+import asyncio
+
+import pydantic
+import pytest
+
+import lib.task.jobs as task_jobs
+import lib.task.repositories as task_repositories
+
+TOPIC = task_repositories.JobTopic.EVENT
+
+
+def _create_jobs(count: int) -> list[task_jobs.BaseJob]:
+    return [task_jobs.BaseJob(id=f"job_{index}") for index in range(count)]
+
+
+@pytest.mark.asyncio
+async def test_acquire_batch():
+    queue_repository = task_repositories.MemoryQueueRepository()
+    jobs = _create_jobs(5)
+    await queue_repository.push_many(topic=TOPIC, items=jobs)
+
+    async with queue_repository.acquire_batch(topic=TOPIC, max_items=3) as batch:
+        assert batch == jobs[:3]
+        await queue_repository.consume_many(topic=TOPIC, items=batch)
+
+    async with queue_repository.acquire_batch(topic=TOPIC, max_items=3) as batch:
+        assert batch == jobs[3:]
+        await queue_repository.consume_many(topic=TOPIC, items=batch)
+
+    await queue_repository.close_topic(topic=TOPIC)
+    await asyncio.sleep(0)
+    assert queue_repository.is_topic_finished(topic=TOPIC)
+
+
+@pytest.mark.asyncio
+async def test_acquire_batch_returns_unconsumed_items():
+    queue_repository = task_repositories.MemoryQueueRepository()
+    jobs = _create_jobs(3)
+    await queue_repository.push_many(topic=TOPIC, items=jobs)
+
+    async with queue_repository.acquire_batch(topic=TOPIC, max_items=3) as batch:
+        await queue_repository.consume(topic=TOPIC, item=batch[0])
+
+    async with queue_repository.acquire_batch(topic=TOPIC, max_items=3) as batch:
+        assert batch == jobs[1:]
+
+
+@pytest.mark.asyncio
+async def test_acquire_batch_max_wait():
+    queue_repository = task_repositories.MemoryQueueRepository()
+    jobs = _create_jobs(2)
+
+    async def push_later() -> None:
+        await queue_repository.push(topic=TOPIC, item=jobs[0])
+        await asyncio.sleep(0.01)
+        await queue_repository.push(topic=TOPIC, item=jobs[1])
+
+    push_task = asyncio.create_task(push_later())
+    async with queue_repository.acquire_batch(topic=TOPIC, max_items=2, max_wait=1) as batch:
+        assert batch == jobs
+        await queue_repository.consume_many(topic=TOPIC, items=batch)
+    await push_task
+
+
+@pytest.mark.asyncio
+async def test_acquire_batch_returns_items_on_cancellation():
+    queue_repository = task_repositories.MemoryQueueRepository()
+    jobs = _create_jobs(1)
+    await queue_repository.push_many(topic=TOPIC, items=jobs)
+
+    async def acquire() -> None:
+        async with queue_repository.acquire_batch(topic=TOPIC, max_items=2, max_wait=10):
+            pass
+
+    acquire_task = asyncio.create_task(acquire())
+    await asyncio.sleep(0.01)
+    acquire_task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await acquire_task
+
+    async with asyncio.timeout(1):
+        async with queue_repository.acquire_batch(topic=TOPIC, max_items=2) as batch:
+            assert batch == jobs
+
+
+@pytest.mark.asyncio
+async def test_acquire_batch_does_not_wait_by_default():
+    queue_repository = task_repositories.MemoryQueueRepository()
+    jobs = _create_jobs(1)
+    await queue_repository.push_many(topic=TOPIC, items=jobs)
+
+    async with asyncio.timeout(1):
+        async with queue_repository.acquire_batch(topic=TOPIC, max_items=10) as batch:
+            assert batch == jobs
+
+
+@pytest.mark.asyncio
+async def test_push_waits_for_capacity():
+    queue_repository = task_repositories.MemoryQueueRepository(
+        topics={TOPIC: task_repositories.MemoryTopicSettings(capacity=3, low_watermark=1)},
+    )
+    jobs = _create_jobs(4)
+    await queue_repository.push_many(topic=TOPIC, items=jobs[:3])
+
+    push_task = asyncio.create_task(queue_repository.push(topic=TOPIC, item=jobs[3]))
+    await asyncio.sleep(0)
+    assert not push_task.done()
+
+    # Producers are resumed only after draining to low watermark
+    async with queue_repository.acquire(topic=TOPIC) as job:
+        await queue_repository.consume(topic=TOPIC, item=job)
+    await asyncio.sleep(0)
+    assert not push_task.done()
+
+    async with queue_repository.acquire(topic=TOPIC) as job:
+        await queue_repository.consume(topic=TOPIC, item=job)
+    await asyncio.sleep(0)
+    assert push_task.done()
+
+    (metrics,) = queue_repository.metrics
+    assert metrics.peak_size == 3
+    assert metrics.high_watermark_hits == 1
+    assert not metrics.is_paused
+
+
+@pytest.mark.asyncio
+async def test_push_without_waiting_for_capacity():
+    queue_repository = task_repositories.MemoryQueueRepository(
+        topics={TOPIC: task_repositories.MemoryTopicSettings(capacity=1)},
+    )
+    jobs = _create_jobs(2)
+
+    async with asyncio.timeout(1):
+        await queue_repository.push_many(topic=TOPIC, items=jobs, wait_for_capacity=False)
+
+    assert queue_repository.metrics[0].size == 2
+
+
+@pytest.mark.asyncio
+async def test_close_topic_wakes_paused_producers():
+    queue_repository = task_repositories.MemoryQueueRepository(
+        topics={TOPIC: task_repositories.MemoryTopicSettings(capacity=1)},
+    )
+    jobs = _create_jobs(2)
+    await queue_repository.push(topic=TOPIC, item=jobs[0])
+
+    push_task = asyncio.create_task(queue_repository.push(topic=TOPIC, item=jobs[1]))
+    await asyncio.sleep(0)
+    await queue_repository.close_topic(topic=TOPIC)
+
+    with pytest.raises(task_repositories.QueueRepositoryProtocol.TopicClosed):
+        await push_task
+
+    # Draining the topic lets its clean up task finish
+    async with queue_repository.acquire(topic=TOPIC) as job:
+        await queue_repository.consume(topic=TOPIC, item=job)
+    await asyncio.sleep(0)
+    assert queue_repository.is_topic_finished(topic=TOPIC)
+
+
+def test_settings():
+    settings = task_repositories.MemoryQueueSettings.model_validate(
+        {"type": "memory", "topics": {"trigger_jobs": {"capacity": 10}}},
+    )
+    assert settings.topics[task_repositories.JobTopic.TRIGGER].resolved_low_watermark == 5
+
+    with pytest.raises(pydantic.ValidationError):
+        task_repositories.MemoryQueueSettings.model_validate(
+            {"type": "memory", "topics": {"failed_event_jobs": {"capacity": 10}}},
+        )
+    with pytest.raises(pydantic.ValidationError):
+        task_repositories.MemoryTopicSettings(capacity=10, low_watermark=10)
@@ -1,3 +1,5 @@
+import asyncio
+
 import aiohttp
 import pytest
 import pytest_mock
@@ -30,7 +32,8 @@ def config_fixture() -> telegram_actions.TelegramWebhookActionConfig:
 
 @pytest.mark.asyncio
 async def test_factory(config: telegram_actions.TelegramWebhookActionConfig):
-    processor = task_base.action_processor_factory(config=config)
+    pool = task_base.ActionProcessorPool()
+    processor = pool.get(config=config)
 
     assert isinstance(processor, telegram_actions.TelegramWebhookProcessor)
     assert processor.config == config
@@ -39,7 +42,15 @@ async def test_factory(config: telegram_actions.TelegramWebhookActionConfig):
     assert processor.telegram_client.token == config.token_secret.value
     assert processor.telegram_client.aiohttp_client == processor.aiohttp_client
 
-    await processor.dispose()
+    other_config = config.model_copy(update={"max_message_body_length": 10})
+    other_processor = pool.get(config=other_config)
+    assert isinstance(other_processor, telegram_actions.TelegramWebhookProcessor)
+    assert other_processor is not processor
+    assert other_processor.aiohttp_client is processor.aiohttp_client
+    assert other_processor.telegram_client.rate_limiter is processor.telegram_client.rate_limiter
+
+    await pool.dispose()
+    assert processor.aiohttp_client.closed
 
 
 @pytest.mark.asyncio
@@ -73,3 +84,70 @@ async def test_process(
             text="<b>test_title</b>\ntest_body\ntest_url",
         ),
     )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("events_count", "body_length", "expected_messages"),
+    [
+        (3, 10, 1),
+        # Each message is about 1000 characters, so 4 of them fit into 4096 characters
+        (10, 900, 3),
+    ],
+)
+async def test_process_digest(
+    mocker: pytest_mock.MockerFixture,
+    config: telegram_actions.TelegramWebhookActionConfig,
+    events_count: int,
+    body_length: int,
+    expected_messages: int,
+):
+    config = config.model_copy(
+        update={"digest_window_seconds": 0.01, "max_message_body_length": 1000},
+    )
+    telegram_client = mocker.AsyncMock(spec=telegram_clients.RestTelegramClient)
+    mocker.patch.object(telegram_clients, "RestTelegramClient", return_value=telegram_client)
+    shared = telegram_actions.TelegramWebhookProcessor.create_shared()
+    processor = telegram_actions.TelegramWebhookProcessor.from_config(config=config, shared=shared)
+
+    await asyncio.gather(
+        *(
+            processor.process(
+                event=task_base.Event(
+                    id=f"test_event_{index}",
+                    title="test_title",
+                    body="b" * body_length,
+                    url="test_url",
+                ),
+            )
+            for index in range(events_count)
+        )
+    )
+    await processor.dispose()
+    await shared.dispose()
+
+    assert telegram_client.send_message.await_count == expected_messages
+    texts = [call.kwargs["request"].text for call in telegram_client.send_message.await_args_list]
+    assert all(len(text) <= telegram_actions.MAX_MESSAGE_LENGTH for text in texts)
+    assert sum(text.count("test_title") for text in texts) == events_count
+
+
+@pytest.mark.asyncio
+async def test_digest_batcher_does_not_cut_messages(mocker: pytest_mock.MockerFixture):
+    send = mocker.AsyncMock()
+    digest_batcher = telegram_actions._DigestBatcher(  # pyright: ignore[reportPrivateUsage]
+        send=send,
+        delay=0.01,
+        separator="\n\n",
+        max_length=100,
+    )
+    long_text = f"<b>{'a' * 200}</b>"
+
+    await asyncio.gather(
+        digest_batcher.send("<b>first</b>"),
+        digest_batcher.send(long_text),
+        digest_batcher.send("<b>last</b>"),
+    )
+    await digest_batcher.dispose()
+
+    assert [call.args[0] for call in send.await_args_list] == ["<b>first</b>", long_text, "<b>last</b>"]
@@ -0,0 +1,80 @@
+import asyncio
+
+import aiohttp
+import pytest
+import pytest_mock
+
+import lib.telegram.clients as telegram_clients
+
+
+def _mock_response(mocker: pytest_mock.MockerFixture, status: int, body: object = None) -> pytest_mock.MockType:
+    response = mocker.MagicMock(spec=aiohttp.ClientResponse)
+    response.status = status
+    response.headers = {}
+    response.json = mocker.AsyncMock(return_value=body)
+    response.__aenter__.return_value = response
+    return response
+
+
+@pytest.mark.asyncio
+async def test_send_message_waits_retry_after(mocker: pytest_mock.MockerFixture):
+    aiohttp_client = mocker.MagicMock(spec=aiohttp.ClientSession)
+    aiohttp_client.request.side_effect = [
+        _mock_response(mocker, status=429, body={"ok": False, "parameters": {"retry_after": 3}}),
+        _mock_response(mocker, status=200),
+    ]
+    rate_limiter = telegram_clients.TelegramRateLimiter()
+    block = mocker.spy(rate_limiter, "block")
+    sleep = mocker.patch("asyncio.sleep")
+    client = telegram_clients.RestTelegramClient(
+        aiohttp_client=aiohttp_client,
+        token="token",
+        rate_limiter=rate_limiter,
+    )
+
+    await client.send_message(request=telegram_clients.SendMessageRequest(chat_id="1", text="text"))
+
+    assert aiohttp_client.request.call_count == 2
+    block.assert_called_once_with(chat_id="1", retry_after=3)
+    assert sleep.await_args is not None
+    assert sleep.await_args.args[0] == pytest.approx(3, abs=0.1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "expected_delays"),
+    [
+        ("1", [0] * 22),
+        # 20 messages per minute
+        ("-100", [0] * 20 + [3, 6]),
+    ],
+)
+async def test_rate_limiter_limits_group_chats(
+    mocker: pytest_mock.MockerFixture,
+    chat_id: str,
+    expected_delays: list[float],
+):
+    sleep = mocker.patch("asyncio.sleep")
+    rate_limiter = telegram_clients.TelegramRateLimiter(bot_rate=1000, chat_rate=1000)
+
+    for _ in expected_delays:
+        await rate_limiter.acquire(chat_id=chat_id)
+
+    # Per-chat limit is raised, so only the group limit causes noticeable delays
+    delays = [round(call.args[0]) for call in sleep.await_args_list]
+    assert [delay for delay in delays if delay > 0] == [delay for delay in expected_delays if delay > 0]
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_does_not_hold_bot_limit_for_waiting_chats():
+    rate_limiter = telegram_clients.TelegramRateLimiter(bot_rate=1)
+    rate_limiter.block(chat_id="1", retry_after=10)
+
+    blocked = asyncio.create_task(rate_limiter.acquire(chat_id="1"))
+    await asyncio.sleep(0)
+
+    # Bot has a single token per second, it is still available for other chats
+    await asyncio.wait_for(rate_limiter.acquire(chat_id="2"), timeout=0.5)
+    assert not blocked.done()
+
+    blocked.cancel()
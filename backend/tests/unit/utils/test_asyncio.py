@@ -0,0 +1,92 @@
+import asyncio
+import typing
+
+import pytest
+
+import lib.utils.asyncio as asyncio_utils
+
+
+@pytest.mark.asyncio
+async def test_bounded_merge_yields_all_items():
+    async def iterate(index: int) -> typing.AsyncIterator[int]:
+        for item in range(3):
+            await asyncio.sleep(0)
+            yield index * 10 + item
+
+    result = [item async for item in asyncio_utils.bounded_merge((iterate(index) for index in range(5)), limit=2)]
+
+    assert sorted(result) == [index * 10 + item for index in range(5) for item in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_bounded_merge_respects_limit_and_semaphores():
+    running = 0
+    max_running = 0
+    shared_semaphore = asyncio.Semaphore(2)
+
+    async def iterate() -> typing.AsyncIterator[int]:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        yield 1
+        running -= 1
+
+    first = asyncio_utils.bounded_merge((iterate() for _ in range(5)), limit=3, semaphores=(shared_semaphore,))
+    second = asyncio_utils.bounded_merge((iterate() for _ in range(5)), limit=3, semaphores=(shared_semaphore,))
+
+    async def consume(iterator: typing.AsyncIterator[int]) -> list[int]:
+        return [item async for item in iterator]
+
+    results = await asyncio.gather(consume(first), consume(second))
+
+    assert results == [[1] * 5, [1] * 5]
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_bounded_merge_propagates_errors():
+    async def iterate() -> typing.AsyncIterator[int]:
+        yield 1
+        raise ValueError("test")
+
+    with pytest.raises(ValueError):
+        async for _ in asyncio_utils.bounded_merge([iterate()], limit=1):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_bounded_merge_resumes_after_consumed():
+    log: list[str] = []
+
+    async def iterate(index: int) -> typing.AsyncIterator[int]:
+        yield index
+        log.append(f"resumed {index}")
+
+    async for item in asyncio_utils.bounded_merge((iterate(index) for index in range(3)), limit=3):
+        await asyncio.sleep(0.01)
+        log.append(f"consumed {item}")
+
+    for index in range(3):
+        assert log.index(f"consumed {index}") < log.index(f"resumed {index}")
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_reserves_in_order():
+    bucket = asyncio_utils.TokenBucket(rate=10, capacity=2)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0, 0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_block():
+    bucket = asyncio_utils.TokenBucket(rate=10, capacity=5)
+
+    bucket.block(0.5)
+
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.01)
+    assert bucket.reserve() == pytest.approx(0.6, abs=0.01)
@@ -0,0 +1,43 @@
+import pydantic
+import pytest
+
+import lib.utils.pydantic as pydantic_utils
+
+
+class Item(pydantic_utils.BaseModel):
+    value: int
+
+
+class Container(pydantic_utils.BaseModel):
+    items: pydantic_utils.LazyModelDict[Item] = pydantic.Field(
+        default_factory=lambda: pydantic_utils.LazyModelDict(Item),
+    )
+
+
+def test_lazy_model_dict_validates_on_access():
+    container = Container.model_validate({"items": {"valid": {"value": 1}, "invalid": {"value": "invalid"}}})
+
+    assert container.items["valid"] == Item(value=1)
+    assert "invalid" in container.items
+    assert len(container.items) == 2
+    with pytest.raises(pydantic.ValidationError):
+        container.items["invalid"]
+    assert container.model_dump(mode="json")["items"]["invalid"] == {"value": "invalid"}
+
+
+def test_lazy_model_dict_dump():
+    container = Container.model_validate({"items": {"first": {"value": 1}, "second": {"value": 2}}})
+
+    container.items["first"].value = 10
+    container.items["third"] = Item(value=3)
+    del container.items["second"]
+
+    assert container.model_dump(mode="json") == {"items": {"first": {"value": 10}, "third": {"value": 3}}}
+
+
+def test_lazy_model_dict_mapping():
+    container = Container()
+
+    assert container.items.get("missing") is None
+    container.items["first"] = Item(value=1)
+    assert dict(container.items) == {"first": Item(value=1)}